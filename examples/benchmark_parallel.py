@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel flash execution.
+
+Runs the same set of flash_activity calculations serially, on FlashPool
+worker processes and on flash_many threads, and reports throughput and
+speedup per worker count.
+
+Usage: python examples/benchmark_parallel.py [n_flashes] [max_workers]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def make_specs(n_flashes):
+    """Flash specifications spread over temperature and pressure."""
+    from solubilityccs.parallel import flash_spec
+
+    composition = {"CO2": 0.999, "H2O": 5e-4, "HNO3": 5e-4}
+    return [
+        flash_spec(
+            263.15 + 30.0 * i / max(n_flashes - 1, 1),
+            40.0 + 60.0 * (i % 5) / 4,
+            composition,
+            100.0,
+        )
+        for i in range(n_flashes)
+    ]
+
+
+def main():
+    """Run the benchmark."""
+    from solubilityccs import warmup
+    from solubilityccs.parallel import FlashPool, flash_many, run_flash
+
+    n_flashes = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    specs = make_specs(n_flashes)
+
+    warmup(iterations=1)
+    start = time.perf_counter()
+    for spec in specs:
+        run_flash(spec)
+    serial = time.perf_counter() - start
+    print(f"serial: {n_flashes / serial:.2f} flashes/s")
+
+    workers = 1
+    while workers <= max_workers:
+        with FlashPool(processes=workers) as pool:
+            pool.map(specs[:workers])  # wait until every worker is initialized
+            start = time.perf_counter()
+            pool.map(specs)
+            elapsed = time.perf_counter() - start
+        print(
+            f"FlashPool({workers}): {n_flashes / elapsed:.2f} flashes/s, "
+            f"speedup {serial / elapsed:.2f}"
+        )
+        workers *= 2
+
+    workers = 1
+    while workers <= max_workers:
+        with ThreadPoolExecutor(workers) as executor:
+            flash_many(specs[:workers], executor=executor)  # pool the systems
+            start = time.perf_counter()
+            flash_many(specs, executor=executor)
+            elapsed = time.perf_counter() - start
+        print(
+            f"flash_many({workers}): {n_flashes / elapsed:.2f} flashes/s, "
+            f"speedup {serial / elapsed:.2f}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
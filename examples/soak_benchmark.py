@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Soak test: run many flashes and check that memory stays bounded.
+
+Runs flash_activity over a cycle of operating points inside an Engine with a
+fixed maximum heap, sampling the resident set size and the JVM heap every
+``--sample-every`` flashes. The first samples, taken while JIT compilation
+and heap sizing settle, set the baseline. The run fails with exit code 1 if
+the resident set size or the live JVM heap grow by more than
+``--threshold`` MB above the baseline.
+
+Usage: python examples/soak_benchmark.py [n_flashes] [--threshold MB]
+           [--sample-every N] [--warmup-samples N] [--max-heap SIZE]
+           [--backend {neqsim,tabulated}]
+"""
+
+import argparse
+import sys
+import time
+
+MB = 1024 * 1024
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("n_flashes", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--threshold", type=float, default=64.0)
+    parser.add_argument("--sample-every", type=int, default=1000)
+    parser.add_argument("--warmup-samples", type=int, default=3)
+    parser.add_argument("--max-heap", default="256m")
+    parser.add_argument("--backend", default="neqsim")
+    return parser.parse_args()
+
+
+def make_spec(i, backend):
+    """Operating point ``i`` of a cycle over temperature and pressure."""
+    from solubilityccs.parallel import flash_spec
+
+    composition = {"CO2": 0.999, "H2O": 5e-4, "HNO3": 5e-4}
+    return flash_spec(
+        263.15 + (i * 7919 % 3000) / 100.0,
+        40.0 + (i * 104729 % 6000) / 100.0,
+        composition,
+        100.0,
+        fugacity_backend=backend,
+    )
+
+
+def main():
+    """Run the soak test and return the exit code."""
+    from solubilityccs import Engine
+    from solubilityccs.instrumentation import memory_usage
+    from solubilityccs.parallel import run_flash
+
+    args = parse_args()
+    baseline = None
+    peak = {"rss": 0, "jvm_heap_used": 0}
+    samples = 0
+    start = time.perf_counter()
+    with Engine(max_heap=args.max_heap, warmup=True):
+        for i in range(1, args.n_flashes + 1):
+            run_flash(make_spec(i, args.backend))
+            if i % args.sample_every and i != args.n_flashes:
+                continue
+
+            usage = memory_usage(collect=True)
+            samples += 1
+            elapsed = time.perf_counter() - start
+            print(
+                f"{i:>9} flashes  {i / elapsed:7.2f}/s  "
+                f"rss {usage['rss'] / MB:8.1f} MB  "
+                f"heap {usage['jvm_heap_used'] / MB:7.1f} MB "
+                f"of {usage['jvm_heap_committed'] / MB:.1f} MB",
+                flush=True,
+            )
+            if samples <= args.warmup_samples:
+                baseline = usage
+                continue
+            for name in peak:
+                peak[name] = max(peak[name], usage[name])
+
+    if baseline is None or samples <= args.warmup_samples:
+        print("Too few samples after warm-up to judge memory growth")
+        return 0
+    growth = {name: (peak[name] - baseline[name]) / MB for name in peak}
+    print(
+        f"growth after warm-up: rss {growth['rss']:.1f} MB, "
+        f"JVM heap {growth['jvm_heap_used']:.1f} MB "
+        f"(threshold {args.threshold:.1f} MB)"
+    )
+    if max(growth.values()) > args.threshold:
+        print("FAILED: memory grew beyond the threshold")
+        return 1
+    print("PASSED")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
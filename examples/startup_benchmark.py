@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: import time and first-call latency.
+
+Each run starts a fresh interpreter, times ``import solubilityccs`` and then
+the first and second ``calc_activity_water_h2so4`` calls. The first call
+loads the compiled database bundle; with ``--cold`` the bundle is deleted
+before every run, so the first call also parses the CSVs and rebuilds it.
+Reports the median and best of ``--runs`` runs.
+
+Usage: python examples/startup_benchmark.py [--runs N] [--cold]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+PROBE = """
+import json
+import time
+
+start = time.perf_counter()
+import solubilityccs
+
+imported = time.perf_counter()
+solubilityccs.calc_activity_water_h2so4(25.0, 0.5)
+first = time.perf_counter()
+solubilityccs.calc_activity_water_h2so4(25.0, 0.5)
+second = time.perf_counter()
+print(json.dumps([imported - start, first - imported, second - first]))
+"""
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--cold", action="store_true")
+    return parser.parse_args()
+
+
+def run_once(cold):
+    """Time one fresh interpreter and return the three durations in seconds."""
+    from solubilityccs.database_bundle import bundle_path
+
+    if cold:
+        path = bundle_path()
+        if os.path.exists(path):
+            os.remove(path)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    args = parse_args()
+    timings = [run_once(args.cold) for _ in range(args.runs)]
+    print(f"{args.runs} runs, {'cold' if args.cold else 'warm'} database bundle")
+    for index, label in enumerate(["import", "first call", "second call"]):
+        values = [run[index] * 1000.0 for run in timings]
+        print(
+            f"{label:>12}: median {statistics.median(values):9.3f} ms  "
+            f"best {min(values):9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -25,10 +25,28 @@ def get_version():
 
 # Import main modules
 try:
-    from .fluid import Fluid, ModelResults, Phase
+    from .engine import Engine
+    from .fluid import (
+        FlashRecord,
+        Fluid,
+        FluidSpec,
+        FluidTemplate,
+        ModelResults,
+        Phase,
+    )
+    from .fugacity_store import disable_fugacity_store, enable_fugacity_store
+    from .instrumentation import (
+        collect_stats,
+        disable_stats,
+        enable_stats,
+        memory_usage,
+        reset_stats,
+        stats,
+    )
     from .neqsim_functions import (
         get_acid_fugacity_coeff,
         get_water_fugacity_coefficient,
+        warmup,
     )
     from .path_utils import get_database_path
     from .sulfuric_acid_activity import calc_activity_water_h2so4
@@ -36,11 +54,24 @@ try:
     __all__ = [
         "__version__",
         "Fluid",
+        "FluidTemplate",
+        "FluidSpec",
+        "FlashRecord",
         "Phase",
         "ModelResults",
+        "Engine",
         "get_acid_fugacity_coeff",
         "get_water_fugacity_coefficient",
         "calc_activity_water_h2so4",
+        "enable_fugacity_store",
+        "disable_fugacity_store",
+        "warmup",
+        "stats",
+        "collect_stats",
+        "enable_stats",
+        "disable_stats",
+        "reset_stats",
+        "memory_usage",
         "get_database_path",
         "get_version",
     ]
@@ -0,0 +1,190 @@
+"""Process-wide registry of the component properties in Properties.csv.
+
+The database is read once per process into a :class:`ComponentRegistry`
+that every :class:`~solubilityccs.fluid.Fluid` references. It holds a
+component index and one read-only float array per property column, plus a
+record of plain floats per component so that ``add_component`` is a single
+dictionary lookup.
+"""
+
+import csv
+import functools
+import math
+import types
+
+import numpy as np
+
+# Numeric columns of Properties.csv, in file order
+PROPERTY_COLUMNS = (
+    "M",
+    "Tb",
+    "Tc",
+    "Pc",
+    "w",
+    "s",
+    "A",
+    "B",
+    "C",
+    "ActivityK1",
+    "ActivityK2",
+    "ActivityK3",
+)
+# Column holding the pressure unit of the Antoine equation ("mmhg" or "bara")
+UNIT_COLUMN = "UnitAnt"
+
+
+def _parse_number(text):
+    """Parse a decimal-comma or decimal-point number; empty cells are NaN."""
+    text = text.strip()
+    if not text:
+        return math.nan
+    return float(text.replace(",", "."))
+
+
+class ComponentRegistry:
+    """Immutable, array-backed component property database.
+
+    Parameters
+    ----------
+    names : sequence of str
+        Component names, one per row
+    columns : dict
+        Property column name to a sequence of floats, one per component
+    units : sequence of str
+        Antoine pressure unit of each component ("" if not given)
+
+    Attributes
+    ----------
+    names : tuple of str
+        Component names in database order
+    index : mapping
+        Component name to row number
+    units : tuple of str
+        Antoine pressure unit of each component
+    """
+
+    __slots__ = ("names", "index", "units", "_columns", "_records")
+
+    def __init__(self, names, columns, units):
+        names = tuple(names)
+        units = tuple(units)
+        arrays = {}
+        for name, values in columns.items():
+            array = np.array(values, dtype=float)
+            if array.shape != (len(names),):
+                raise ValueError(
+                    f"Column {name} has {array.size} values for {len(names)} "
+                    f"components"
+                )
+            array.setflags(write=False)
+            arrays[name] = array
+        records = {}
+        for row, component in enumerate(names):
+            record = {name: float(array[row]) for name, array in arrays.items()}
+            record[UNIT_COLUMN] = units[row]
+            records[component] = types.MappingProxyType(record)
+
+        set_slot = object.__setattr__
+        set_slot(self, "names", names)
+        index = {component: row for row, component in enumerate(names)}
+        set_slot(self, "index", types.MappingProxyType(index))
+        set_slot(self, "units", units)
+        set_slot(self, "_columns", types.MappingProxyType(arrays))
+        set_slot(self, "_records", types.MappingProxyType(records))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ComponentRegistry is read-only")
+
+    @classmethod
+    def from_csv(cls, path):
+        """Parse a Properties.csv file (semicolon separated, decimal comma)."""
+        with open(path, newline="", encoding="utf-8-sig") as handle:
+            rows = list(csv.DictReader(handle, delimiter=";"))
+        return cls(
+            [row["Component"].strip() for row in rows],
+            {
+                name: [_parse_number(row[name] or "") for row in rows]
+                for name in PROPERTY_COLUMNS
+            },
+            [(row[UNIT_COLUMN] or "").strip() for row in rows],
+        )
+
+    def __contains__(self, component):
+        return component in self.index
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, column):
+        """Read-only float array of a property column, in database order."""
+        return self._columns[column]
+
+    @property
+    def columns(self):
+        """Names of the numeric property columns."""
+        return tuple(self._columns)
+
+    def row(self, component):
+        """Row number of a component.
+
+        Raises
+        ------
+        ValueError
+            If the component is not in the database
+        """
+        try:
+            return self.index[component]
+        except KeyError:
+            raise ValueError(
+                f"Properties for component {component} not found in the database."
+            ) from None
+
+    def properties(self, component):
+        """Properties of one component as a read-only mapping of plain values.
+
+        Maps every property column to a float and ``UnitAnt`` to the Antoine
+        pressure unit.
+
+        Raises
+        ------
+        ValueError
+            If the component is not in the database
+        """
+        try:
+            return self._records[component]
+        except KeyError:
+            raise ValueError(
+                f"Properties for component {component} not found in the database."
+            ) from None
+
+    def __repr__(self):
+        return f"ComponentRegistry({len(self.names)} components)"
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry():
+    """Return the process-wide registry compiled from Properties.csv.
+
+    The columns are read from the compiled database bundle (see
+    :mod:`solubilityccs.database_bundle`) rather than parsed from the CSV.
+
+    Returns
+    -------
+    ComponentRegistry
+        Shared by all fluids and threads; it cannot be modified
+    """
+    from .database_bundle import load_bundle
+
+    try:
+        bundle = load_bundle()
+    except FileNotFoundError as e:
+        raise RuntimeError(f"Failed to load Properties database: {str(e)}") from e
+    properties = bundle["properties"]
+    return ComponentRegistry(
+        bundle.metadata["components"],
+        {
+            name: properties[:, column]
+            for column, name in enumerate(bundle.metadata["property_columns"])
+        },
+        bundle.metadata["units"],
+    )
@@ -0,0 +1,291 @@
+"""Pure NumPy SRK and Peng-Robinson fugacity coefficients.
+
+A JVM-free alternative to the NeqSim CPA helper systems for fast screening.
+All functions are vectorized over batches of (T, P, composition): scalar and
+1-D inputs broadcast to arrays of shape (n_points,) and compositions have
+shape (n_points, n_components).
+
+The equations follow the generic two-parameter cubic form
+
+    P = RT / (v - b) - a / ((v + delta1 b) (v + delta2 b))
+
+with the classic alpha functions and optional Peneloux volume translation
+c_i = s_i b_i, where s_i is the ``s`` column of Properties.csv. Without the
+association term of CPA the coefficients of water and the acids deviate from
+the CPA values; use :func:`cpa_deviation` to quantify the difference.
+"""
+
+import numpy as np
+
+# Universal gas constant in J/(mol K)
+R = 8.314462618
+
+MODELS = {
+    "srk": {
+        "delta1": 1.0,
+        "delta2": 0.0,
+        "omega_a": 0.42748,
+        "omega_b": 0.08664,
+        "m": (0.480, 1.574, -0.176),
+    },
+    "pr": {
+        "delta1": 1.0 + np.sqrt(2.0),
+        "delta2": 1.0 - np.sqrt(2.0),
+        "omega_a": 0.45724,
+        "omega_b": 0.07780,
+        "m": (0.37464, 1.54226, -0.26992),
+    },
+}
+
+# Default CO2-water interaction parameters of NeqSim's classic mixing rule
+DEFAULT_KIJ = {
+    "srk": {("CO2", "H2O"): 0.1},
+    "pr": {("CO2", "H2O"): 0.184},
+}
+
+
+def _model(model):
+    try:
+        return MODELS[model.lower()]
+    except KeyError:
+        raise ValueError(
+            f"Unknown cubic equation of state '{model}'; use one of {list(MODELS)}"
+        ) from None
+
+
+def kij_matrix(model, components, kij=None):
+    """Build the binary interaction matrix for a list of components.
+
+    Parameters
+    ----------
+    model : {"srk", "pr"}
+        Equation of state, selecting the defaults in :data:`DEFAULT_KIJ`
+    components : sequence of str
+        Component names
+    kij : dict, optional
+        Overrides keyed by component pairs, e.g. ``{("CO2", "H2O"): 0.12}``
+
+    Returns
+    -------
+    numpy.ndarray
+        Symmetric matrix of shape (n_components, n_components)
+    """
+    _model(model)
+    values = dict(DEFAULT_KIJ.get(model.lower(), {}))
+    values.update(kij or {})
+    matrix = np.zeros((len(components), len(components)))
+    for (first, second), value in values.items():
+        if first in components and second in components:
+            i = components.index(first)
+            j = components.index(second)
+            matrix[i, j] = matrix[j, i] = value
+    return matrix
+
+
+def cubic_parameters(model, temperature, pressure, tc, pc, omega):
+    """Pure-component parameters of a cubic equation of state.
+
+    Parameters
+    ----------
+    model : {"srk", "pr"}
+        Equation of state
+    temperature : float or array_like
+        Temperature in Kelvin, shape () or (n_points,)
+    pressure : float or array_like
+        Pressure in bara, shape () or (n_points,)
+    tc, pc, omega : array_like
+        Critical temperature (K), critical pressure (bara) and acentric factor
+        of each component, shape (n_components,)
+
+    Returns
+    -------
+    dict
+        ``m``, ``alpha``, ``a`` (Pa m6/mol2), ``b`` (m3/mol) and the
+        dimensionless ``A`` and ``B``, each of shape (n_points, n_components)
+    """
+    params = _model(model)
+    temperature = np.atleast_1d(np.asarray(temperature, dtype=float))[:, np.newaxis]
+    pressure = np.atleast_1d(np.asarray(pressure, dtype=float))[:, np.newaxis]
+    tc = np.asarray(tc, dtype=float)
+    pc = np.asarray(pc, dtype=float)
+    omega = np.asarray(omega, dtype=float)
+
+    m0, m1, m2 = params["m"]
+    m = m0 + m1 * omega + m2 * omega**2
+    tr = temperature / tc
+    pr = pressure / pc
+    alpha = (1.0 + m * (1.0 - np.sqrt(tr))) ** 2
+    a = params["omega_a"] * (R * tc) ** 2 / (pc * 1e5) * alpha
+    b = params["omega_b"] * R * tc / (pc * 1e5)
+    A = params["omega_a"] * alpha * pr / tr**2
+    B = params["omega_b"] * pr / tr
+    m, b = np.broadcast_arrays(m, b, A)[:2]
+    return {"m": m, "alpha": alpha, "a": a, "b": b, "A": A, "B": B}
+
+
+def _solve_cubic(c2, c1, c0):
+    """Real roots of Z**3 + c2 Z**2 + c1 Z + c0 = 0 for arrays of coefficients.
+
+    Returns an array of shape (n_points, 3) with NaN for complex roots.
+    """
+    n = len(c0)
+    companion = np.zeros((n, 3, 3))
+    companion[:, 0, :] = -np.stack([c2, c1, c0], axis=1)
+    companion[:, 1, 0] = 1.0
+    companion[:, 2, 1] = 1.0
+    roots = np.linalg.eigvals(companion)
+    real = roots.real
+    real[np.abs(roots.imag) > 1e-10 * np.maximum(1.0, np.abs(real))] = np.nan
+    return real
+
+
+def fugacity_coefficients(
+    model,
+    temperature,
+    pressure,
+    fractions,
+    tc,
+    pc,
+    omega,
+    kij=None,
+    volume_shift=None,
+):
+    """Fugacity coefficients in the phase of lowest Gibbs energy.
+
+    For CO2-rich mixtures this is the CO2-rich phase, vapour or liquid
+    depending on the conditions.
+
+    Parameters
+    ----------
+    model : {"srk", "pr"}
+        Equation of state
+    temperature : float or array_like
+        Temperature in Kelvin, shape () or (n_points,)
+    pressure : float or array_like
+        Pressure in bara, shape () or (n_points,)
+    fractions : array_like
+        Mole fractions, shape (n_components,) or (n_points, n_components)
+    tc, pc, omega : array_like
+        Critical temperature (K), critical pressure (bara) and acentric factor
+        of each component, shape (n_components,)
+    kij : array_like, optional
+        Symmetric binary interaction parameters, shape
+        (n_components, n_components). Defaults to zero.
+    volume_shift : array_like, optional
+        Peneloux shift parameters s_i = c_i / b_i. Defaults to no shift.
+
+    Returns
+    -------
+    numpy.ndarray
+        Fugacity coefficients, shape (n_points, n_components)
+    """
+    params = _model(model)
+    delta1 = params["delta1"]
+    delta2 = params["delta2"]
+    n_components = len(np.atleast_1d(tc))
+
+    temperature = np.atleast_1d(np.asarray(temperature, dtype=float))
+    pressure = np.atleast_1d(np.asarray(pressure, dtype=float))
+    x = np.atleast_2d(np.asarray(fractions, dtype=float))
+    n_points = max(len(temperature), len(pressure), len(x))
+    temperature = np.broadcast_to(temperature, (n_points,))
+    pressure = np.broadcast_to(pressure, (n_points,))
+    x = np.broadcast_to(x, (n_points, n_components))
+    x = x / x.sum(axis=1, keepdims=True)
+
+    pure = cubic_parameters(model, temperature, pressure, tc, pc, omega)
+    Ai = pure["A"]
+    Bi = pure["B"]
+    k = np.zeros((n_components, n_components)) if kij is None else np.asarray(kij)
+
+    # Van der Waals one-fluid mixing rules
+    Aij = np.sqrt(Ai[:, :, np.newaxis] * Ai[:, np.newaxis, :]) * (1.0 - k)
+    sum_xA = np.einsum("nij,nj->ni", Aij, x)
+    A = np.einsum("ni,ni->n", x, sum_xA)
+    B = np.einsum("ni,ni->n", x, Bi)
+
+    c2 = (delta1 + delta2 - 1.0) * B - 1.0
+    c1 = A + delta1 * delta2 * B**2 - (delta1 + delta2) * B * (B + 1.0)
+    c0 = -(A * B + delta1 * delta2 * B**2 * (B + 1.0))
+    Z = _solve_cubic(c2, c1, c0)
+    Z[~(Z > B[:, np.newaxis])] = np.nan
+
+    # Pick the root with the lowest residual Gibbs energy
+    A_ = A[:, np.newaxis]
+    B_ = B[:, np.newaxis]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_term = np.log((Z + delta1 * B_) / (Z + delta2 * B_))
+        gibbs = Z - 1.0 - np.log(Z - B_) - A_ / (B_ * (delta1 - delta2)) * log_term
+    gibbs[np.isnan(gibbs)] = np.inf
+    Z = Z[np.arange(n_points), np.argmin(gibbs, axis=1)][:, np.newaxis]
+
+    ln_phi = (
+        Bi / B_ * (Z - 1.0)
+        - np.log(Z - B_)
+        - A_
+        / (B_ * (delta1 - delta2))
+        * (2.0 * sum_xA / A_ - Bi / B_)
+        * np.log((Z + delta1 * B_) / (Z + delta2 * B_))
+    )
+    if volume_shift is not None:
+        ln_phi = ln_phi - np.asarray(volume_shift, dtype=float) * Bi
+    return np.exp(ln_phi)
+
+
+def cpa_deviation(model, components, fractions, temperature, pressure, **kwargs):
+    """Relative deviation of cubic fugacity coefficients from the CPA values.
+
+    The CPA reference is taken from the tabulated CPA backend (falling back to
+    live NeqSim calculations outside the tables) for every component except
+    CO2, which is not evaluated by the CPA helper systems. Interaction
+    parameters default to :func:`kij_matrix` for the given components.
+
+    Parameters
+    ----------
+    model : {"srk", "pr"}
+        Equation of state
+    components : sequence of str
+        Component names present in Properties.csv
+    fractions : array_like
+        Mole fractions, shape (n_components,) or (n_points, n_components)
+    temperature : float or array_like
+        Temperature in Kelvin
+    pressure : float or array_like
+        Pressure in bara
+    **kwargs
+        Passed to :func:`fugacity_coefficients` (``kij``, ``volume_shift``)
+
+    Returns
+    -------
+    dict
+        Maps each non-CO2 component to an array of relative deviations
+        ``phi_cubic / phi_cpa - 1``
+    """
+    from .fluid import Fluid
+    from .fugacity_tables import tabulated_fugacity_coefficient
+
+    components = list(components)
+    fluid = Fluid()
+    for component in components:
+        fluid.add_component(component, 1.0)
+    kwargs.setdefault("kij", kij_matrix(model, components))
+    phi = fugacity_coefficients(
+        model,
+        temperature,
+        pressure,
+        fractions,
+        fluid.critical_temperature,
+        fluid.critical_pressure,
+        fluid.accentric_factor,
+        **kwargs,
+    )
+    n_points = phi.shape[0]
+    temperature = np.broadcast_to(np.asarray(temperature, dtype=float), (n_points,))
+    pressure = np.broadcast_to(np.asarray(pressure, dtype=float), (n_points,))
+    deviation = {}
+    for i, component in enumerate(components):
+        if component == "CO2":
+            continue
+        reference, _ = tabulated_fugacity_coefficient(component, pressure, temperature)
+        deviation[component] = phi[:, i] / reference - 1.0
+    return deviation
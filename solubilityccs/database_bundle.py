@@ -0,0 +1,216 @@
+"""Compiled binary bundle of the text databases.
+
+The numeric tables of Properties.csv and WaterActivityH2SO4.csv are compiled
+into a single uncompressed ``database.npz`` in the packaged Database directory
+(or the ``SOLUBILITYCCS_DATABASE_DIR`` directory when it is set), together
+with the SHA-256 checksum of every source file. COMP.csv is read by NeqSim
+itself, so only its checksum is recorded; it feeds the model fingerprint. The
+text files stay the source of truth: the bundle is rebuilt automatically
+whenever any checksum differs, and if the Database directory is read-only the
+freshly compiled tables are used from memory.
+
+The bundle is loaded once per process into read-only arrays shared by all
+threads. Worker processes of :class:`~solubilityccs.parallel.FlashPool` and
+:class:`~solubilityccs.parallel.FlashSupervisor` are spawned, so each of them
+validates and loads its own copy.
+"""
+
+import functools
+import json
+import os
+import tempfile
+import types
+
+import numpy as np
+
+from .path_utils import (
+    file_checksum,
+    get_database_path,
+    get_primary_database_directory,
+)
+
+BUNDLE_FILE = "database.npz"
+BUNDLE_FORMAT_VERSION = 1
+
+# Source files whose checksums the bundle is validated against
+SOURCES = ("COMP.csv", "Properties.csv", "WaterActivityH2SO4.csv")
+
+
+def bundle_path():
+    """Path of the compiled bundle in the primary Database directory."""
+    return os.path.join(get_primary_database_directory(), BUNDLE_FILE)
+
+
+def source_checksums():
+    """SHA-256 checksums of the source files, keyed by file name.
+
+    Raises
+    ------
+    FileNotFoundError
+        If a source file cannot be found
+    """
+    return {name: file_checksum(get_database_path(name)) for name in SOURCES}
+
+
+def compile_bundle(checksums):
+    """Parse the source files into the arrays stored in the bundle.
+
+    Parameters
+    ----------
+    checksums : dict
+        Checksums of the source files, as returned by :func:`source_checksums`
+
+    Returns
+    -------
+    dict
+        Array name to numpy.ndarray, ready for :func:`numpy.savez`. The
+        ``metadata`` entry is a JSON document with the format version, the
+        source checksums and the component names, Antoine units and property
+        column names of the ``properties`` array (one row per component).
+    """
+    from .component_registry import ComponentRegistry
+    from .sulfuric_acid_activity import TABLE_CSV, _parse_csv
+
+    registry = ComponentRegistry.from_csv(get_database_path("Properties.csv"))
+    temperatures, water_fractions, activities = _parse_csv(get_database_path(TABLE_CSV))
+    metadata = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "checksums": {name: checksums[name] for name in SOURCES},
+        "components": list(registry.names),
+        "units": list(registry.units),
+        "property_columns": list(registry.columns),
+    }
+    return {
+        "metadata": np.asarray(json.dumps(metadata)),
+        "properties": np.column_stack([registry[c] for c in registry.columns]),
+        "h2so4_temperatures": temperatures,
+        "h2so4_water_fractions": water_fractions,
+        "h2so4_activities": activities,
+    }
+
+
+def read_bundle(path, checksums):
+    """Read a bundle if it is current.
+
+    Parameters
+    ----------
+    path : str
+        Path to the bundle
+    checksums : dict
+        Checksums of the source files the bundle must have been compiled from
+
+    Returns
+    -------
+    dict or None
+        Array name to numpy.ndarray, or None if the bundle is missing,
+        unreadable, of another format version or compiled from other sources
+    """
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        metadata = json.loads(str(arrays["metadata"]))
+    except (OSError, KeyError, ValueError):
+        # Missing, unreadable or written by an older layout: rebuild it
+        return None
+    if metadata.get("format_version") != BUNDLE_FORMAT_VERSION:
+        return None
+    if metadata.get("checksums") != checksums:
+        return None
+    return arrays
+
+
+def _write_bundle(path, arrays):
+    """Write the bundle atomically; skip it if the directory is read-only."""
+    try:
+        handle, temporary = tempfile.mkstemp(
+            suffix=".npz", dir=os.path.dirname(path) or "."
+        )
+    except OSError:
+        return False
+    try:
+        with os.fdopen(handle, "wb") as output:
+            np.savez(output, **arrays)
+        # mkstemp creates the file private to its owner; other users and
+        # worker accounts sharing the installation must be able to read it
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except OSError:
+        os.unlink(temporary)
+        return False
+    return True
+
+
+class DatabaseBundle:
+    """Read-only numeric tables compiled from the text databases.
+
+    Parameters
+    ----------
+    arrays : dict
+        Array name to numpy.ndarray, as written by :func:`compile_bundle`
+
+    Attributes
+    ----------
+    metadata : mapping
+        The decoded ``metadata`` document of the bundle
+    checksums : mapping
+        Source file name to the SHA-256 checksum the tables were compiled from
+    """
+
+    __slots__ = ("metadata", "checksums", "_arrays")
+
+    def __init__(self, arrays):
+        arrays = dict(arrays)
+        metadata = json.loads(str(arrays.pop("metadata")))
+        for array in arrays.values():
+            array.setflags(write=False)
+        checksums = types.MappingProxyType(metadata["checksums"])
+        metadata["checksums"] = checksums
+        set_slot = object.__setattr__
+        set_slot(self, "metadata", types.MappingProxyType(metadata))
+        set_slot(self, "checksums", checksums)
+        set_slot(self, "_arrays", types.MappingProxyType(arrays))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DatabaseBundle is read-only")
+
+    def __contains__(self, name):
+        return name in self._arrays
+
+    def __getitem__(self, name):
+        """Read-only array stored under ``name``."""
+        return self._arrays[name]
+
+    def keys(self):
+        """Names of the stored arrays."""
+        return self._arrays.keys()
+
+    def __repr__(self):
+        return f"DatabaseBundle({len(self._arrays)} arrays)"
+
+
+@functools.lru_cache(maxsize=None)
+def load_bundle():
+    """Return the process-wide bundle, compiling it first if it is stale.
+
+    Returns
+    -------
+    DatabaseBundle
+        Shared by all threads; it cannot be modified
+
+    Raises
+    ------
+    FileNotFoundError
+        If a source file cannot be found
+    """
+    checksums = source_checksums()
+    path = bundle_path()
+    arrays = read_bundle(path, checksums)
+    if arrays is None:
+        arrays = compile_bundle(checksums)
+        _write_bundle(path, arrays)
+    return DatabaseBundle(arrays)
+
+
+def clear_bundle():
+    """Forget the loaded bundle so that it is validated and read again."""
+    load_bundle.cache_clear()
@@ -0,0 +1,190 @@
+"""Explicit NeqSim session with configurable JVM options and cleanup.
+
+An :class:`Engine` owns what the package otherwise sets up implicitly: the
+JVM startup options, the COMP database load, the persistent result store,
+the loaded fugacity tables and any pools registered with it. Use it as a
+context manager to get deterministic cleanup in long-running services and
+worker processes::
+
+    with Engine(max_heap="2g", gc="G1") as engine:
+        fluid = Fluid()
+        ...
+
+The JVM itself is a per-process singleton that cannot be restarted, so it is
+only shut down when the interpreter exits, or on request via
+``close(shutdown_jvm=True)``.
+"""
+
+import atexit
+import threading
+import weakref
+
+from . import jvm
+
+# Garbage collector names accepted by Engine and their JVM flags
+GARBAGE_COLLECTORS = {
+    "G1": "-XX:+UseG1GC",
+    "Parallel": "-XX:+UseParallelGC",
+    "Serial": "-XX:+UseSerialGC",
+    "Z": "-XX:+UseZGC",
+    "Shenandoah": "-XX:+UseShenandoahGC",
+}
+
+_engines: "weakref.WeakSet[Engine]" = weakref.WeakSet()
+
+
+class Engine:
+    """NeqSim session owning JVM options, database, pools and caches.
+
+    Parameters
+    ----------
+    max_heap : str, optional
+        Maximum JVM heap size, e.g. ``"2g"``
+    initial_heap : str, optional
+        Initial JVM heap size, e.g. ``"512m"``
+    gc : str, optional
+        Garbage collector, one of :data:`GARBAGE_COLLECTORS`
+    jvm_options : list of str, optional
+        Additional JVM arguments, e.g. ``["-XX:TieredStopAtLevel=1"]``
+    store : str or bool, optional
+        Path of a persistent result store to enable for the lifetime of the
+        engine, or True for the default location
+    warmup : bool, default False
+        Run :func:`solubilityccs.warmup` when the engine starts
+
+    Attributes
+    ----------
+    warmup_report : dict or None
+        Report of the warm-up run, if requested
+    """
+
+    def __init__(
+        self,
+        max_heap=None,
+        initial_heap=None,
+        gc=None,
+        jvm_options=None,
+        store=None,
+        warmup=False,
+    ):
+        if gc is not None and gc not in GARBAGE_COLLECTORS:
+            raise ValueError(
+                f"Unknown garbage collector '{gc}'; "
+                f"use one of {list(GARBAGE_COLLECTORS)}"
+            )
+        options = []
+        if initial_heap:
+            options.append(f"-Xms{initial_heap}")
+        if max_heap:
+            options.append(f"-Xmx{max_heap}")
+        if gc:
+            options.append(GARBAGE_COLLECTORS[gc])
+        options.extend(jvm_options or [])
+
+        self.jvm_options = options
+        self.store = store
+        self.warmup = warmup
+        self.warmup_report = None
+        self.started = False
+        self.closed = False
+        self._resources = []
+        self._owns_store = False
+        self._lock = threading.RLock()
+        _engines.add(self)
+
+    def start(self):
+        """Start the JVM, load the COMP database and enable the store.
+
+        Returns
+        -------
+        Engine
+            The engine itself
+        """
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Engine has been closed")
+            if self.started:
+                return self
+            jvm.configure_jvm(self.jvm_options)
+            jvm.get_jneqsim()
+            if self.store:
+                from .fugacity_store import enable_fugacity_store
+
+                enable_fugacity_store(None if self.store is True else self.store)
+                self._owns_store = True
+            if self.warmup:
+                from .neqsim_functions import warmup
+
+                self.warmup_report = warmup()
+            self.started = True
+        return self
+
+    def register(self, resource):
+        """Close ``resource`` together with the engine.
+
+        Parameters
+        ----------
+        resource : object
+            Anything with a ``close()`` method, such as a worker pool
+
+        Returns
+        -------
+        object
+            The resource itself
+        """
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("Engine has been closed")
+            self._resources.append(resource)
+        return resource
+
+    def close(self, shutdown_jvm=False):
+        """Release the pools, caches and store owned by the engine.
+
+        Parameters
+        ----------
+        shutdown_jvm : bool, default False
+            Also shut down the JVM. NeqSim can no longer be used in this
+            process afterwards.
+        """
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            resources, self._resources = self._resources, []
+        for resource in reversed(resources):
+            resource.close()
+        if self._owns_store:
+            from .fugacity_store import disable_fugacity_store
+
+            disable_fugacity_store()
+        from .fugacity_tables import clear_tables
+        from .neqsim_functions import clear_co2_memo, clear_system_pool
+
+        clear_tables()
+        clear_system_pool(all_threads=True)
+        clear_co2_memo()
+        _engines.discard(self)
+        if shutdown_jvm:
+            jvm.shutdown_jvm()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self):
+        state = "closed" if self.closed else "started" if self.started else "new"
+        return f"Engine({state}, jvm_options={self.jvm_options})"
+
+
+def close_all_engines():
+    """Close every engine that is still open."""
+    for engine in list(_engines):
+        engine.close()
+
+
+# Close engines before the JVM is shut down (atexit runs in reverse order)
+atexit.register(close_all_engines)
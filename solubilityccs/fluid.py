@@ -1,66 +1,254 @@
-import atexit
+import functools
 import math
 import warnings
-from typing import Dict, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from neqsim import jneqsim
 from scipy.optimize import bisect
 
-from .neqsim_functions import get_acid_fugacity_coeff, get_water_fugacity_coefficient
+from . import instrumentation
+from .component_registry import get_registry
+from .cubic_eos import MODELS as CUBIC_MODELS
+from .cubic_eos import (
+    cpa_deviation,
+    cubic_parameters,
+    fugacity_coefficients,
+    kij_matrix,
+)
+from .fugacity_tables import DEFAULT_TOLERANCE, tabulated_fugacity_coefficient
+from .neqsim_functions import (
+    get_acid_fugacity_coeff,
+    get_co2_parameters_batch,
+    get_fugacity_and_co2_parameters,
+    get_water_fugacity_coefficient,
+)
 from .path_utils import get_database_path
 from .sulfuric_acid_activity import calc_activity_water_h2so4
 
 # Suppress runtime warnings
 warnings.filterwarnings("ignore")
 
-# Global variable to track database initialization
-_database_initialized = False
 
+@functools.lru_cache(maxsize=None)
+def load_properties():
+    """Load the component properties database (Properties.csv) once.
 
-def _cleanup_jpype():
-    """Clean up JPype resources to prevent segmentation faults."""
-    try:
-        import jpype
+    Fluids read their properties from the array-backed registry of
+    :func:`~solubilityccs.component_registry.get_registry`; this DataFrame
+    view of the raw file is kept for inspection.
 
-        if jpype.isJVMStarted():
-            jpype.shutdownJVM()
-    except (ImportError, Exception):
-        # If JPype is not available or shutdown fails, just continue
-        pass
+    Returns
+    -------
+    pandas.DataFrame
+        Properties indexed by component name, with the values as written in
+        the file. Shared and must not be modified.
+    """
+    # Load properties database with relative path and error handling
+    try:
+        properties_path = get_database_path("Properties.csv")
+        return pd.read_csv(properties_path, sep=";", index_col="Component")
+    except FileNotFoundError as e:
+        raise RuntimeError(f"Failed to load Properties database: {str(e)}") from e
+
+
+# Properties.csv column read into each per-component property list of Fluid
+PROPERTY_ATTRIBUTES = {
+    "M": "molecular_weight",
+    "Tc": "critical_temperature",
+    "Pc": "critical_pressure",
+    "w": "accentric_factor",
+    "s": "volume_correction",
+    "A": "AntoineParameterA",
+    "B": "AntoineParameterB",
+    "C": "AntoineParameterC",
+    "UnitAnt": "AntoineParameterUnit",
+    "ActivityK1": "ActivityK1",
+    "ActivityK2": "ActivityK2",
+    "ActivityK3": "ActivityK3",
+}
+# Scalar Fluid settings carried over by Fluid.clone()
+CLONED_SETTINGS = (
+    "flow_rate",
+    "use_volume_correction",
+    "tol",
+    "factor_up",
+    "factor_down",
+    "fugacity_backend",
+    "fugacity_tolerance",
+    "h2so4_activity_method",
+)
+
+
+@functools.lru_cache(maxsize=256)
+def component_index(components):
+    """Shared name-to-position map of a component set.
+
+    Parameters
+    ----------
+    components : tuple of str
+        Component names in order
+
+    Returns
+    -------
+    dict
+        Component name to position. Shared by every phase with the same
+        component set and must not be modified.
+    """
+    return {component: i for i, component in enumerate(components)}
+
+
+class _PhaseFractions(list):
+    """Fractions of a phase as a list whose item assignments update the phase.
+
+    Assigned items are written to the phase's current fraction vector and
+    its derived quantities are cleared. Operations that would change the
+    number of fractions raise TypeError; use :meth:`Phase.set_phase` or
+    assign a new sequence to ``Phase.fractions`` instead.
+    """
+
+    __slots__ = ("_phase",)
+
+    def __init__(self, phase):
+        super().__init__(phase._fractions.tolist())
+        self._phase = phase
+
+    def __setitem__(self, index, value):
+        phase = self._phase
+        fractions = phase._fractions.copy()
+        fractions[index] = value
+        super().__setitem__(index, fractions[index].tolist())
+        phase._fractions = fractions
+        phase._derived = None
+
+    def _resize(self, *args, **kwargs):
+        raise TypeError(
+            "Phase fractions cannot be resized or reordered; use set_phase()"
+        )
 
+    append = extend = insert = pop = remove = clear = _resize
+    sort = reverse = __delitem__ = __iadd__ = __imul__ = _resize
 
-# Register cleanup function to run at exit
-atexit.register(_cleanup_jpype)
-
-
-def _initialize_database():
-    """Initialize the neqsim database if not already done."""
-    global _database_initialized
-    if not _database_initialized:
-        try:
-            comp_database_path = get_database_path("COMP.csv")
-            jneqsim.util.database.NeqSimDataBase.replaceTable(
-                "COMP", comp_database_path
-            )
-            _database_initialized = True
-        except FileNotFoundError as e:
-            raise RuntimeError(f"Failed to initialize COMP database: {str(e)}") from e
+    def __reduce__(self):
+        return (list, (list(self),))
 
 
 class Phase:
+    """One phase of a flash: component fractions, phase fraction and flow rate.
+
+    Fractions are held in a NumPy vector and components are looked up in a
+    name-to-position map shared by all phases with the same component set.
+    ``components`` reads as a new list; assign it or use :meth:`set_phase`
+    to change it. ``fractions`` reads as a new list whose item assignments
+    write through to the phase, as ``phase.fractions[i] = x`` did when the
+    fractions were a plain list; the number of fractions can only be changed
+    by assigning a new sequence or with :meth:`set_phase`.
+
+    Derived quantities (molar mass, component and total mass flows, weight
+    percentages) are computed together on first access and cached until the
+    fractions, the flow rate or the properties change. Call
+    :meth:`clear_derived` after modifying the property lists in place.
+    """
+
+    __slots__ = (
+        "_components",
+        "_index",
+        "_fractions",
+        "pressure",
+        "temperature",
+        "database",
+        "_reading_properties",
+        "_flow_rate",
+        "fraction",
+        "name",
+        "MW",
+        "_derived",
+    )
+
     def __init__(self):
-        self.components = []
+        self._components = ()
+        self._index = component_index(())
+        self._fractions = np.zeros(0)
+        self._derived = None
         self.pressure = np.nan
         self.temperature = np.nan
         self.database = np.nan
         self.reading_properties: Dict[str, List[float]] = {}
         self.flow_rate = 1e-10
-        self.fractions = []
         self.fraction = np.nan
         self.name = "None"
+        self.MW = np.nan
+
+    @property
+    def components(self):
+        return list(self._components)
+
+    @components.setter
+    def components(self, components):
+        self._components = tuple(components)
+        self._index = component_index(self._components)
+
+    @property
+    def fractions(self):
+        return _PhaseFractions(self)
+
+    @fractions.setter
+    def fractions(self, fractions):
+        self._fractions = np.array(fractions, dtype=float)
+        self._derived = None
+
+    @property
+    def flow_rate(self):
+        return self._flow_rate
+
+    @flow_rate.setter
+    def flow_rate(self, flow_rate):
+        self._flow_rate = flow_rate
+        self._derived = None
+
+    @property
+    def reading_properties(self):
+        return self._reading_properties
+
+    @reading_properties.setter
+    def reading_properties(self, reading_properties):
+        self._reading_properties = reading_properties
+        self._derived = None
+
+    def clear_derived(self):
+        """Forget the cached derived quantities."""
+        self._derived = None
+
+    def _derived_quantities(self):
+        """Molar mass, mass flows and weight percentages, computed once."""
+        derived = self._derived
+        if derived is not None:
+            if instrumentation.enabled:
+                instrumentation.record("cache_hit", "phase", 0.0)
+            return derived
+        if instrumentation.enabled:
+            instrumentation.record("cache_miss", "phase", 0.0)
+        masses = self._molar_masses()
+        mass_flows = self._flow_rate * self._fractions * masses / 1000
+        mass_flow = float(mass_flows.sum())
+        with np.errstate(divide="ignore", invalid="ignore"):
+            wt_prc = 100 * mass_flows / mass_flow
+        derived = self._derived = {
+            "molar_mass": float((masses * self._fractions / 1000).sum()),
+            "mass_flows": mass_flows,
+            "mass_flow": mass_flow,
+            "wt_prc": wt_prc,
+        }
+        return derived
+
+    def _position(self, component):
+        try:
+            return self._index[component]
+        except KeyError:
+            raise ValueError(f"Component {component} not found in phase.") from None
+
+    def _molar_masses(self):
+        return np.asarray(self.reading_properties["M"], dtype=float)
 
     def phase_to_fluid(self):
 
@@ -98,23 +286,18 @@ class Phase:
         return self.fractions
 
     def get_component_fractions(self):
-        return dict(zip(self.components, self.fractions))
+        return dict(zip(self._components, self._fractions.tolist()))
 
     def set_phase_flow_rate(self, total_flow_rate):
         self.flow_rate = total_flow_rate * self.fraction
 
     def get_molar_mass(self):
-        self.MW = 0
-        for i, component in enumerate(self.components):
-            self.MW += self.reading_properties["M"][i] * self.fractions[i] / 1000
+        self.MW = self._derived_quantities()["molar_mass"]
         return self.MW
 
     def get_fraction_component(self, component):
-        for i, componenti in enumerate(self.components):
-
-            if component == componenti:
-                return self.fractions[i]
-        return 0
+        index = self._index.get(component)
+        return 0 if index is None else self._fractions[index]
 
     def get_flow_rate(self, unit):
         if unit == "mole/hr":
@@ -125,37 +308,39 @@ class Phase:
             raise ValueError("No UNIT FOUND for Flow Rate")
 
     def get_component_flow_rate(self, component, unit):
-        index = self.components.index(component)
+        index = self._position(component)
         if unit == "mole/hr":
-            return self.flow_rate * self.fractions[index]
+            return self.flow_rate * self._fractions[index]
         elif unit == "kg/hr":
-            return (
-                self.get_component_flow_rate(component, "mole/hr")
-                * self.reading_properties["M"][index]
-                / 1000
-            )
+            return self._derived_quantities()["mass_flows"][index]
         else:
             raise ValueError("No UNIT FOUND for Flow Rate")
 
+    def get_component_mass_flows(self):
+        """Mass flow rate of each component in kg/hr."""
+        mass_flows = self._derived_quantities()["mass_flows"]
+        return dict(zip(self._components, mass_flows.tolist()))
+
+    def get_wt_prc(self):
+        """Weight percentage of each component in the phase."""
+        wt_prc = self._derived_quantities()["wt_prc"]
+        return dict(zip(self._components, wt_prc.tolist()))
+
     def get_component_fraction(self, component):
-        index = self.components.index(component)
-        return self.fractions[index]
+        return self._fractions[self._position(component)]
 
     def get_phase_flow_rate(self, unit):
-        flow_rate = 0
-        for component in self.components:
-            flow_rate = flow_rate + self.get_component_flow_rate(component, "kg/hr")
-        return flow_rate
+        return self._derived_quantities()["mass_flow"]
 
     def get_acid_wt_prc(self, name):
-        acid = self.get_component_flow_rate(name, "kg/hr")
-        phase_rate = self.get_phase_flow_rate("kg/hr")
-        return 100 * acid / phase_rate
+        return self._derived_quantities()["wt_prc"][self._position(name)]
 
     def normalize(self):
-        faktor = 1 / sum(self.fractions)
-        for i in range(len(self.fractions)):
-            self.fractions[i] = self.fractions[i] * faktor
+        # Summed left to right like the scalar code, so that flash results
+        # are reproduced bit for bit
+        faktor = 1 / sum(self._fractions.tolist())
+        self._fractions *= faktor
+        self._derived = None
 
     def set_name(self):
         if self.get_component_fraction("H2O") > 0.999:
@@ -165,19 +350,13 @@ class Phase:
 
     def set_component_fraction(self, component, fraction):
         """Set the fraction of a specific component in the phase."""
-        if component in self.components:
-            index = self.components.index(component)
-            self.fractions[index] = fraction
-        else:
-            raise ValueError(f"Component {component} not found in phase.")
+        self._fractions[self._position(component)] = fraction
+        self._derived = None
 
 
 class Fluid:
 
     def __init__(self):
-        # Initialize database when Fluid instance is created
-        _initialize_database()
-
         self.phases = []
         self.components = []
         self.fractions = []
@@ -239,14 +418,24 @@ class Fluid:
         self.factor_up = 1.1
         self.factor_down = 0.9
 
-        # Load properties database with relative path and error handling
-        try:
-            properties_path = get_database_path("Properties.csv")
-            self.properties = pd.read_csv(
-                properties_path, sep=";", index_col="Component"
-            )
-        except FileNotFoundError as e:
-            raise RuntimeError(f"Failed to load Properties database: {str(e)}") from e
+        # Source of the CO2-phase fugacity coefficients: "neqsim" (live CPA),
+        # "tabulated" (interpolated CPA grids with live fallback) or "srk"/"pr"
+        # (JVM-free cubic equations of state)
+        self.fugacity_backend = "neqsim"
+        self.fugacity_tolerance = DEFAULT_TOLERANCE
+        self.fug_coeff_error = []
+        self.kij: Dict[tuple, float] = {}
+        # Interpolation of the H2SO4 water activity table: "linear" or the
+        # continuously differentiable "pchip" surface for derivative-based
+        # solvers
+        self.h2so4_activity_method = "linear"
+        # Pure-CO2 properties at the flash conditions, evaluated only by
+        # flash_activity(report=True)
+        self.co2_properties: Dict[str, float] = {}
+
+        # Component property registry, parsed once per process and shared
+        # read-only by all fluids
+        self.properties = get_registry()
 
     def set_temperature(self, temperature):
         self.temperature = temperature
@@ -258,10 +447,28 @@ class Fluid:
         for i in range(len(self.phases)):
             self.get_phase(i).set_pressure(pressure)
 
+    @property
+    def fractions(self):
+        return self._fractions
+
+    @fractions.setter
+    def fractions(self, fractions):
+        # The molar mass is cached until the composition or the properties
+        # change through the Fluid methods or by assigning a new list
+        self._fractions = fractions
+        self._molar_mass = None
+
     def get_molar_mass(self):
-        self.MW = 0
-        for i, component in enumerate(self.components):
-            self.MW += self.reading_properties["M"][i] * self.fractions[i] / 1000
+        if self._molar_mass is None:
+            if instrumentation.enabled:
+                instrumentation.record("cache_miss", "fluid", 0.0)
+            molar_mass = 0
+            for i, component in enumerate(self.components):
+                molar_mass += self.reading_properties["M"][i] * self.fractions[i] / 1000
+            self._molar_mass = molar_mass
+        elif instrumentation.enabled:
+            instrumentation.record("cache_hit", "fluid", 0.0)
+        self.MW = self._molar_mass
         return self.MW
 
     def set_flow_rate(self, flow_rate, unit):
@@ -282,28 +489,129 @@ class Fluid:
         else:
             raise ValueError("No UNIT FOUND for Flow Rate")
 
+    def _bind_properties(self, reading_properties):
+        """Use the given per-component property sequences for this fluid."""
+        self.reading_properties = reading_properties
+        self._molar_mass = None
+        for column_name, attribute in PROPERTY_ATTRIBUTES.items():
+            setattr(self, attribute, reading_properties[column_name])
+        for phase in self.phases:
+            phase.set_properties(reading_properties)
+
     def read_property(self, component):
+        properties = self.properties.properties(component)
+        if isinstance(self.reading_properties["M"], tuple):
+            # The sequences are shared with a template or the fluid this one
+            # was cloned from; copy them before adding a component
+            self._bind_properties(
+                {name: list(values) for name, values in self.reading_properties.items()}
+            )
         for column_name, prop_list in self.reading_properties.items():
-            if component in self.properties.index:
-                try:
-                    value = self.properties.loc[component, column_name]
-                    # Handle both string and numeric values
-                    if isinstance(value, str):
-                        prop_list.append(float(value.replace(",", ".")))
-                    else:
-                        prop_list.append(float(value))
-                except (KeyError, IndexError, ValueError, TypeError):
-                    prop_list.append(self.properties.loc[component, column_name])
-            else:
-                raise ValueError(
-                    f"Properties for component {component} not found in the database."
-                )
+            prop_list.append(properties[column_name])
+        self._molar_mass = None
+        for phase in self.phases:
+            phase.clear_derived()
 
     def add_component(self, component, fraction):
         self.components.append(component)
         self.fractions.append(fraction)
         self.read_property(component)
 
+    def clone(self):
+        """Copy the inputs of this fluid into a new Fluid.
+
+        Components, composition, temperature, pressure, flow rate and the
+        calculation settings are copied; results of earlier calculations are
+        not. The per-component property sequences are shared read-only
+        (as tuples) with this fluid and its other clones, and are copied
+        only if a component is added.
+
+        Returns
+        -------
+        Fluid
+            Independent fluid, ready for ``flash_activity``
+        """
+        fluid = Fluid()
+        fluid.components = list(self.components)
+        fluid.fractions = list(self.fractions)
+        properties = self.reading_properties
+        if not isinstance(properties["M"], tuple):
+            properties = {name: tuple(values) for name, values in properties.items()}
+        fluid._bind_properties(properties)
+        for name in CLONED_SETTINGS:
+            setattr(fluid, name, getattr(self, name))
+        fluid.kij = dict(self.kij)
+        fluid.set_temperature(self.temperature)
+        fluid.set_pressure(self.pressure)
+        return fluid
+
+    @classmethod
+    def from_spec(cls, spec):
+        """Build a fluid from a :class:`FluidSpec`.
+
+        A molar flow rate is set as given; a mass flow rate is converted
+        with :meth:`set_flow_rate`, which normalizes the composition.
+        """
+        names = get_registry().names
+        fluid = cls()
+        for index, fraction in zip(spec.components, spec.fractions):
+            fluid.add_component(names[index], fraction)
+        fluid.set_temperature(spec.temperature)
+        fluid.set_pressure(spec.pressure)
+        if spec.flow_rate is not None:
+            if spec.unit == "mole/hr":
+                fluid.flow_rate = spec.flow_rate
+            else:
+                fluid.set_flow_rate(spec.flow_rate, spec.unit)
+        fluid.fugacity_backend = spec.fugacity_backend
+        return fluid
+
+    def to_spec(self):
+        """Describe the inputs of this fluid as a :class:`FluidSpec`.
+
+        The flow rate is recorded in mole/hr, so that :meth:`from_spec`
+        restores the composition unchanged.
+        """
+        return FluidSpec(
+            tuple(self.properties.row(component) for component in self.components),
+            tuple(float(fraction) for fraction in self.fractions),
+            float(self.temperature),
+            float(self.pressure),
+            float(self.flow_rate),
+            "mole/hr",
+            self.fugacity_backend,
+        )
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a flashed fluid from a :class:`FlashRecord`.
+
+        The phases, phase fraction and flow rates are restored, so that
+        :class:`ModelResults` reports the flash; the pure-CO2 properties are
+        not part of the record.
+        """
+        names = get_registry().names
+        components = [names[index] for index in record.components]
+        fluid = cls()
+        for component, fraction in zip(components, record.fractions):
+            fluid.add_component(component, fraction)
+        fluid.set_temperature(record.temperature)
+        fluid.set_pressure(record.pressure)
+        fluid.flow_rate = record.flow_rate
+        fluid.betta = record.gas_fraction
+        fluid.iteration = record.iterations
+        gas, liquid = fluid.phases
+        gas.set_phase(components, record.gas_fractions, record.gas_fraction, "gas")
+        liquid.set_phase(
+            components,
+            record.liquid_fractions,
+            1 - record.gas_fraction,
+            record.liquid_name,
+        )
+        for phase in fluid.phases:
+            phase.set_phase_flow_rate(record.flow_rate)
+        return fluid
+
     def calc_Rachford_Rice(self, betta):
         f = 0
         for k in range(len(self.K_values)):
@@ -346,6 +654,8 @@ class Fluid:
         print(f_values)
 
         # Plot the Rachford-Rice function
+        import matplotlib.pyplot as plt
+
         plt.plot(betta_values, f_values)
         plt.xlabel("Beta")
         plt.ylabel("Rachford-Rice function")
@@ -354,17 +664,11 @@ class Fluid:
         plt.show()
 
     def calc_phases(self):
-        yi = []
-        xi = []
-        for i, component in enumerate(self.components):
-            yi.append(
-                self.K_values[i]
-                * self.fractions[i]
-                / (1 - self.betta + self.betta * self.K_values[i])
-            )
-            xi.append(
-                self.fractions[i] / (1 - self.betta + self.betta * self.K_values[i])
-            )
+        K_values = np.asarray(self.K_values, dtype=float)
+        fractions = np.asarray(self.fractions, dtype=float)
+        denominator = 1 - self.betta + self.betta * K_values
+        yi = K_values * fractions / denominator
+        xi = fractions / denominator
         self.get_phase(0).set_phase(self.components, yi, self.betta, "gas")
         self.get_phase(1).set_phase(self.components, xi, 1 - self.betta, "liquid")
 
@@ -372,6 +676,7 @@ class Fluid:
         faktor = 1 / sum(self.fractions)
         for i in range(len(self.fractions)):
             self.fractions[i] = self.fractions[i] * faktor
+        self._molar_mass = None
 
     def update_k_values_activity(self):
 
@@ -398,9 +703,10 @@ class Fluid:
     def calc_activity(self):
         self.activity = []
         self.activity_coefficient = []
+        liquid_fractions = self.get_phase(1).fractions
 
         if len(self.components) == 1:
-            activity = self.get_phase(1).fractions[0] * self.vapour_pressure[0]
+            activity = liquid_fractions[0] * self.vapour_pressure[0]
             self.activity_coefficient.append(1)
             self.activity.append(activity)
             return
@@ -409,7 +715,7 @@ class Fluid:
             ("HNO3" not in self.components) and ("H2SO4" not in self.components)
         ):
             for i, component in enumerate(self.components):
-                activity = self.get_phase(1).fractions[i] * self.vapour_pressure[i]
+                activity = liquid_fractions[i] * self.vapour_pressure[i]
                 if component == "CO2":
                     activity = 1e50
                 self.activity_coefficient.append(1)
@@ -427,6 +733,7 @@ class Fluid:
                     activity += calc_activity_water_h2so4(
                         self.temperature,
                         self.get_phase(1).get_fraction_component("H2O"),
+                        method=self.h2so4_activity_method,
                     )
             elif component == "HNO3":
                 activity = np.exp(
@@ -452,13 +759,32 @@ class Fluid:
         for i, component in enumerate(self.components):
             self.activity_coefficient.append(self.activity[i])
             self.activity[i] = (
-                self.activity[i]
-                * self.get_phase(1).fractions[i]
-                * self.vapour_pressure[i]
+                self.activity[i] * liquid_fractions[i] * self.vapour_pressure[i]
             )
 
-    def calc_fugacicy_coefficient_neqsim_CPA(self):
+    def calc_fugacicy_coefficient_neqsim_CPA(self, report=False):
+        if self.fugacity_backend == "tabulated":
+            self.calc_fugacity_coefficient_tabulated()
+            return
+        elif self.fugacity_backend in CUBIC_MODELS:
+            self.calc_fugacity_coefficient_cubic(self.fugacity_backend)
+            return
+        elif self.fugacity_backend != "neqsim":
+            raise ValueError(f"Unknown fugacity backend '{self.fugacity_backend}'")
+        if report:
+            # The pure-CO2 properties share the pooled systems of this thread
+            point = get_fugacity_and_co2_parameters(
+                self.components, self.pressure, self.temperature
+            )
+            self.fug_coeff = [
+                point["fugacity_coefficients"][component]
+                for component in self.components
+            ]
+            self.fug_coeff_error = [0.0] * len(self.components)
+            self.co2_properties = point["co2_properties"]
+            return
         self.fug_coeff = []
+        self.fug_coeff_error = []
         for i, component in enumerate(self.components):
             if component == "H2O":
                 fug_c = get_water_fugacity_coefficient(
@@ -471,6 +797,119 @@ class Fluid:
             elif component == "CO2":
                 fug_c = 1.0
             self.fug_coeff.append(fug_c)
+            self.fug_coeff_error.append(0.0)
+
+    def calc_fugacity_coefficient_tabulated(self):
+        """Calculate fugacity coefficients from the tabulated CPA grids.
+
+        Fills ``fug_coeff`` and the matching relative interpolation error
+        estimates in ``fug_coeff_error``. Points outside the tables are
+        evaluated with the live CPA model and report an error of zero.
+        """
+        self.fug_coeff = []
+        self.fug_coeff_error = []
+        for component in self.components:
+            if component == "CO2":
+                fug_c, error = 1.0, 0.0
+            else:
+                fug_c, error = tabulated_fugacity_coefficient(
+                    component,
+                    self.pressure,
+                    self.temperature,
+                    tolerance=self.fugacity_tolerance,
+                )
+            self.fug_coeff.append(fug_c)
+            self.fug_coeff_error.append(error)
+
+    def calc_cubic_parameters(self, model="srk"):
+        """Calculate the cubic EOS parameters m, alpha, a, b, A and B.
+
+        Parameters
+        ----------
+        model : {"srk", "pr"}
+            Equation of state
+        """
+        params = cubic_parameters(
+            model,
+            self.temperature,
+            self.pressure,
+            self.critical_temperature,
+            self.critical_pressure,
+            self.accentric_factor,
+        )
+        self.m = params["m"][0].tolist()
+        self.alpha = params["alpha"][0].tolist()
+        self.a = params["a"][0].tolist()
+        self.b = params["b"][0].tolist()
+        self.A = params["A"][0].tolist()
+        self.B = params["B"][0].tolist()
+
+    def calc_fugacity_coefficient_cubic(self, model="srk"):
+        """Calculate fugacity coefficients with a cubic equation of state.
+
+        The coefficients are evaluated in the CO2-rich phase at the feed
+        composition without any JVM call. Binary interaction parameters
+        default to :data:`solubilityccs.cubic_eos.DEFAULT_KIJ` and can be
+        overridden through ``kij``; the Peneloux volume correction from
+        Properties.csv is applied when ``use_volume_correction`` is set. CO2
+        keeps a coefficient of 1, as in the CPA backend.
+
+        Parameters
+        ----------
+        model : {"srk", "pr"}
+            Equation of state
+        """
+        self.calc_cubic_parameters(model)
+        phi = fugacity_coefficients(
+            model,
+            self.temperature,
+            self.pressure,
+            self.fractions,
+            self.critical_temperature,
+            self.critical_pressure,
+            self.accentric_factor,
+            kij=kij_matrix(model, self.components, self.kij),
+            volume_shift=(
+                self.volume_correction if self.use_volume_correction else None
+            ),
+        )[0]
+        self.fug_coeff = [
+            1.0 if component == "CO2" else float(phi[i])
+            for i, component in enumerate(self.components)
+        ]
+        self.fug_coeff_error = [np.nan] * len(self.components)
+
+    def cpa_deviation(self, model=None):
+        """Relative deviation of cubic fugacity coefficients from CPA.
+
+        Parameters
+        ----------
+        model : {"srk", "pr"}, optional
+            Equation of state; defaults to the selected cubic backend, or SRK
+
+        Returns
+        -------
+        dict
+            Maps each non-CO2 component to ``phi_cubic / phi_cpa - 1``
+        """
+        if model is None:
+            model = (
+                self.fugacity_backend
+                if self.fugacity_backend in CUBIC_MODELS
+                else "srk"
+            )
+        deviation = cpa_deviation(
+            model,
+            self.components,
+            self.fractions,
+            self.temperature,
+            self.pressure,
+            kij=kij_matrix(model, self.components, self.kij),
+            volume_shift=(
+                self.volume_correction if self.use_volume_correction else None
+            ),
+        )
+        return {component: float(value[0]) for component, value in deviation.items()}
 
     def calc_fugacity_neqsim_CPA(self, fractions):
         self.fugacity = []
@@ -490,6 +929,7 @@ class Fluid:
         if component in self.components:
             index = self.components.index(component)
             self.fractions[index] = fraction
+            self._molar_mass = None
         else:
             raise ValueError(f"Component {component} not found in fluid.")
 
@@ -509,12 +949,33 @@ class Fluid:
         if "HNO3" in self.components and self.get_component_fraction("HNO3") < 1e-30:
             self.set_component_fraction("HNO3", 1e-30)
 
-    def flash_activity(self):
+    @instrumentation.instrumented("flash", "flash_activity")
+    def flash_activity(self, report=False):
+        """Flash the fluid with the activity model.
+
+        Parameters
+        ----------
+        report : bool, default False
+            Also evaluate the pure-CO2 properties at the flash conditions into
+            :attr:`co2_properties`, which :class:`ModelResults` reports. The
+            "neqsim" backend evaluates them together with the fugacity
+            coefficients; the "tabulated" backend interpolates them.
+        """
+        self.co2_properties = {}
         self.validate_composition()
         self.calc_vapour_pressure()
         self.normalize()
         self.K_values = [1e50, 0.005, 0.005]
-        self.calc_fugacicy_coefficient_neqsim_CPA()
+        self.calc_fugacicy_coefficient_neqsim_CPA(report=report)
+        if report and not self.co2_properties and "CO2" in self.components:
+            properties = get_co2_parameters_batch(
+                self.pressure,
+                self.temperature,
+                tabulated=self.fugacity_backend == "tabulated",
+            )
+            self.co2_properties = {
+                name: float(value) for name, value in properties.items()
+            }
         self.iteration = 0
         while 1:
             K_old = self.K_values.copy()
@@ -602,6 +1063,227 @@ class Fluid:
         return solubility_ppm
 
 
+class FluidSpec(NamedTuple):
+    """Compact, picklable description of a fluid to flash.
+
+    Components are stored as rows of the component registry, so a
+    specification pickles to about a hundred bytes. Use it to send
+    operating points to worker processes; see :meth:`Fluid.from_spec`.
+
+    Attributes
+    ----------
+    components : tuple of int
+        Rows of the components in
+        :func:`~solubilityccs.component_registry.get_registry`
+    fractions : tuple of float
+        Mole fractions, in the order of ``components``
+    temperature : float
+        Temperature in K
+    pressure : float
+        Pressure in bara
+    flow_rate : float or None
+        Total flow rate, or None to keep the default
+    unit : {"kg/hr", "mole/hr"}
+        Unit of ``flow_rate``
+    fugacity_backend : str
+        Value for :attr:`Fluid.fugacity_backend`
+    """
+
+    components: Tuple[int, ...]
+    fractions: Tuple[float, ...]
+    temperature: float
+    pressure: float
+    flow_rate: Optional[float] = None
+    unit: str = "kg/hr"
+    fugacity_backend: str = "neqsim"
+
+    @classmethod
+    def from_composition(
+        cls,
+        temperature,
+        pressure,
+        composition,
+        flow_rate=None,
+        unit="kg/hr",
+        fugacity_backend="neqsim",
+    ):
+        """Build a specification from a composition keyed by component name.
+
+        Raises
+        ------
+        ValueError
+            If a component is not in the property database
+        """
+        registry = get_registry()
+        return cls(
+            tuple(registry.row(component) for component in composition),
+            tuple(float(fraction) for fraction in composition.values()),
+            float(temperature),
+            float(pressure),
+            None if flow_rate is None else float(flow_rate),
+            unit,
+            fugacity_backend,
+        )
+
+    @property
+    def component_names(self):
+        """Names of the components, in order."""
+        names = get_registry().names
+        return [names[index] for index in self.components]
+
+
+class FlashRecord(NamedTuple):
+    """Compact, picklable result of ``flash_activity``.
+
+    Holds the validated feed, the conditions and the phase split, which is
+    what :meth:`Fluid.from_record` needs to rebuild the flashed fluid for
+    :class:`ModelResults`. The pure-CO2 properties are not included.
+
+    Attributes
+    ----------
+    components : tuple of int
+        Registry rows of the components, including any added by the flash
+    fractions : tuple of float
+        Normalized feed mole fractions
+    temperature : float
+        Temperature in K
+    pressure : float
+        Pressure in bara
+    flow_rate : float
+        Total flow rate in mole/hr
+    gas_fraction : float
+        Molar fraction of the gas phase (``Fluid.betta``)
+    gas_fractions : tuple of float
+        Gas phase mole fractions
+    liquid_fractions : tuple of float
+        Liquid phase mole fractions
+    liquid_name : str
+        Name of the liquid phase ("AQUEOUS" or "ACIDIC")
+    iterations : int
+        Iterations of the flash
+    """
+
+    components: Tuple[int, ...]
+    fractions: Tuple[float, ...]
+    temperature: float
+    pressure: float
+    flow_rate: float
+    gas_fraction: float
+    gas_fractions: Tuple[float, ...]
+    liquid_fractions: Tuple[float, ...]
+    liquid_name: str
+    iterations: int
+
+    @classmethod
+    def from_fluid(cls, fluid):
+        """Record the result of a fluid after ``flash_activity``."""
+        spec = fluid.to_spec()
+        gas, liquid = fluid.phases
+        return cls(
+            spec.components,
+            spec.fractions,
+            spec.temperature,
+            spec.pressure,
+            spec.flow_rate,
+            float(fluid.betta),
+            tuple(gas.fractions),
+            tuple(liquid.fractions),
+            liquid.name,
+            int(fluid.iteration),
+        )
+
+
+class FluidTemplate:
+    """Fixed component set from which fluids are stamped out quickly.
+
+    The components and their properties are looked up once; every call of
+    :meth:`create` then clones a prototype fluid that shares the property
+    sequences, and sets the composition, conditions and flow rate of one
+    evaluation.
+
+    Parameters
+    ----------
+    components : sequence of str
+        Component names, in the order of the fractions passed to
+        :meth:`create`
+    **settings
+        Fluid attributes applied to every fluid, e.g.
+        ``fugacity_backend="tabulated"``
+
+    Raises
+    ------
+    ValueError
+        If a component is not in the property database
+    AttributeError
+        If a setting is not a Fluid attribute
+    """
+
+    def __init__(self, components, **settings):
+        prototype = Fluid()
+        for component in components:
+            prototype.add_component(component, 0.0)
+        for name, value in settings.items():
+            if not hasattr(prototype, name):
+                raise AttributeError(f"Fluid has no setting '{name}'")
+            setattr(prototype, name, value)
+        self.components = tuple(prototype.components)
+        self._index = {component: i for i, component in enumerate(self.components)}
+        self._prototype = prototype.clone()
+
+    def create(self, temperature, pressure, fractions, flow_rate=None, unit="kg/hr"):
+        """Return a new fluid for one evaluation.
+
+        Parameters
+        ----------
+        temperature : float
+            Temperature in K
+        pressure : float
+            Pressure in bara
+        fractions : sequence of float or dict
+            Mole fractions in the order of ``components``, or a mapping from
+            component name to fraction (missing components get zero)
+        flow_rate : float, optional
+            Flow rate, set with :meth:`Fluid.set_flow_rate` (which normalizes
+            the composition)
+        unit : {"kg/hr", "mole/hr"}
+            Unit of ``flow_rate``
+
+        Returns
+        -------
+        Fluid
+            Independent fluid, ready for ``flash_activity``
+
+        Raises
+        ------
+        ValueError
+            If the fractions do not match the components of the template
+        """
+        if isinstance(fractions, dict):
+            unknown = set(fractions) - set(self._index)
+            if unknown:
+                raise ValueError(
+                    f"Components {sorted(unknown)} are not in the template "
+                    f"{list(self.components)}"
+                )
+            values = [0.0] * len(self.components)
+            for component, fraction in fractions.items():
+                values[self._index[component]] = fraction
+        else:
+            values = list(fractions)
+            if len(values) != len(self.components):
+                raise ValueError(
+                    f"Expected {len(self.components)} fractions for "
+                    f"{list(self.components)}, got {len(values)}"
+                )
+        fluid = self._prototype.clone()
+        fluid.fractions = values
+        fluid.set_temperature(temperature)
+        fluid.set_pressure(pressure)
+        if flow_rate is not None:
+            fluid.set_flow_rate(flow_rate, unit)
+        return fluid
+
+
 class ModelResults:
     """Class to format and display modeling results as a clean table string."""
 
@@ -613,9 +1295,12 @@ class ModelResults:
         fluid : Fluid
             The fluid object after flash calculations
         co2_properties : dict, optional
-            Dictionary with CO2 properties from get_co2_parameters
+            Dictionary with CO2 properties from get_co2_parameters. Defaults
+            to the properties evaluated by ``flash_activity(report=True)``.
         """
         self.fluid = fluid
+        if co2_properties is None:
+            co2_properties = fluid.co2_properties
         self.co2_properties = co2_properties or {}
 
     def generate_table(self, include_co2_props=True, include_liquid_details=True):
@@ -0,0 +1,263 @@
+"""Persistent on-disk store for CPA fugacity coefficients and CO2 properties.
+
+Results of the NeqSim helper calculations are written to a SQLite database so
+that new processes and pool workers can reuse them instead of recomputing them
+in a cold JVM. Every entry is keyed by the function inputs and by a model
+fingerprint (COMP.csv checksum, package version, model version and kij
+values), so entries produced by a different model are never served.
+
+The store is optional. Enable it with :func:`enable_fugacity_store` or by
+setting the ``SOLUBILITYCCS_FUGACITY_STORE`` environment variable to a file
+path before the first calculation.
+"""
+
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+
+STORE_ENV_VAR = "SOLUBILITYCCS_FUGACITY_STORE"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    kind TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (kind, inputs, fingerprint)
+) WITHOUT ROWID
+"""
+
+_store = None
+_store_resolved = False
+_store_lock = threading.Lock()
+
+
+def _to_plain(value):
+    """Convert JVM and NumPy scalars to plain Python values for JSON."""
+    if isinstance(value, dict):
+        return {str(key): _to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain(item) for item in value]
+    if isinstance(value, str) or value is None:
+        return value
+    if isinstance(value, bool):
+        return value
+    return float(value)
+
+
+class FugacityStore:
+    """SQLite-backed store shared by threads and processes.
+
+    The database runs in WAL mode so that any number of readers can proceed
+    while one writer commits. Each thread (and each forked process) opens its
+    own connection; concurrent inserts of the same key are resolved with
+    ``INSERT OR IGNORE`` because all writers compute identical values.
+
+    Parameters
+    ----------
+    path : str or Path
+        Location of the SQLite database file. Parent directories are created.
+    fingerprint : str, optional
+        Model fingerprint used to key entries. Defaults to
+        :func:`solubilityccs.neqsim_functions.model_fingerprint`.
+    timeout : float, default 30.0
+        Seconds to wait for a lock held by another writer.
+    """
+
+    def __init__(self, path, fingerprint=None, timeout=30.0):
+        self.path = os.path.abspath(os.fspath(path))
+        self.timeout = timeout
+        if fingerprint is None:
+            from .neqsim_functions import model_fingerprint
+
+            fingerprint = model_fingerprint()
+        self.fingerprint = fingerprint
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.execute(_SCHEMA)
+        connection.commit()
+
+    def _connection(self):
+        """Return the connection owned by the calling thread and process."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    @staticmethod
+    def make_key(inputs):
+        """Serialize call inputs into the canonical text key."""
+        return json.dumps(_to_plain(inputs), separators=(",", ":"))
+
+    def get(self, kind, inputs):
+        """Return the stored value for ``inputs`` or None if absent."""
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM results "
+                "WHERE kind = ? AND inputs = ? AND fingerprint = ?",
+                (kind, self.make_key(inputs), self.fingerprint),
+            )
+            .fetchone()
+        )
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def put(self, kind, inputs, value):
+        """Store ``value`` for ``inputs``; existing entries are kept."""
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?)",
+                (
+                    kind,
+                    self.make_key(inputs),
+                    self.fingerprint,
+                    json.dumps(_to_plain(value)),
+                ),
+            )
+
+    def get_or_compute(self, kind, inputs, compute):
+        """Return the stored value, computing and storing it on a miss."""
+        value = self.get(kind, inputs)
+        if value is None:
+            value = _to_plain(compute())
+            self.put(kind, inputs, value)
+        return value
+
+    def purge_stale(self):
+        """Delete entries written under a different model fingerprint.
+
+        Returns
+        -------
+        int
+            Number of deleted entries
+        """
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM results WHERE fingerprint != ?", (self.fingerprint,)
+            )
+        return cursor.rowcount
+
+    def clear(self):
+        """Delete all entries."""
+        connection = self._connection()
+        with connection:
+            connection.execute("DELETE FROM results")
+
+    def close(self):
+        """Close the connection owned by the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            connection.close()
+        self._local.connection = None
+
+    def __len__(self):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM results WHERE fingerprint = ?",
+                (self.fingerprint,),
+            )
+            .fetchone()
+        )
+        return row[0]
+
+
+def enable_fugacity_store(path=None, fingerprint=None):
+    """Enable the persistent store for the NeqSim helper functions.
+
+    Parameters
+    ----------
+    path : str or Path, optional
+        Database file. Defaults to the ``SOLUBILITYCCS_FUGACITY_STORE``
+        environment variable, then to ``~/.cache/solubilityccs/fugacity.sqlite``.
+    fingerprint : str, optional
+        Override of the model fingerprint (mainly for testing)
+
+    Returns
+    -------
+    FugacityStore
+        The active store
+    """
+    global _store, _store_resolved
+    if path is None:
+        path = os.environ.get(STORE_ENV_VAR) or os.path.join(
+            os.path.expanduser("~"), ".cache", "solubilityccs", "fugacity.sqlite"
+        )
+    store = FugacityStore(path, fingerprint=fingerprint)
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = store
+        _store_resolved = True
+    return store
+
+
+def disable_fugacity_store():
+    """Disable the persistent store; calculations go straight to NeqSim."""
+    global _store, _store_resolved
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+        _store = None
+        _store_resolved = True
+
+
+def get_fugacity_store():
+    """Return the active store, or None when the store is disabled.
+
+    On the first call the ``SOLUBILITYCCS_FUGACITY_STORE`` environment
+    variable is consulted, so worker processes pick up the store without
+    any explicit setup.
+    """
+    global _store, _store_resolved
+    if not _store_resolved:
+        with _store_lock:
+            if not _store_resolved:
+                path = os.environ.get(STORE_ENV_VAR)
+                if path:
+                    _store = FugacityStore(path)
+                _store_resolved = True
+    return _store
+
+
+def stored(kind):
+    """Route calls of the decorated function through the active store.
+
+    Parameters
+    ----------
+    kind : str
+        Name of the result family, e.g. ``"water_fugacity_coefficient"``
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = get_fugacity_store()
+            if store is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return store.get_or_compute(
+                kind, list(bound.arguments.values()), lambda: func(*args, **kwargs)
+            )
+
+        return wrapper
+
+    return decorator
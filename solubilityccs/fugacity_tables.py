@@ -0,0 +1,439 @@
+"""Tabulated fugacity coefficients with bicubic spline interpolation.
+
+The CPA helper systems used for water and the acids have fixed compositions,
+so their fugacity coefficients in the CO2-rich phase are smooth functions of
+temperature and pressure only. This module loads precomputed (T, P) grids from
+``solubilityccs/Database`` and interpolates them with bicubic splines, falling
+back to the live NeqSim calculation outside the grid or where the
+interpolation error estimate is too large.
+
+Component tables are named ``fugacity_<NAME>.npz`` and the pure-CO2 property
+table ``co2_properties.npz``. They contain:
+
+- ``temperature``: ascending temperature axis in Kelvin
+- ``pressure``: ascending pressure axis in bara
+- ``values``: array of shape (n_temperature, n_pressure, n_quantities)
+- ``quantities``: names of the tabulated quantities
+- ``transform``: "log" to interpolate log(values), "linear" otherwise
+- ``format_version``, ``source_model``, ``fingerprint`` and ``checksum``:
+  provenance metadata written by :mod:`solubilityccs.table_generator`
+
+The tables are read into memory rather than memory-mapped: the splines are
+fitted to every node when a table is loaded, so all values would be read
+anyway, and the packaged tables are well under 1 MB.
+
+The shipped tables meet :data:`DEFAULT_TOLERANCE` on 80 to 87% of the
+-50 to 60 °C, 1 to 301 bara envelope and on more than 95% of the dense-phase
+region (0 to 40 °C, 80 to 200 bara). The fugacity coefficients and CO2
+properties jump across the CO2 saturation line, which no spline on a
+rectilinear grid can follow, so points within a few bar of saturation (ship
+transport conditions among them) are evaluated live.
+"""
+
+import hashlib
+import threading
+import warnings
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.interpolate import RectBivariateSpline
+
+from .path_utils import get_database_path
+
+TABLE_FORMAT_VERSION = 1
+
+# Relative error above which a tabulated value is replaced by a live CPA call
+DEFAULT_TOLERANCE = 1e-3
+
+# Quantity name in the component tables
+FUGACITY_COEFFICIENT = "fugacity_coefficient"
+
+# Name and quantities of the pure-CO2 property table
+CO2_PROPERTIES = "co2_properties"
+CO2_PROPERTY_NAMES = ["density", "speed_of_sound", "enthalpy", "entropy"]
+
+_tables: Dict[str, Optional["FugacityTable"]] = {}
+_tables_lock = threading.Lock()
+
+
+def table_filename(name):
+    """Return the Database file name of the table for ``name``."""
+    if name == CO2_PROPERTIES:
+        return f"{CO2_PROPERTIES}.npz"
+    return f"fugacity_{name}.npz"
+
+
+def table_checksum(temperature, pressure, values):
+    """Return the SHA-256 checksum of a table's axes and values."""
+    digest = hashlib.sha256()
+    for array in (temperature, pressure, values):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def _fit_spline(x, y, z):
+    """Fit an interpolating spline of degree up to 3 on each axis."""
+    kx = min(3, len(x) - 1)
+    ky = min(3, len(y) - 1)
+    return RectBivariateSpline(x, y, z, kx=kx, ky=ky, s=0)
+
+
+class FugacityTable:
+    """Rectilinear (T, P) grid of one or more quantities.
+
+    Parameters
+    ----------
+    temperature : array_like
+        Ascending temperature axis in Kelvin
+    pressure : array_like
+        Ascending pressure axis in bara
+    values : array_like
+        Values with shape (n_temperature, n_pressure, n_quantities)
+    quantities : sequence of str
+        Names of the quantities along the last axis of ``values``
+    transform : {"log", "linear"}, default "log"
+        Interpolate ``log(values)`` (for strictly positive quantities such as
+        fugacity coefficients) or the values themselves
+    metadata : dict, optional
+        Provenance information stored alongside the grid
+    """
+
+    def __init__(
+        self, temperature, pressure, values, quantities, transform="log", metadata=None
+    ):
+        self.temperature = np.asarray(temperature, dtype=float)
+        self.pressure = np.asarray(pressure, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        if self.values.ndim == 2:
+            self.values = self.values[:, :, np.newaxis]
+        self.quantities = [str(q) for q in quantities]
+        self.transform = str(transform)
+        self.metadata = dict(metadata or {})
+
+        expected = (len(self.temperature), len(self.pressure), len(self.quantities))
+        if self.values.shape != expected:
+            raise ValueError(
+                f"Table values have shape {self.values.shape}, expected {expected}"
+            )
+        if self.transform not in ("log", "linear"):
+            raise ValueError(f"Unknown table transform '{self.transform}'")
+
+        self._splines = []
+        self._errors = []
+        for i in range(len(self.quantities)):
+            z = self._forward(self.values[:, :, i])
+            self._splines.append(_fit_spline(self.temperature, self.pressure, z))
+            self._errors.append(self._cell_error_estimate(z))
+
+    def _forward(self, values):
+        return np.log(values) if self.transform == "log" else values
+
+    def _inverse(self, values):
+        return np.exp(values) if self.transform == "log" else values
+
+    def _cell_error_estimate(self, z):
+        """Estimate the interpolation error in every grid cell.
+
+        A spline is fitted on every other node and compared with the nodes it
+        skipped. Halving the spacing of a cubic spline reduces the error by
+        about 2**4, which gives the estimate for the full grid. Each cell gets
+        the largest estimate found on the corners of itself and its
+        neighbours. The estimate is a relative error: log-transformed values
+        give it directly, linear values are divided by their magnitude.
+        """
+        n_t, n_p = z.shape
+        if n_t < 3 or n_p < 3:
+            return np.full((max(n_t - 1, 1), max(n_p - 1, 1)), np.inf)
+        coarse = _fit_spline(self.temperature[::2], self.pressure[::2], z[::2, ::2])
+        nodes = np.abs(coarse(self.temperature, self.pressure) - z) / 2**4
+        if self.transform == "linear":
+            with np.errstate(divide="ignore", invalid="ignore"):
+                nodes = nodes / np.abs(z)
+            nodes[np.isnan(nodes)] = np.inf
+        cells = np.maximum.reduce(
+            [nodes[:-1, :-1], nodes[1:, :-1], nodes[:-1, 1:], nodes[1:, 1:]]
+        )
+        # Take the neighbouring cells into account as well, since a kink or
+        # jump inside a cell is only seen by the nodes around it
+        padded = np.pad(cells, 1, mode="edge")
+        return np.maximum.reduce(
+            [
+                padded[i : i + cells.shape[0], j : j + cells.shape[1]]
+                for i in range(3)
+                for j in range(3)
+            ]
+        )
+
+    def contains(self, temperature, pressure):
+        """Return a boolean mask of points inside the tabulated range."""
+        temperature = np.asarray(temperature, dtype=float)
+        pressure = np.asarray(pressure, dtype=float)
+        return (
+            (temperature >= self.temperature[0])
+            & (temperature <= self.temperature[-1])
+            & (pressure >= self.pressure[0])
+            & (pressure <= self.pressure[-1])
+        )
+
+    def evaluate(self, temperature, pressure, quantity=None):
+        """Interpolate a quantity at arrays of (T, P) points.
+
+        Parameters
+        ----------
+        temperature : array_like
+            Temperatures in Kelvin
+        pressure : array_like
+            Pressures in bara
+        quantity : str, optional
+            Quantity to interpolate; defaults to the first one
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Interpolated values and their error estimates. Points outside the
+            table are returned as NaN with an infinite error estimate.
+        """
+        index = 0 if quantity is None else self.quantities.index(quantity)
+        temperature, pressure = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(temperature, dtype=float)),
+            np.atleast_1d(np.asarray(pressure, dtype=float)),
+        )
+        inside = self.contains(temperature, pressure)
+
+        values = np.full(temperature.shape, np.nan)
+        errors = np.full(temperature.shape, np.inf)
+        t_in = temperature[inside]
+        p_in = pressure[inside]
+        values[inside] = self._inverse(self._splines[index].ev(t_in, p_in))
+
+        errors_grid = self._errors[index]
+        i = np.clip(
+            np.searchsorted(self.temperature, t_in, side="right") - 1,
+            0,
+            errors_grid.shape[0] - 1,
+        )
+        j = np.clip(
+            np.searchsorted(self.pressure, p_in, side="right") - 1,
+            0,
+            errors_grid.shape[1] - 1,
+        )
+        errors[inside] = errors_grid[i, j]
+        return values, errors
+
+    def save(self, path):
+        """Write the table to an uncompressed ``.npz`` file."""
+        metadata = {key: np.asarray(value) for key, value in self.metadata.items()}
+        metadata.setdefault("format_version", np.asarray(TABLE_FORMAT_VERSION))
+        np.savez(
+            path,
+            temperature=self.temperature,
+            pressure=self.pressure,
+            values=self.values,
+            quantities=np.asarray(self.quantities),
+            transform=np.asarray(self.transform),
+            **metadata,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read a table written by :meth:`save`.
+
+        Raises
+        ------
+        ValueError
+            If the table was written by a newer format version or its
+            checksum does not match its contents
+        """
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        format_version = int(arrays.pop("format_version", TABLE_FORMAT_VERSION))
+        if format_version > TABLE_FORMAT_VERSION:
+            raise ValueError(
+                f"Table {path} has format version {format_version}; this version "
+                f"of SolubilityCCS reads up to {TABLE_FORMAT_VERSION}"
+            )
+        temperature = arrays.pop("temperature")
+        pressure = arrays.pop("pressure")
+        values = arrays.pop("values")
+        quantities = arrays.pop("quantities").tolist()
+        transform = str(arrays.pop("transform"))
+        metadata = {key: value.tolist() for key, value in arrays.items()}
+        metadata["format_version"] = format_version
+        checksum = metadata.get("checksum")
+        if checksum is not None and checksum != table_checksum(
+            temperature, pressure, values
+        ):
+            raise ValueError(f"Table {path} is corrupt: checksum mismatch")
+        return cls(temperature, pressure, values, quantities, transform, metadata)
+
+
+def _load_packaged_table(name):
+    """Load a packaged table, rejecting tables built for another model."""
+    try:
+        path = get_database_path(table_filename(name))
+    except FileNotFoundError:
+        return None
+    table = FugacityTable.load(path)
+
+    from .neqsim_functions import model_fingerprint
+
+    fingerprint = table.metadata.get("fingerprint")
+    if fingerprint is not None and fingerprint != model_fingerprint(
+        include_version=False
+    ):
+        warnings.warn(
+            f"Ignoring {path}: it was generated for a different CPA model. "
+            f"Regenerate it with solubilityccs-tables.",
+            RuntimeWarning,
+        )
+        return None
+    return table
+
+
+def get_table(name):
+    """Return the packaged table for ``name``, or None if it is not shipped.
+
+    Tables are loaded once per process and shared between threads. Tables
+    whose model fingerprint does not match the current COMP.csv, model
+    version and kij values are ignored.
+    """
+    if name not in _tables:
+        with _tables_lock:
+            if name not in _tables:
+                _tables[name] = _load_packaged_table(name)
+    return _tables[name]
+
+
+def clear_tables():
+    """Forget all loaded tables so they are read again on next use."""
+    with _tables_lock:
+        _tables.clear()
+
+
+def live_fugacity_coefficient(component, pressure, temperature):
+    """Evaluate the CPA fugacity coefficient with NeqSim (T in Kelvin)."""
+    from .neqsim_functions import (
+        get_acid_fugacity_coeff,
+        get_water_fugacity_coefficient,
+    )
+
+    if component == "H2O":
+        return get_water_fugacity_coefficient(pressure, temperature - 273.15)[1]
+    return get_acid_fugacity_coeff(component, pressure, temperature - 273.15)[0]
+
+
+def tabulated_fugacity_coefficient(
+    component, pressure, temperature, tolerance=DEFAULT_TOLERANCE
+):
+    """Fugacity coefficient of a component in the CO2-rich phase from tables.
+
+    Points outside the tabulated range, points where the interpolation error
+    estimate exceeds ``tolerance`` and components without a table are
+    evaluated with the live NeqSim CPA model.
+
+    Parameters
+    ----------
+    component : str
+        "H2O", "HNO3" or "H2SO4"
+    pressure : float or array_like
+        Pressure in bara
+    temperature : float or array_like
+        Temperature in Kelvin
+    tolerance : float, default 1e-3
+        Largest accepted relative interpolation error estimate
+
+    Returns
+    -------
+    tuple
+        Fugacity coefficients and error estimates, with the shape of the
+        broadcast inputs (floats for scalar inputs). Live CPA values have an
+        error estimate of zero.
+    """
+    temperature, pressure = np.broadcast_arrays(
+        np.asarray(temperature, dtype=float), np.asarray(pressure, dtype=float)
+    )
+    shape = temperature.shape
+    temperature = temperature.ravel()
+    pressure = pressure.ravel()
+
+    table = get_table(component)
+    if table is None:
+        values = np.full(temperature.shape, np.nan)
+        errors = np.full(temperature.shape, np.inf)
+    else:
+        values, errors = table.evaluate(temperature, pressure, FUGACITY_COEFFICIENT)
+
+    live = ~(errors <= tolerance)
+    for i in np.flatnonzero(live):
+        values[i] = live_fugacity_coefficient(
+            component, float(pressure[i]), float(temperature[i])
+        )
+    errors[live] = 0.0
+
+    if not shape:
+        return float(values[0]), float(errors[0])
+    return values.reshape(shape), errors.reshape(shape)
+
+
+def tabulated_co2_parameters(
+    pressure, temperature, tolerance=DEFAULT_TOLERANCE, properties=None
+):
+    """Pure-CO2 properties from the tabulated CPA surface.
+
+    Points outside the table or where the interpolation error estimate of any
+    property exceeds ``tolerance`` are evaluated with
+    :func:`solubilityccs.neqsim_functions.get_co2_parameters`.
+
+    Parameters
+    ----------
+    pressure : float or array_like
+        Pressure in bara
+    temperature : float or array_like
+        Temperature in Kelvin
+    tolerance : float, default 1e-3
+        Largest accepted relative interpolation error estimate
+    properties : sequence of str, optional
+        Subset of :data:`CO2_PROPERTY_NAMES` to evaluate, all by default
+
+    Returns
+    -------
+    tuple
+        Dictionary of the requested property arrays and the array of their
+        largest error estimate per point, both with the shape of the
+        broadcast inputs. Live values have an error of zero.
+    """
+    names = list(CO2_PROPERTY_NAMES if properties is None else properties)
+    temperature, pressure = np.broadcast_arrays(
+        np.asarray(temperature, dtype=float), np.asarray(pressure, dtype=float)
+    )
+    shape = temperature.shape
+    temperature = temperature.ravel()
+    pressure = pressure.ravel()
+
+    table = get_table(CO2_PROPERTIES)
+    values = {}
+    errors = np.zeros(temperature.shape)
+    for name in names:
+        if table is None:
+            values[name] = np.full(temperature.shape, np.nan)
+            errors[:] = np.inf
+        else:
+            values[name], error = table.evaluate(temperature, pressure, name)
+            errors = np.maximum(errors, error)
+
+    live = ~(errors <= tolerance)
+    if np.any(live):
+        from .neqsim_functions import get_co2_parameters
+
+        for i in np.flatnonzero(live):
+            live_values = get_co2_parameters(
+                float(pressure[i]), float(temperature[i]), names
+            )
+            for name in names:
+                values[name][i] = live_values[name]
+    errors[live] = 0.0
+
+    return (
+        {name: value.reshape(shape) for name, value in values.items()},
+        errors.reshape(shape),
+    )
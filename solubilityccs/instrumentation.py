@@ -0,0 +1,375 @@
+"""Optional counters and timers for the NeqSim calculations.
+
+Instrumentation is disabled by default. While it is disabled every hook is a
+single flag check, so the calculations run at full speed. Enable it globally
+with :func:`enable_stats`, or for a block of code with :func:`collect_stats`::
+
+    with collect_stats() as scope:
+        fluid.flash_activity()
+    print(scope["jpype_calls"], scope["neqsim_time"], scope["python_time"])
+
+Recorded quantities:
+
+* flashes: ``Fluid.flash_activity`` calls and their wall time
+* sections: calls, wall time and bytes allocated by the JVM in each CPA
+  helper (water, acid and CO2 calculations)
+* systems: NeqSim systems created for the system pool and the time spent
+  building them
+* methods: calls and time of every Java method invoked on the pooled
+  systems (JPype crossings), including ``TPflash``
+* derived caches: hits and misses of the cached molar masses, mass flows
+  and weight percentages of fluids and phases
+
+Counts are shared by all threads of the process. :func:`memory_usage`
+samples the resident set size and the JVM heap, for example to watch a
+long-running service.
+"""
+
+import contextlib
+import functools
+import gc
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Tuple
+
+# Checked by every hook; True while enable_stats() is active or a
+# collect_stats() block is running
+enabled = False
+
+_lock = threading.Lock()
+_explicit = False
+_scopes = 0
+# (kind, name) -> [calls, seconds, java allocated bytes]
+_records: Dict[Tuple[str, str], List[float]] = {}
+_thread_bean = None
+
+
+def _update_enabled():
+    global enabled
+    enabled = _explicit or _scopes > 0
+
+
+def enable_stats():
+    """Start recording counters and timers."""
+    global _explicit
+    with _lock:
+        _explicit = True
+        _update_enabled()
+
+
+def disable_stats():
+    """Stop recording; the counts collected so far are kept."""
+    global _explicit
+    with _lock:
+        _explicit = False
+        _update_enabled()
+
+
+def reset_stats():
+    """Discard all counts collected so far."""
+    with _lock:
+        _records.clear()
+
+
+def record(kind, name, elapsed, allocated=0):
+    """Add one call of ``elapsed`` seconds to the counters of ``name``.
+
+    Parameters
+    ----------
+    kind : {"flash", "section", "system", "method", "cache_hit", "cache_miss"}
+        Category of the measurement
+    name : str
+        Name within the category
+    elapsed : float
+        Wall time in seconds
+    allocated : int, default 0
+        Bytes allocated by the JVM during the call
+    """
+    with _lock:
+        entry = _records.get((kind, name))
+        if entry is None:
+            entry = _records[(kind, name)] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += elapsed
+        entry[2] += allocated
+
+
+def _allocated_bytes():
+    """Bytes allocated by the JVM in the calling thread so far, or 0."""
+    global _thread_bean
+    from . import jvm
+
+    if not jvm.is_jvm_started():
+        return 0
+    if _thread_bean is None:
+        import jpype
+
+        management = jpype.JClass("java.lang.management.ManagementFactory")
+        _thread_bean = management.getThreadMXBean()
+    try:
+        return int(_thread_bean.getCurrentThreadAllocatedBytes())
+    except AttributeError:
+        # Only the HotSpot implementation reports allocations
+        return 0
+
+
+@contextlib.contextmanager
+def measure(kind, name):
+    """Record the wall time and JVM allocations of a block of code."""
+    allocated = _allocated_bytes()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        record(kind, name, elapsed, _allocated_bytes() - allocated)
+
+
+def instrumented(kind, name):
+    """Record every call of a function while stats are enabled.
+
+    Parameters
+    ----------
+    kind : str
+        Category of the measurement, see :func:`record`
+    name : str
+        Name within the category
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            with measure(kind, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _resident_set_size():
+    """Return the current resident set size of the process in bytes, or None."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        pass
+    else:
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current size; kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def memory_usage(collect=False):
+    """Memory used by the process and the JVM heap.
+
+    Parameters
+    ----------
+    collect : bool, default False
+        Run the Python and Java garbage collectors first, so that the heap
+        figures reflect live objects only
+
+    Returns
+    -------
+    dict
+        ``rss`` (resident set size of the process), ``jvm_heap_used``,
+        ``jvm_heap_committed`` and ``jvm_heap_max``, all in bytes. The JVM
+        figures are None if NeqSim has not been started.
+    """
+    from . import jvm
+
+    if collect:
+        gc.collect()
+    usage = {
+        "rss": None,
+        "jvm_heap_used": None,
+        "jvm_heap_committed": None,
+        "jvm_heap_max": None,
+    }
+    if jvm.is_jvm_started():
+        import jpype
+
+        if collect:
+            jpype.java.lang.System.gc()
+        runtime = jpype.java.lang.Runtime.getRuntime()
+        committed = int(runtime.totalMemory())
+        usage["jvm_heap_used"] = committed - int(runtime.freeMemory())
+        usage["jvm_heap_committed"] = committed
+        usage["jvm_heap_max"] = int(runtime.maxMemory())
+    usage["rss"] = _resident_set_size()
+    return usage
+
+
+class CountingProxy:
+    """Wrap a Java object so that every method call is counted and timed.
+
+    Java objects returned by the wrapped methods (phases, components, mixing
+    rules, arrays) are wrapped in turn, so chained calls are all counted.
+    Strings and primitives are returned unchanged.
+    """
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        self._target = target
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args):
+            args = [unwrap(arg) for arg in args]
+            start = time.perf_counter()
+            result = attribute(*args)
+            record("method", name, time.perf_counter() - start)
+            return counted(result)
+
+        return call
+
+    def __getitem__(self, index):
+        return counted(self._target[index])
+
+    def __len__(self):
+        return len(self._target)
+
+    def __iter__(self):
+        return (counted(item) for item in self._target)
+
+    def __repr__(self):
+        return f"CountingProxy({self._target!r})"
+
+
+def counted(value):
+    """Wrap Java objects in a :class:`CountingProxy`, leave the rest alone."""
+    import jpype
+
+    if isinstance(value, jpype.JObject) and not isinstance(value, jpype.JString):
+        return CountingProxy(value)
+    return value
+
+
+def unwrap(value):
+    """Return the Java object behind a :class:`CountingProxy`."""
+    return value._target if isinstance(value, CountingProxy) else value
+
+
+def _snapshot(records):
+    def group(kind):
+        return {
+            name: {"calls": calls, "time": seconds, "java_allocated_bytes": nbytes}
+            for (entry_kind, name), (calls, seconds, nbytes) in sorted(records.items())
+            if entry_kind == kind
+        }
+
+    flashes = group("flash").get("flash_activity", {"calls": 0, "time": 0.0})
+    systems = group("system")
+    sections = group("section")
+    methods = group("method")
+    tpflash = methods.get("TPflash", {"calls": 0, "time": 0.0})
+    hits = group("cache_hit")
+    misses = group("cache_miss")
+    caches = {
+        name: {
+            "hits": hits.get(name, {"calls": 0})["calls"],
+            "misses": misses.get(name, {"calls": 0})["calls"],
+        }
+        for name in sorted(set(hits) | set(misses))
+    }
+    cache_hits = sum(cache["hits"] for cache in caches.values())
+    cache_lookups = cache_hits + sum(cache["misses"] for cache in caches.values())
+    system_time = sum((system["time"] for system in systems.values()), 0.0)
+    # Systems are created inside the helpers, so sections include their time
+    neqsim_time = sum((section["time"] for section in sections.values()), 0.0)
+    return {
+        "enabled": enabled,
+        "flashes": flashes["calls"],
+        "flash_time": flashes["time"],
+        "systems_created": sum(system["calls"] for system in systems.values()),
+        "system_creation_time": system_time,
+        "tpflash_calls": tpflash["calls"],
+        "tpflash_time": tpflash["time"],
+        "jpype_calls": sum(method["calls"] for method in methods.values()),
+        "jpype_time": sum((method["time"] for method in methods.values()), 0.0),
+        "java_allocated_bytes": sum(
+            section["java_allocated_bytes"] for section in sections.values()
+        ),
+        "neqsim_time": neqsim_time,
+        "python_time": max(flashes["time"] - neqsim_time, 0.0),
+        "derived_cache_hits": cache_hits,
+        "derived_cache_misses": cache_lookups - cache_hits,
+        "derived_cache_hit_rate": cache_hits / cache_lookups if cache_lookups else None,
+        "derived_caches": caches,
+        "sections": sections,
+        "systems": systems,
+        "methods": methods,
+    }
+
+
+def stats():
+    """Snapshot of the counters and timers recorded so far.
+
+    Returns
+    -------
+    dict
+        ``enabled``; ``flashes`` and ``flash_time`` (``flash_activity`` calls
+        and seconds); ``systems_created`` and ``system_creation_time``;
+        ``tpflash_calls`` and ``tpflash_time``; ``jpype_calls`` and
+        ``jpype_time`` (Java method calls on pooled systems);
+        ``java_allocated_bytes`` (JVM allocations in the CPA helpers);
+        ``neqsim_time`` (seconds in the CPA helpers, including system
+        creation) and ``python_time`` (the rest of ``flash_time``);
+        ``derived_cache_hits``, ``derived_cache_misses`` and
+        ``derived_cache_hit_rate`` (None before any lookup) of the cached
+        fluid and phase quantities, with ``derived_caches`` mapping "fluid"
+        and "phase" to their ``hits`` and ``misses``; and the per-name
+        breakdowns ``sections``, ``systems`` and ``methods``, each mapping a
+        name to ``calls``, ``time`` and ``java_allocated_bytes``
+    """
+    with _lock:
+        records = {key: list(entry) for key, entry in _records.items()}
+    return _snapshot(records)
+
+
+@contextlib.contextmanager
+def collect_stats():
+    """Record the counters and timers of a block of code.
+
+    Yields a dict that is filled with the :func:`stats` snapshot of the
+    calls made inside the block when the block exits. Instrumentation is
+    enabled for the duration of the block only, unless it was already
+    enabled with :func:`enable_stats`.
+
+    Yields
+    ------
+    dict
+        Empty until the block exits
+    """
+    global _scopes
+    with _lock:
+        before = {key: list(entry) for key, entry in _records.items()}
+        _scopes += 1
+        _update_enabled()
+    result = {}
+    try:
+        yield result
+    finally:
+        with _lock:
+            _scopes -= 1
+            _update_enabled()
+            records = {}
+            for key, entry in _records.items():
+                previous = before.get(key, (0, 0.0, 0))
+                delta = [value - old for value, old in zip(entry, previous)]
+                if delta[0]:
+                    records[key] = delta
+        result.update(_snapshot(records))
@@ -0,0 +1,166 @@
+"""Lazy, thread-safe access to the NeqSim Java gateway.
+
+Importing :mod:`neqsim` starts a JVM, which takes several seconds. The package
+therefore never imports it at module level: the first call that needs NeqSim
+goes through :func:`get_jneqsim`, which starts the JVM and loads the packaged
+COMP database exactly once, even when several threads get there at the same
+time. JVM-free code paths (tabulated and cubic backends, table loading, CLI
+argument parsing) never start the JVM.
+
+JVM startup options (heap size, garbage collector, JIT flags) can be set with
+:func:`configure_jvm` before the first NeqSim call, usually through
+:class:`solubilityccs.engine.Engine`.
+"""
+
+import atexit
+import os
+import threading
+import warnings
+from typing import List
+
+from .path_utils import get_database_path
+
+_lock = threading.RLock()
+_jneqsim = None
+_jvm_options: List[str] = []
+
+AUTOSTART_ENV_VAR = "NEQSIM_JVM_AUTOSTART"
+ARGS_ENV_VAR = "NEQSIM_JVM_ARGS"
+MAX_HEAP_ENV_VAR = "NEQSIM_JVM_MAX_HEAP"
+
+
+def _load_comp_database(jneqsim):
+    """Replace NeqSim's COMP table with the packaged COMP.csv."""
+    try:
+        comp_database_path = get_database_path("COMP.csv")
+    except FileNotFoundError as e:
+        raise RuntimeError(f"Failed to initialize COMP database: {str(e)}") from e
+    jneqsim.util.database.NeqSimDataBase.replaceTable("COMP", comp_database_path)
+
+
+def _base_jvm_args():
+    """JVM arguments that NeqSim would start with on its own.
+
+    ``-Xrs`` keeps the JVM from installing OS signal handlers that crash
+    embedded Python kernels; ``NEQSIM_JVM_ARGS`` adds space-separated
+    arguments and ``NEQSIM_JVM_MAX_HEAP`` the maximum heap size (e.g. "2g").
+    """
+    args = ["-Xrs"]
+    args.extend(os.environ.get(ARGS_ENV_VAR, "").split())
+    max_heap = os.environ.get(MAX_HEAP_ENV_VAR, "").strip()
+    if max_heap:
+        args.append(f"-Xmx{max_heap}")
+    return args
+
+
+def configure_jvm(options):
+    """Set extra JVM startup options for when NeqSim is started.
+
+    Parameters
+    ----------
+    options : list of str
+        JVM arguments such as ``["-Xmx2g", "-XX:+UseG1GC"]``, added after
+        ``-Xrs`` and the arguments from ``NEQSIM_JVM_ARGS`` and
+        ``NEQSIM_JVM_MAX_HEAP``
+
+    Raises
+    ------
+    RuntimeError
+        If the JVM is already running with different options
+    """
+    import jpype
+
+    options = list(options)
+    with _lock:
+        if jpype.isJVMStarted():
+            if options and options != _jvm_options:
+                raise RuntimeError(
+                    "The JVM is already running; startup options "
+                    f"{options} can no longer be applied"
+                )
+            return
+        _jvm_options[:] = options
+
+
+def _import_jneqsim():
+    """Import NeqSim, starting the JVM with the configured options."""
+    import jpype
+
+    if _jvm_options and not jpype.isJVMStarted():
+        previous = os.environ.get(AUTOSTART_ENV_VAR)
+        os.environ[AUTOSTART_ENV_VAR] = "0"
+        try:
+            from neqsim import neqsimpython
+        finally:
+            if previous is None:
+                del os.environ[AUTOSTART_ENV_VAR]
+            else:
+                os.environ[AUTOSTART_ENV_VAR] = previous
+        if hasattr(neqsimpython, "init_jvm"):
+            neqsimpython.init_jvm(jvm_args=_base_jvm_args() + _jvm_options)
+        else:
+            warnings.warn(
+                "This neqsim version starts the JVM on import; "
+                f"JVM options {_jvm_options} were ignored",
+                RuntimeWarning,
+            )
+
+    from neqsim import jneqsim
+
+    return jneqsim
+
+
+def get_jneqsim():
+    """Return the ``neqsim.jneqsim`` gateway, starting NeqSim on first use.
+
+    Returns
+    -------
+    module
+        The ``jneqsim`` package of NeqSim, with the COMP database loaded
+
+    Raises
+    ------
+    RuntimeError
+        If COMP.csv cannot be found
+    """
+    global _jneqsim
+    if _jneqsim is None:
+        with _lock:
+            if _jneqsim is None:
+                jneqsim = _import_jneqsim()
+
+                if threading.current_thread() is not threading.main_thread():
+                    # A thread that starts the JVM stays attached as a
+                    # non-daemon Java thread, which blocks JVM shutdown at
+                    # interpreter exit. Detach it; later calls from this
+                    # thread reattach it as a daemon like any other thread.
+                    import jpype
+
+                    jpype.java.lang.Thread.detach()
+                _load_comp_database(jneqsim)
+                _jneqsim = jneqsim
+    return _jneqsim
+
+
+def is_jvm_started():
+    """Return True if NeqSim has been initialized by :func:`get_jneqsim`."""
+    return _jneqsim is not None
+
+
+def shutdown_jvm():
+    """Shut down the JVM to prevent segmentation faults at exit.
+
+    The JVM cannot be restarted in the same process afterwards.
+    """
+    try:
+        import jpype
+
+        if jpype.isJVMStarted():
+            jpype.shutdownJVM()
+    except Exception:
+        # If JPype is not available or shutdown fails, just continue
+        pass
+
+
+# Register cleanup function to run at exit
+atexit.register(shutdown_jvm)
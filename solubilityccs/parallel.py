@@ -0,0 +1,516 @@
+"""Parallel execution of flash calculations.
+
+:class:`FlashPool` runs flashes on worker processes with one JVM each, and
+:func:`flash_many` runs them on threads sharing the JVM of this process.
+
+In a FlashPool each worker process starts its JVM, loads the COMP and
+Properties databases and warms up the CPA code paths once, in the pool
+initializer. Tasks are lightweight flash specifications, so the per-task cost
+is the flash itself::
+
+    specs = [
+        flash_spec(273.15 + t, 60.0, {"CO2": 0.999, "H2O": 5e-4, "HNO3": 5e-4})
+        for t in range(-10, 40)
+    ]
+    with FlashPool(processes=8) as pool:
+        for result in pool.imap(specs):
+            print(result["system"]["gas_phase_fraction"])
+
+For large batches, :class:`~solubilityccs.fluid.FluidSpec` tasks pickle to
+about a hundred bytes and return compact
+:class:`~solubilityccs.fluid.FlashRecord` results instead of dictionaries.
+
+Workers are created with the ``spawn`` start method by default, since forking
+a process that already runs a JVM is not safe.
+
+:class:`FlashSupervisor` runs the same tasks on workers that may crash or
+hang: it enforces a timeout per task, restarts dead workers, retries failed
+points and reports the points that keep failing instead of aborting the job.
+"""
+
+import collections
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from . import jvm
+
+
+def flash_spec(
+    temperature,
+    pressure,
+    composition,
+    flow_rate=None,
+    flow_unit="kg/hr",
+    fugacity_backend="neqsim",
+):
+    """Build a flash task specification.
+
+    Parameters
+    ----------
+    temperature : float
+        Temperature in Kelvin
+    pressure : float
+        Pressure in bara
+    composition : dict
+        Mole fractions keyed by component name, in the order they are added
+    flow_rate : float, optional
+        Total flow rate
+    flow_unit : {"kg/hr", "mole/hr"}
+        Unit of ``flow_rate``
+    fugacity_backend : str, default "neqsim"
+        Value for :attr:`Fluid.fugacity_backend`
+
+    Returns
+    -------
+    dict
+        Picklable task specification for :func:`run_flash`
+    """
+    return {
+        "temperature": float(temperature),
+        "pressure": float(pressure),
+        "composition": dict(composition),
+        "flow_rate": flow_rate,
+        "flow_unit": flow_unit,
+        "fugacity_backend": fugacity_backend,
+    }
+
+
+def run_flash(spec):
+    """Run ``flash_activity`` for one specification.
+
+    Parameters
+    ----------
+    spec : dict or FluidSpec
+        Task specification, see :func:`flash_spec`, or a compact
+        :class:`~solubilityccs.fluid.FluidSpec`
+
+    Returns
+    -------
+    dict or FlashRecord
+        The results of :meth:`ModelResults.to_dict` for a dict
+        specification, or a compact
+        :class:`~solubilityccs.fluid.FlashRecord` for a FluidSpec
+    """
+    from .fluid import FlashRecord, Fluid, FluidSpec, ModelResults
+
+    if isinstance(spec, FluidSpec):
+        fluid = Fluid.from_spec(spec)
+        fluid.flash_activity()
+        return FlashRecord.from_fluid(fluid)
+
+    fluid = Fluid()
+    for component, fraction in spec["composition"].items():
+        fluid.add_component(component, fraction)
+    fluid.set_temperature(spec["temperature"])
+    fluid.set_pressure(spec["pressure"])
+    if spec.get("flow_rate") is not None:
+        fluid.set_flow_rate(spec["flow_rate"], spec.get("flow_unit", "kg/hr"))
+    fluid.fugacity_backend = spec.get("fugacity_backend", "neqsim")
+    fluid.flash_activity()
+    return ModelResults(fluid).to_dict()
+
+
+def _run_indexed(task):
+    index, spec = task
+    return index, run_flash(spec)
+
+
+def initialize_worker(jvm_options=None, warmup=True):
+    """Prepare a worker process: JVM, databases and warm-up.
+
+    Parameters
+    ----------
+    jvm_options : list of str, optional
+        JVM startup options, see :func:`solubilityccs.jvm.configure_jvm`
+    warmup : bool, default True
+        Run :func:`solubilityccs.warmup` with a single pass
+    """
+    from .component_registry import get_registry
+    from .neqsim_functions import warmup as run_warmup
+
+    jvm.configure_jvm(jvm_options or [])
+    jvm.get_jneqsim()
+    get_registry()
+    if warmup:
+        run_warmup(iterations=1)
+
+
+class FlashPool:
+    """Executor that runs flash specifications on a pool of JVM workers.
+
+    Parameters
+    ----------
+    processes : int, optional
+        Number of worker processes, defaults to the number of CPUs
+    jvm_options : list of str, optional
+        JVM startup options for every worker
+    warmup : bool, default True
+        Warm up the CPA code paths in every worker before the first task
+    start_method : str, default "spawn"
+        Multiprocessing start method
+    """
+
+    def __init__(
+        self, processes=None, jvm_options=None, warmup=True, start_method="spawn"
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        context = multiprocessing.get_context(start_method)
+        self._pool = context.Pool(
+            self.processes,
+            initializer=initialize_worker,
+            initargs=(list(jvm_options or []), warmup),
+        )
+
+    def _chunksize(self, specs, chunksize):
+        if chunksize is not None:
+            return chunksize
+        try:
+            count = len(specs)
+        except TypeError:
+            return 1
+        # Four chunks per worker balance the load without many round trips
+        return max(1, count // (4 * self.processes))
+
+    def map(self, specs, chunksize=None):
+        """Flash all specifications and return the results in order.
+
+        Parameters
+        ----------
+        specs : iterable of dict or FluidSpec
+            Task specifications, see :func:`run_flash`
+        chunksize : int, optional
+            Specifications sent to a worker at a time
+
+        Returns
+        -------
+        list of dict or FlashRecord
+            One result per specification
+        """
+        return self._pool.map(run_flash, specs, self._chunksize(specs, chunksize))
+
+    def imap(self, specs, chunksize=None):
+        """Stream results in the order of the specifications."""
+        return self._pool.imap(run_flash, specs, self._chunksize(specs, chunksize))
+
+    def imap_unordered(self, specs, chunksize=None):
+        """Stream ``(index, result)`` pairs as the flashes complete."""
+        return self._pool.imap_unordered(
+            _run_indexed, enumerate(specs), self._chunksize(specs, chunksize)
+        )
+
+    def close(self):
+        """Wait for pending tasks and stop the workers."""
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        """Stop the workers immediately."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
+
+
+def flash_many(specs, max_workers=None, executor=None):
+    """Flash specifications concurrently on threads of this process.
+
+    JPype releases the GIL during Java calls, so the CPA calculations of
+    different threads run in parallel while sharing a single JVM. Every
+    thread keeps its own pooled NeqSim systems; pass a long-lived
+    ``executor`` to keep them between calls.
+
+    Parameters
+    ----------
+    specs : iterable of dict or FluidSpec
+        Task specifications, see :func:`run_flash`
+    max_workers : int, optional
+        Number of threads when no executor is given
+    executor : concurrent.futures.ThreadPoolExecutor, optional
+        Executor to run the flashes on
+
+    Returns
+    -------
+    list of dict or FlashRecord
+        One result per specification, in order
+    """
+    from .component_registry import get_registry
+
+    # One-time initialization happens here rather than racing in the threads
+    jvm.get_jneqsim()
+    get_registry()
+    if executor is not None:
+        return list(executor.map(run_flash, specs))
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(run_flash, specs))
+
+
+def _supervised_worker(connection, function, initializer, jvm_options, warmup):
+    """Worker loop of :class:`FlashSupervisor`: one task at a time."""
+    initializer(jvm_options, warmup)
+    connection.send(("ready", None, None))
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        index, spec = task
+        try:
+            result = function(spec)
+        except Exception:
+            connection.send(("error", index, traceback.format_exc()))
+        else:
+            connection.send(("ok", index, result))
+    connection.close()
+
+
+class _Worker:
+    """A supervised worker process and the task it is running."""
+
+    def __init__(self, context, startup_timeout, *args):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=_supervised_worker, args=(child, *args), daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.ready = False
+        self.task = None
+        # Until the worker reports ready, the deadline bounds its startup
+        self.deadline = None
+        if startup_timeout is not None:
+            self.deadline = time.monotonic() + startup_timeout
+
+    def assign(self, task, timeout):
+        self.task = task
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.connection.send(task[:2])
+
+    def stop(self, timeout=5.0):
+        if self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(timeout)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+
+class FlashSupervisor:
+    """Run flash specifications on workers that are restarted when they fail.
+
+    Each worker runs one task at a time. A worker that crashes (for example
+    with a segmentation fault in the JVM) or exceeds the per-task timeout is
+    killed and replaced, and its task is retried on another worker. A worker
+    that does not finish initializing within the startup timeout is replaced
+    as well; repeated startup failures abort :meth:`map` with RuntimeError. Points
+    that still fail after the retries are quarantined: they get None as
+    their result and are listed in :attr:`quarantine`, while the rest of the
+    job completes.
+
+    Parameters
+    ----------
+    processes : int, optional
+        Number of worker processes, defaults to the number of CPUs
+    timeout : float, optional
+        Seconds a single task may run before its worker is killed
+    startup_timeout : float, optional, default 300
+        Seconds a worker may take to start the JVM and warm up before it is
+        killed; None waits indefinitely
+    retries : int, default 1
+        Times a point is retried after a crash or timeout
+    jvm_options : list of str, optional
+        JVM startup options for every worker
+    warmup : bool, default True
+        Warm up the CPA code paths in every worker before its first task
+    start_method : str, default "spawn"
+        Multiprocessing start method
+    function : callable, default run_flash
+        Picklable function applied to every specification
+    initializer : callable, default initialize_worker
+        Picklable function called with ``jvm_options`` and ``warmup`` when a
+        worker starts
+
+    Attributes
+    ----------
+    quarantine : list of dict
+        Failed points of the last :meth:`map`: ``index``, ``spec``,
+        ``reason`` ("crash", "timeout" or "error"), ``attempts`` and
+        ``detail`` (exit code, timeout or traceback)
+    restarts : int
+        Workers restarted since the supervisor was created
+    """
+
+    # Workers dying or hanging before they finish initializing point at a
+    # broken setup (bad JVM options, missing databases) rather than at a bad
+    # point
+    MAX_STARTUP_FAILURES = 3
+
+    def __init__(
+        self,
+        processes=None,
+        timeout=None,
+        retries=1,
+        jvm_options=None,
+        warmup=True,
+        start_method="spawn",
+        function=run_flash,
+        initializer=initialize_worker,
+        startup_timeout=300.0,
+    ):
+        self.processes = processes or os.cpu_count() or 1
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.retries = retries
+        self.quarantine = []
+        self.restarts = 0
+        self._context = multiprocessing.get_context(start_method)
+        self._worker_args = (function, initializer, list(jvm_options or []), warmup)
+        self._startup_failures = 0
+        self._workers = [self._start_worker() for _ in range(self.processes)]
+
+    def _start_worker(self):
+        return _Worker(self._context, self.startup_timeout, *self._worker_args)
+
+    def _replace(self, worker):
+        """Kill ``worker`` and start a new one in its place."""
+        worker.kill()
+        if not worker.ready:
+            self._startup_failures += 1
+            if self._startup_failures >= self.MAX_STARTUP_FAILURES:
+                raise RuntimeError(
+                    f"{self._startup_failures} flash workers died or timed out "
+                    f"during startup (exit code {worker.process.exitcode})"
+                )
+        self._workers[self._workers.index(worker)] = self._start_worker()
+        self.restarts += 1
+
+    def map(self, specs):
+        """Flash all specifications and return the results in order.
+
+        Parameters
+        ----------
+        specs : iterable of dict or FluidSpec
+            Task specifications, see :func:`run_flash`
+
+        Returns
+        -------
+        list
+            One result per specification; None for quarantined points
+        """
+        specs = list(specs)
+        results = [None] * len(specs)
+        self.quarantine = []
+        # (index, spec, failed attempts)
+        pending = collections.deque((i, spec, 0) for i, spec in enumerate(specs))
+        remaining = len(specs)
+
+        def fail(task, reason, detail, retry=True):
+            index, spec, attempts = task
+            attempts += 1
+            if retry and attempts <= self.retries:
+                pending.append((index, spec, attempts))
+                return 0
+            self.quarantine.append(
+                {
+                    "index": index,
+                    "spec": spec,
+                    "reason": reason,
+                    "attempts": attempts,
+                    "detail": detail,
+                }
+            )
+            return 1
+
+        while remaining:
+            for worker in list(self._workers):
+                if worker.ready and worker.task is None and pending:
+                    task = pending.popleft()
+                    try:
+                        worker.assign(task, self.timeout)
+                    except (BrokenPipeError, OSError):
+                        # The worker died while idle and never saw the task,
+                        # so it goes back to the front without an attempt
+                        worker.task, worker.deadline = None, None
+                        pending.appendleft(task)
+                        self._replace(worker)
+
+            deadlines = [w.deadline for w in self._workers if w.deadline is not None]
+            wait = None
+            if deadlines:
+                wait = max(0.0, min(deadlines) - time.monotonic())
+            handles = [w.connection for w in self._workers]
+            handles += [w.process.sentinel for w in self._workers]
+            ready = multiprocessing.connection.wait(handles, wait)
+
+            for worker in list(self._workers):
+                message = None
+                dead = worker.process.sentinel in ready
+                if worker.connection in ready:
+                    try:
+                        message = worker.connection.recv()
+                    except (EOFError, OSError):
+                        dead = True
+                if message is not None:
+                    status, index, payload = message
+                    if status == "ready":
+                        worker.ready, worker.deadline = True, None
+                        self._startup_failures = 0
+                        continue
+                    task, worker.task, worker.deadline = worker.task, None, None
+                    if status == "ok":
+                        results[index] = payload
+                        remaining -= 1
+                    else:
+                        # Python exceptions are deterministic; do not retry
+                        remaining -= fail(task, "error", payload, retry=False)
+                elif dead:
+                    worker.process.join(5.0)
+                    if worker.task is not None:
+                        remaining -= fail(worker.task, "crash", worker.process.exitcode)
+                    self._replace(worker)
+                elif (
+                    worker.deadline is not None and time.monotonic() >= worker.deadline
+                ):
+                    if worker.task is not None:
+                        remaining -= fail(worker.task, "timeout", self.timeout)
+                    self._replace(worker)
+        return results
+
+    def close(self):
+        """Stop the workers after their current task."""
+        for worker in self._workers:
+            worker.stop()
+        self._workers = []
+
+    def terminate(self):
+        """Kill the workers immediately."""
+        for worker in self._workers:
+            worker.kill()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+        return False
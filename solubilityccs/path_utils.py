@@ -1,16 +1,28 @@
 """Path utilities for handling relative paths and database file locations.
 
-Provides robust path resolution with proper error handling.
+Provides robust path resolution with proper error handling. Database files
+are looked up in the packaged ``solubilityccs/Database`` directory, found
+once through :mod:`importlib.resources`, and the resolved paths are memoized
+so that repeated lookups do not touch the filesystem.
 """
 
+import functools
+import hashlib
 import os
 import sys
+from importlib import resources
 from pathlib import Path
 
+# Environment variable naming a directory searched before the packaged database
+DATABASE_ENV_VAR = "SOLUBILITYCCS_DATABASE_DIR"
 
+
+@functools.lru_cache(maxsize=None)
 def get_project_root():
     """Get the project root directory by looking for key project files.
 
+    The result is memoized; the parent directories are searched only once.
+
     Returns
     -------
     Path
@@ -40,9 +52,60 @@ def get_project_root():
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _package_database_directory():
+    """Locate the Database directory shipped inside the package."""
+    return Path(str(resources.files(__package__) / "Database")).absolute()
+
+
+@functools.lru_cache(maxsize=None)
+def _override_directory(directory):
+    """Validate the directory named by the override environment variable."""
+    path = Path(directory).expanduser().absolute()
+    if not path.is_dir():
+        raise FileNotFoundError(
+            f"Database directory {path} given by {DATABASE_ENV_VAR} does not exist."
+        )
+    return path
+
+
+def _search_directories():
+    """Directories searched for database files, in order of preference."""
+    override = os.environ.get(DATABASE_ENV_VAR)
+    if override:
+        return (_override_directory(override), _package_database_directory())
+    return (_package_database_directory(),)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_database_file(directories, filename):
+    """Find a database file; only successful lookups are memoized."""
+    for directory in directories:
+        database_path = directory / filename
+        if database_path.is_file():
+            return str(database_path)
+
+    # Fallback to project root method for development
+    database_path = get_project_root() / "Database" / filename
+    if not database_path.is_file():
+        searched = ", ".join(str(directory) for directory in directories)
+        raise FileNotFoundError(
+            f"Database file '{filename}' not found in {searched} or at "
+            f"{database_path}. Please ensure the Database directory exists and "
+            f"contains the required files."
+        )
+    return str(database_path)
+
+
 def get_database_path(filename):
     """Get the absolute path to a database file using package resources.
 
+    The packaged ``solubilityccs/Database`` directory is located through
+    :mod:`importlib.resources`. If the ``SOLUBILITYCCS_DATABASE_DIR``
+    environment variable names a directory, it is searched first, so it may
+    override some of the packaged files only. Found paths are memoized per
+    search order; use :func:`clear_path_cache` after moving files.
+
     Parameters
     ----------
     filename : str
@@ -59,26 +122,7 @@ def get_database_path(filename):
         If the database file cannot be found
     """
     try:
-        # First try to find the database file relative to this module
-        package_dir = Path(__file__).parent.absolute()
-        database_path = package_dir / "Database" / filename
-
-        if database_path.exists():
-            return str(database_path)
-
-        # Fallback to project root method for development
-        project_root = get_project_root()
-        database_path = project_root / "Database" / filename
-
-        if not database_path.exists():
-            raise FileNotFoundError(
-                f"Database file '{filename}' not found at {database_path}. "
-                f"Please ensure the Database directory exists and contains "
-                f"the required files."
-            )
-
-        return str(database_path)
-
+        return _resolve_database_file(_search_directories(), filename)
     except Exception as e:
         raise FileNotFoundError(
             f"Failed to locate database file '{filename}': {str(e)}"
@@ -114,6 +158,35 @@ def get_database_directory():
         raise FileNotFoundError(f"Failed to locate Database directory: {str(e)}") from e
 
 
+def get_primary_database_directory():
+    """Get the first directory searched for database files.
+
+    This is the directory named by ``SOLUBILITYCCS_DATABASE_DIR`` when the
+    variable is set, otherwise the packaged ``solubilityccs/Database``.
+    Files generated from the databases, such as the compiled bundle, are
+    written here.
+
+    Returns
+    -------
+    str
+        Absolute path to the directory
+
+    Raises
+    ------
+    FileNotFoundError
+        If ``SOLUBILITYCCS_DATABASE_DIR`` names a missing directory
+    """
+    return str(_search_directories()[0])
+
+
+def clear_path_cache():
+    """Forget all memoized project, directory and database file locations."""
+    get_project_root.cache_clear()
+    _package_database_directory.cache_clear()
+    _override_directory.cache_clear()
+    _resolve_database_file.cache_clear()
+
+
 def safe_file_read(file_path, error_context=""):
     """Safely check if a file exists and is readable.
 
@@ -147,6 +220,26 @@ def safe_file_read(file_path, error_context=""):
     return True
 
 
+def file_checksum(file_path):
+    """Compute the SHA-256 checksum of a file's contents.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def get_venv_python_path():
     """Get the path to the Python interpreter in the virtual environment.
 
@@ -1,24 +1,101 @@
+"""Water activity in aqueous sulfuric acid from the WaterActivityH2SO4 table.
+
+The table is read on first use rather than at import. Parsing the
+decimal-comma CSV needs pandas, so the table is taken from the compiled
+database bundle (see :mod:`solubilityccs.database_bundle`), which is rebuilt
+automatically whenever the CSV changes.
+"""
+
+import bisect
+import functools
+import threading
+import warnings
+
 import numpy as np
-import pandas as pd
 
-# Import path utilities for robust file path handling
-from .path_utils import get_database_path
+TABLE_CSV = "WaterActivityH2SO4.csv"
+
+_load_lock = threading.Lock()
+# The table as a NumPy grid, filled in by _load_table(): temperatures
+# ascending, water fractions sorted ascending (the CSV lists them descending)
+# and activities of shape (n_temperatures, n_water_fractions)
+_temperatures = None
+_water_fractions = None
+_activities = None
+# The CSV column order of the water fractions, and plain-float copies of the
+# grid for the scalar path, where NumPy call overhead dominates
+_water_order = None
+_temperature_list = None
+_water_fraction_list = None
+_activity_rows = None
+
+
+def _parse_csv(csv_path):
+    """Read the table CSV into temperatures, water fractions and activities.
+
+    The arrays keep the CSV order: water fractions as listed in the header
+    and activities of shape (n_temperatures, n_water_fractions).
+    """
+    import pandas as pd
+
+    table = pd.read_csv(csv_path, sep=";", decimal=",")
+    return (
+        table.iloc[:, 0].to_numpy(dtype=float),
+        np.asarray(table.columns[1:], dtype=float),
+        table.iloc[:, 1:].to_numpy(dtype=float),
+    )
 
-# Load water activity data with relative path and error handling
-try:
-    water_activity_path = get_database_path("WaterActivityH2SO4.csv")
-    water_h2so4 = pd.read_csv(water_activity_path, sep=";", decimal=",")
-    water_h2so4.columns = [
-        float(col) if i != 0 else col for i, col in enumerate(water_h2so4.columns)
-    ]
-except FileNotFoundError as e:
-    raise RuntimeError(f"Failed to load WaterActivityH2SO4 database: {str(e)}") from e
+
+def _load_table():
+    """Load the packaged table from the bundle into the module-level grid."""
+    global _temperatures, _water_fractions, _activities, _water_order
+    global _temperature_list, _water_fraction_list, _activity_rows
+    with _load_lock:
+        if _activities is not None:
+            return
+        from .database_bundle import load_bundle
+
+        try:
+            bundle = load_bundle()
+        except FileNotFoundError as e:
+            raise RuntimeError(
+                f"Failed to load WaterActivityH2SO4 database: {str(e)}"
+            ) from e
+        temperatures = bundle["h2so4_temperatures"]
+        water_fractions = bundle["h2so4_water_fractions"]
+        activities = bundle["h2so4_activities"]
+        order = np.argsort(water_fractions)
+        _water_order = order
+        _temperatures = temperatures
+        _water_fractions = water_fractions[order]
+        _temperature_list = _temperatures.tolist()
+        _water_fraction_list = _water_fractions.tolist()
+        _activity_rows = activities[:, order].tolist()
+        # Set last: the other functions check it to decide whether to load
+        _activities = activities[:, order]
+
+
+def __getattr__(name):
+    """Build the ``water_h2so4`` DataFrame on first access."""
+    if name != "water_h2so4":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import pandas as pd
+
+    if _activities is None:
+        _load_table()
+    csv_order = np.argsort(_water_order)
+    frame = pd.DataFrame(
+        _activities[:, csv_order], columns=_water_fractions[csv_order].tolist()
+    )
+    frame.insert(0, "Temperature", _temperatures)
+    globals()["water_h2so4"] = frame
+    return frame
 
 
 def get_value2(x, y):
-    """Retrieve interpolated value from DataFrame.
+    """Retrieve interpolated value from the table.
 
-    Retrieves the interpolated value from the DataFrame based on the specified
+    Retrieves the interpolated value from the table based on the specified
     temperature and column. If the temperature is out of bounds, it uses interpolation.
 
     Parameters
@@ -31,11 +108,21 @@ def get_value2(x, y):
     Returns
     -------
     float
-        The interpolated value from the DataFrame
+        The interpolated value from the table
+
+    Raises
+    ------
+    KeyError
+        If ``y`` is not a column of the table
     """
+    if _activities is None:
+        _load_table()
     # Get the temperature and corresponding column data
-    temperatures = water_h2so4["Temperature"].values
-    column_data = water_h2so4[y].values  # Directly access the column data
+    temperatures = _temperatures
+    k = min(np.searchsorted(_water_fractions, y), len(_water_fractions) - 1)
+    if _water_fractions[k] != y:
+        raise KeyError(y)
+    column_data = _activities[:, k]
 
     # Perform interpolation
     if x < temperatures.min() or x > temperatures.max():
@@ -48,27 +135,279 @@ def get_value2(x, y):
 
 
 def find_closest_values(sorted_list, target):
-    larger = None
-    smaller = None
+    """Find the nearest values above and below a target.
 
-    for number in sorted_list:
-        if number > target and (larger is None or number < larger):
-            larger = number
-        elif number < target and (smaller is None or number > smaller):
-            smaller = number
+    .. deprecated::
+        The water activity interpolation no longer needs this lookup; it will
+        be removed in a future release.
+
+    Parameters
+    ----------
+    sorted_list : array_like
+        Values to search, in any order
+    target : float
+        The value to bracket
 
+    Returns
+    -------
+    tuple
+        The smallest value larger than ``target`` and the largest value
+        smaller than ``target``, each None if there is no such value
+    """
+    warnings.warn(
+        "find_closest_values is deprecated and will be removed",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    values = np.sort(np.asarray(sorted_list, dtype=float))
+    above = np.searchsorted(values, target, side="right")
+    below = np.searchsorted(values, target, side="left") - 1
+    larger = values[above] if above < len(values) else None
+    smaller = values[below] if below >= 0 else None
     return larger, smaller
 
 
-def calc_activity_water_h2so4(temperature, water):
-    try:
-        value = get_value2(temperature, water)
-        return value
-    except (KeyError, ValueError, IndexError):
-        larger, smaller = find_closest_values(
-            water_h2so4.columns[1:].astype(float), water
+def _check_water_fraction(water):
+    """Raise ValueError if any water fraction lies outside the table."""
+    outside = ~((water >= _water_fractions[0]) & (water <= _water_fractions[-1]))
+    if np.any(outside):
+        raise ValueError(
+            f"Water fraction {np.asarray(water)[outside].flat[0]} is outside "
+            f"the H2SO4 activity table ({_water_fractions[0]} to "
+            f"{_water_fractions[-1]})"
         )
-        value1 = get_value2(temperature, larger)
-        value2 = get_value2(temperature, smaller)
-        value = value2 + (water - smaller) * (value2 - value1) / (smaller - larger)
-        return value
+
+
+def _activities_at(temperature):
+    """Activities of every water-fraction column at the given temperatures.
+
+    Interpolates linearly in temperature with the same formula as
+    ``np.interp``, clipping to the table range, so that node values are
+    reproduced exactly.
+    """
+    temperature = np.clip(temperature, _temperatures[0], _temperatures[-1])
+    j = np.searchsorted(_temperatures, temperature, side="right") - 1
+    j = np.clip(j, 0, len(_temperatures) - 2)
+    lower = _activities[j]
+    upper = _activities[j + 1]
+    slope = (upper - lower) / (_temperatures[j + 1] - _temperatures[j])[:, None]
+    values = slope * (temperature - _temperatures[j])[:, None] + lower
+    return np.where((temperature == _temperatures[-1])[:, None], upper, values)
+
+
+def _activity_scalar(temperature, water):
+    """Scalar version of :func:`calc_activity_water_h2so4` on plain floats."""
+    fractions = _water_fraction_list
+    if not fractions[0] <= water <= fractions[-1]:
+        _check_water_fraction(water)
+    temperatures = _temperature_list
+    temperature = min(max(temperature, temperatures[0]), temperatures[-1])
+    j = bisect.bisect_right(temperatures, temperature) - 1
+    j = min(max(j, 0), len(temperatures) - 2)
+    lower = _activity_rows[j]
+    upper = _activity_rows[j + 1]
+
+    def column(c):
+        if temperature == temperatures[-1]:
+            return upper[c]
+        slope = (upper[c] - lower[c]) / (temperatures[j + 1] - temperatures[j])
+        return slope * (temperature - temperatures[j]) + lower[c]
+
+    k = bisect.bisect_left(fractions, water)
+    if fractions[k] == water:
+        return column(k)
+    larger = column(k)
+    smaller = column(k - 1)
+    return smaller + (water - fractions[k - 1]) * (smaller - larger) / (
+        fractions[k - 1] - fractions[k]
+    )
+
+
+def calc_activity_water_h2so4(temperature, water, method="linear"):
+    """Water activity in aqueous sulfuric acid.
+
+    With ``method="linear"``, bilinear interpolation in the
+    WaterActivityH2SO4 table: linear in temperature (clipped to the table
+    range) and linear in the water mole fraction between the neighbouring
+    table columns. With ``method="pchip"``, the smooth surface of
+    :func:`calc_activity_water_h2so4_derivatives`.
+
+    Parameters
+    ----------
+    temperature : float or array_like
+        Temperature in Celsius, clipped to the table range
+    water : float or array_like
+        Water mole fraction between 0 and 1, broadcast against
+        ``temperature``
+    method : {"linear", "pchip"}
+        Interpolation method
+
+    Returns
+    -------
+    float or numpy.ndarray
+        Water activity, a scalar for scalar inputs
+
+    Raises
+    ------
+    ValueError
+        If a water fraction lies outside the table or the method is unknown
+    """
+    if _activities is None:
+        _load_table()
+    if method == "pchip":
+        return calc_activity_water_h2so4_derivatives(temperature, water)["activity"]
+    if method != "linear":
+        raise ValueError(
+            f"Unknown interpolation method '{method}'; use 'linear' or 'pchip'"
+        )
+    if isinstance(temperature, (int, float)) and isinstance(water, (int, float)):
+        return np.float64(_activity_scalar(temperature, water))
+
+    temperature, water = np.broadcast_arrays(
+        np.asarray(temperature, dtype=float), np.asarray(water, dtype=float)
+    )
+    shape = temperature.shape
+    temperature = temperature.ravel()
+    water = water.ravel()
+
+    _check_water_fraction(water)
+    k = np.searchsorted(_water_fractions, water)
+    values = _activities_at(temperature)
+    rows = np.arange(len(water))
+    exact = _water_fractions[k] == water
+    node = values[rows, k]
+    # Neighbouring columns: "larger" at k, "smaller" at k - 1
+    k = np.maximum(k, 1)
+    larger = values[rows, k]
+    smaller = values[rows, k - 1]
+    interpolated = smaller + (water - _water_fractions[k - 1]) * (smaller - larger) / (
+        _water_fractions[k - 1] - _water_fractions[k]
+    )
+    result = np.where(exact, node, interpolated)
+    return result.reshape(shape)[()]
+
+
+def _pchip_edge_slope(h0, h1, m0, m1):
+    """One-sided three-point slope at an end node, limited to keep shape."""
+    d = ((2.0 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+    d = np.where(np.sign(d) != np.sign(m0), 0.0, d)
+    return np.where(
+        (np.sign(m0) != np.sign(m1)) & (np.abs(d) > np.abs(3.0 * m0)), 3.0 * m0, d
+    )
+
+
+def _pchip_slopes(x, y):
+    """Fritsch-Carlson (PCHIP) node slopes of ``y`` along its first axis.
+
+    Interior slopes are weighted harmonic means of the neighbouring secant
+    slopes, and zero at local extrema, so the interpolant is monotone
+    wherever the data are.
+    """
+    h = np.diff(x)[:, np.newaxis]
+    delta = np.diff(y, axis=0) / h
+    slopes = np.zeros_like(y)
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    same_sign = np.sign(delta[:-1]) * np.sign(delta[1:]) > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = np.where(same_sign, harmonic, 0.0)
+    slopes[0] = _pchip_edge_slope(h[0], h[1], delta[0], delta[1])
+    slopes[-1] = _pchip_edge_slope(h[-1], h[-2], delta[-1], delta[-2])
+    return slopes
+
+
+@functools.lru_cache(maxsize=None)
+def _hermite_node_slopes():
+    """PCHIP slopes of the table along temperature and water fraction."""
+    d_temperature = _pchip_slopes(_temperatures, _activities)
+    d_water = _pchip_slopes(_water_fractions, _activities.T).T
+    return d_temperature, d_water
+
+
+def _hermite_basis(t):
+    """Cubic Hermite basis functions and their derivatives on [0, 1]."""
+    t2 = t * t
+    t3 = t2 * t
+    values = (2 * t3 - 3 * t2 + 1, -2 * t3 + 3 * t2, t3 - 2 * t2 + t, t3 - t2)
+    derivatives = (6 * t2 - 6 * t, -6 * t2 + 6 * t, 3 * t2 - 4 * t + 1, 3 * t2 - 2 * t)
+    return values, derivatives
+
+
+def calc_activity_water_h2so4_derivatives(temperature, water):
+    """Smooth H2SO4 water activity surface with analytic partial derivatives.
+
+    A bicubic Hermite surface through the WaterActivityH2SO4 table. Its node
+    slopes are the PCHIP (monotone, shape-preserving) slopes along the
+    temperature and water-fraction lines of the table, with zero cross
+    derivatives. The surface reproduces the table nodes exactly and is
+    continuously differentiable, which suits Newton-type solvers.
+
+    Parameters
+    ----------
+    temperature : float or array_like
+        Temperature in Celsius, clipped to the table range (the temperature
+        derivative is zero outside it)
+    water : float or array_like
+        Water mole fraction between 0 and 1, broadcast against
+        ``temperature``
+
+    Returns
+    -------
+    dict
+        ``activity``, ``d_temperature`` (per degree) and ``d_water`` (per
+        unit mole fraction), scalars for scalar inputs and arrays with the
+        broadcast shape otherwise
+
+    Raises
+    ------
+    ValueError
+        If a water fraction lies outside the table
+    """
+    if _activities is None:
+        _load_table()
+    temperature, water = np.broadcast_arrays(
+        np.asarray(temperature, dtype=float), np.asarray(water, dtype=float)
+    )
+    shape = temperature.shape
+    temperature = temperature.ravel()
+    water = water.ravel()
+    _check_water_fraction(water)
+
+    slopes_temperature, slopes_water = _hermite_node_slopes()
+    inside = (temperature >= _temperatures[0]) & (temperature <= _temperatures[-1])
+    temperature = np.clip(temperature, _temperatures[0], _temperatures[-1])
+    i = np.searchsorted(_temperatures, temperature, side="right") - 1
+    i = np.clip(i, 0, len(_temperatures) - 2)
+    j = np.searchsorted(_water_fractions, water, side="right") - 1
+    j = np.clip(j, 0, len(_water_fractions) - 2)
+    h_temperature = _temperatures[i + 1] - _temperatures[i]
+    h_water = _water_fractions[j + 1] - _water_fractions[j]
+    (a0, a1, c0, c1), (da0, da1, dc0, dc1) = _hermite_basis(
+        (temperature - _temperatures[i]) / h_temperature
+    )
+    (b0, b1, e0, e1), (db0, db1, de0, de1) = _hermite_basis(
+        (water - _water_fractions[j]) / h_water
+    )
+
+    activity = np.zeros_like(temperature)
+    d_temperature = np.zeros_like(temperature)
+    d_water = np.zeros_like(temperature)
+    # Corner (i + p, j + q) with the temperature basis (a, c, da, dc) of p
+    # and the water basis (b, e, db, de) of q
+    for p, (a, c, da, dc) in enumerate(((a0, c0, da0, dc0), (a1, c1, da1, dc1))):
+        for q, (b, e, db, de) in enumerate(((b0, e0, db0, de0), (b1, e1, db1, de1))):
+            value = _activities[i + p, j + q]
+            slope_t = h_temperature * slopes_temperature[i + p, j + q]
+            slope_w = h_water * slopes_water[i + p, j + q]
+            activity += value * a * b + slope_t * c * b + slope_w * a * e
+            d_temperature += value * da * b + slope_t * dc * b + slope_w * da * e
+            d_water += value * a * db + slope_t * c * db + slope_w * a * de
+    d_temperature = np.where(inside, d_temperature / h_temperature, 0.0)
+    d_water = d_water / h_water
+
+    return {
+        "activity": activity.reshape(shape)[()],
+        "d_temperature": d_temperature.reshape(shape)[()],
+        "d_water": d_water.reshape(shape)[()],
+    }
@@ -0,0 +1,370 @@
+"""Generate the (T, P) tables used by the tabulated fugacity backend.
+
+The generator evaluates the CPA fugacity coefficients of the supported
+components and the pure-CO2 properties from :func:`get_co2_parameters` on a
+rectilinear temperature-pressure grid. Points are distributed over a pool of
+worker processes, each owning one JVM. Results are appended to a checkpoint
+file as they arrive, so an interrupted run resumes where it stopped.
+
+Starting from a uniform grid, intervals where the tabulated quantities deviate
+most from linear behaviour (for example across the CO2 saturation line) are
+bisected for a configurable number of refinement levels.
+
+Run it from the command line::
+
+    solubilityccs-tables --output-dir solubilityccs/Database
+"""
+
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from .fugacity_tables import (
+    CO2_PROPERTIES,
+    CO2_PROPERTY_NAMES,
+    FUGACITY_COEFFICIENT,
+    TABLE_FORMAT_VERSION,
+    FugacityTable,
+    live_fugacity_coefficient,
+    table_checksum,
+    table_filename,
+)
+
+SUPPORTED_TABLES = ["H2O", "HNO3", "H2SO4", CO2_PROPERTIES]
+
+SOURCE_MODEL = "NeqSim SystemSrkCPAstatoil, mixing rule 9, multiphase check"
+
+
+def table_quantities(name):
+    """Return the quantity names stored in the table ``name``."""
+    if name == CO2_PROPERTIES:
+        return list(CO2_PROPERTY_NAMES)
+    return [FUGACITY_COEFFICIENT]
+
+
+def table_transform(name):
+    """Return the interpolation transform used for the table ``name``."""
+    return "linear" if name == CO2_PROPERTIES else "log"
+
+
+def evaluate_point(task):
+    """Evaluate one grid point with the live CPA model.
+
+    Parameters
+    ----------
+    task : tuple
+        (table name, temperature in Kelvin, pressure in bara)
+
+    Returns
+    -------
+    tuple
+        The task followed by the list of tabulated values
+    """
+    name, temperature, pressure = task
+    if name == CO2_PROPERTIES:
+        from .neqsim_functions import get_co2_parameters
+
+        properties = get_co2_parameters(pressure, temperature)
+        values = [float(properties[q]) for q in CO2_PROPERTY_NAMES]
+    else:
+        values = [float(live_fugacity_coefficient(name, pressure, temperature))]
+    return name, temperature, pressure, values
+
+
+def _initialize_worker():
+    """Start the JVM and load the COMP database once per worker process."""
+    from .jvm import get_jneqsim
+
+    get_jneqsim()
+
+
+class Checkpoint:
+    """Append-only record of evaluated grid points for one table.
+
+    The first line holds the model fingerprint; a checkpoint written for a
+    different model is discarded instead of being resumed.
+    """
+
+    def __init__(self, path, name, fingerprint):
+        self.path = path
+        self.results = {}
+        header = {"table": name, "fingerprint": fingerprint}
+        if os.path.exists(path):
+            with open(path) as handle:
+                lines = handle.read().splitlines()
+            if lines and json.loads(lines[0]) == header:
+                for line in lines[1:]:
+                    try:
+                        temperature, pressure, values = json.loads(line)
+                    except ValueError:
+                        break  # partially written last line
+                    self.results[(temperature, pressure)] = values
+        # Rewrite the valid part so that new records start on a clean line
+        with open(path, "w") as handle:
+            handle.write(json.dumps(header) + "\n")
+            for (temperature, pressure), values in self.results.items():
+                handle.write(json.dumps([temperature, pressure, values]) + "\n")
+        self._handle = open(path, "a")
+
+    def add(self, temperature, pressure, values):
+        self.results[(temperature, pressure)] = values
+        self._handle.write(json.dumps([temperature, pressure, values]) + "\n")
+        self._handle.flush()
+
+    def close(self):
+        self._handle.close()
+
+    def remove(self):
+        self.close()
+        os.remove(self.path)
+
+
+def refine_axis(axis, z, tolerance):
+    """Return midpoints of the intervals along ``axis`` that need refinement.
+
+    Every interior node is predicted by linear interpolation between its
+    neighbours. Where the prediction misses the node by more than
+    ``tolerance`` (for any point on the other axis and any quantity), both
+    adjacent intervals are bisected.
+
+    Parameters
+    ----------
+    axis : numpy.ndarray
+        Ascending grid axis with n nodes
+    z : numpy.ndarray
+        Normalized values with shape (n, ...)
+    tolerance : float
+        Largest accepted deviation from linear behaviour
+
+    Returns
+    -------
+    numpy.ndarray
+        New nodes to insert
+    """
+    if len(axis) < 3:
+        return np.array([])
+    h = np.diff(axis)
+    weight = (h[:-1] / (h[:-1] + h[1:])).reshape((-1,) + (1,) * (z.ndim - 1))
+    predicted = z[:-2] + weight * (z[2:] - z[:-2])
+    deviation = np.abs(predicted - z[1:-1]).reshape(len(axis) - 2, -1).max(axis=1)
+    bad = deviation > tolerance
+    flagged = np.zeros(len(axis) - 1, dtype=bool)
+    flagged[:-1] |= bad
+    flagged[1:] |= bad
+    return (axis[:-1][flagged] + axis[1:][flagged]) / 2
+
+
+def _normalize(values, transform):
+    """Scale values so that deviations are comparable across quantities."""
+    if transform == "log":
+        return np.log(values)
+    span = np.ptp(values, axis=(0, 1))
+    span[span == 0] = 1.0
+    return values / span
+
+
+def build_table(
+    name,
+    temperature,
+    pressure,
+    evaluate,
+    checkpoint=None,
+    refine_levels=2,
+    refine_tolerance=0.01,
+    metadata=None,
+):
+    """Build a table, refining the grid where the values change fastest.
+
+    Parameters
+    ----------
+    name : str
+        Table name, one of :data:`SUPPORTED_TABLES`
+    temperature, pressure : array_like
+        Initial temperature (Kelvin) and pressure (bara) axes
+    evaluate : callable
+        Maps an iterable of (name, T, P) tasks to an iterable of results in
+        any order, as returned by :func:`evaluate_point`
+    checkpoint : Checkpoint, optional
+        Record of already evaluated points, extended as results arrive
+    refine_levels : int, default 2
+        Number of grid bisection passes
+    refine_tolerance : float, default 0.01
+        Deviation from linear behaviour (in log units for fugacity
+        coefficients, relative to the value range for CO2 properties) above
+        which an interval is bisected
+    metadata : dict, optional
+        Extra provenance metadata to record
+
+    Returns
+    -------
+    FugacityTable
+        The generated table
+    """
+    temperature = np.unique(np.asarray(temperature, dtype=float))
+    pressure = np.unique(np.asarray(pressure, dtype=float))
+    results = checkpoint.results if checkpoint is not None else {}
+    transform = table_transform(name)
+
+    for level in range(refine_levels + 1):
+        tasks = [
+            (name, float(t), float(p))
+            for t in temperature
+            for p in pressure
+            if (float(t), float(p)) not in results
+        ]
+        for _, t, p, values in evaluate(tasks):
+            if checkpoint is not None:
+                checkpoint.add(t, p, values)
+            else:
+                results[(t, p)] = values
+
+        values = np.array(
+            [[results[(float(t), float(p))] for p in pressure] for t in temperature]
+        )
+        if level == refine_levels:
+            break
+        z = _normalize(values, transform)
+        new_temperature = refine_axis(temperature, z, refine_tolerance)
+        new_pressure = refine_axis(pressure, np.swapaxes(z, 0, 1), refine_tolerance)
+        if len(new_temperature) == 0 and len(new_pressure) == 0:
+            break
+        temperature = np.union1d(temperature, new_temperature)
+        pressure = np.union1d(pressure, new_pressure)
+
+    from . import __version__
+    from .neqsim_functions import model_fingerprint
+
+    table_metadata = {
+        "format_version": TABLE_FORMAT_VERSION,
+        "source_model": SOURCE_MODEL,
+        "package_version": __version__,
+        "fingerprint": model_fingerprint(include_version=False),
+        "checksum": table_checksum(temperature, pressure, values),
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "refine_levels": refine_levels,
+        "refine_tolerance": refine_tolerance,
+    }
+    table_metadata.update(metadata or {})
+    return FugacityTable(
+        temperature,
+        pressure,
+        values,
+        table_quantities(name),
+        transform=transform,
+        metadata=table_metadata,
+    )
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="solubilityccs-tables",
+        description="Generate tabulated CPA fugacity coefficients and pure-CO2 "
+        "properties for the tabulated fugacity backend.",
+    )
+    parser.add_argument(
+        "tables",
+        nargs="*",
+        default=SUPPORTED_TABLES,
+        choices=SUPPORTED_TABLES,
+        help="Tables to build (default: all)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "Database"),
+        help="Directory for the table files (default: the packaged Database)",
+    )
+    parser.add_argument("--t-min", type=float, default=-50.0, help="Min T in °C")
+    parser.add_argument("--t-max", type=float, default=60.0, help="Max T in °C")
+    parser.add_argument("--t-step", type=float, default=5.0, help="T step in °C")
+    parser.add_argument("--p-min", type=float, default=1.0, help="Min P in bara")
+    parser.add_argument("--p-max", type=float, default=301.0, help="Max P in bara")
+    parser.add_argument("--p-step", type=float, default=10.0, help="P step in bara")
+    parser.add_argument(
+        "--refine-levels", type=int, default=2, help="Grid bisection passes"
+    )
+    parser.add_argument(
+        "--refine-tolerance",
+        type=float,
+        default=0.01,
+        help="Deviation from linear behaviour that triggers bisection",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes, one JVM each (default: all cores)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=4, help="Grid points per task batch"
+    )
+    return parser.parse_args(argv)
+
+
+def _grid_axis(start, stop, step):
+    """Return a uniform axis from start to stop that includes both ends."""
+    count = max(int(round((stop - start) / step)), 1) + 1
+    return np.linspace(start, stop, count)
+
+
+def main(argv=None):
+    """Command-line entry point of ``solubilityccs-tables``."""
+    args = _parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+    temperature = _grid_axis(args.t_min, args.t_max, args.t_step) + 273.15
+    pressure = _grid_axis(args.p_min, args.p_max, args.p_step)
+
+    from .neqsim_functions import model_fingerprint
+
+    fingerprint = model_fingerprint(include_version=False)
+
+    pool = None
+    if args.workers > 1:
+        context = multiprocessing.get_context("spawn")
+        pool = context.Pool(args.workers, initializer=_initialize_worker)
+
+    def evaluate(tasks):
+        if pool is None:
+            return map(evaluate_point, tasks)
+        return pool.imap_unordered(evaluate_point, tasks, chunksize=args.chunksize)
+
+    try:
+        for name in args.tables:
+            start = time.perf_counter()
+            output = os.path.join(args.output_dir, table_filename(name))
+            checkpoint = Checkpoint(output + ".checkpoint", name, fingerprint)
+            resumed = len(checkpoint.results)
+            table = build_table(
+                name,
+                temperature,
+                pressure,
+                evaluate,
+                checkpoint=checkpoint,
+                refine_levels=args.refine_levels,
+                refine_tolerance=args.refine_tolerance,
+                metadata={
+                    "temperature_step": args.t_step,
+                    "pressure_step": args.p_step,
+                },
+            )
+            table.save(output)
+            checkpoint.remove()
+            print(
+                f"{name}: {len(table.temperature)} x {len(table.pressure)} grid "
+                f"({resumed} points resumed) written to {output} in "
+                f"{time.perf_counter() - start:.1f} s"
+            )
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Tests for batched, memoized and tabulated pure-CO2 properties."""
+
+import numpy as np
+import pytest
+
+from solubilityccs import Fluid, ModelResults, collect_stats, neqsim_functions
+from solubilityccs.fugacity_tables import CO2_PROPERTY_NAMES, tabulated_co2_parameters
+from solubilityccs.neqsim_functions import (
+    clear_co2_memo,
+    get_co2_parameters,
+    get_co2_parameters_batch,
+    get_fugacity_and_co2_parameters,
+    get_water_fugacity_coefficient,
+)
+
+PRESSURE = np.array([20.0, 60.0, 110.0, 150.0])
+TEMPERATURE = np.array([263.15, 283.15, 293.15, 313.15])
+
+
+@pytest.fixture
+def live_calls(monkeypatch):
+    """Count live NeqSim evaluations, starting from an empty memo."""
+    calls = []
+    live = neqsim_functions._co2_parameters_live
+
+    def counting(pressure, temperature, properties=None):
+        calls.append((pressure, temperature))
+        return live(pressure, temperature, properties)
+
+    clear_co2_memo()
+    monkeypatch.setattr(neqsim_functions, "_co2_parameters_live", counting)
+    yield calls
+    clear_co2_memo()
+
+
+class TestCo2Parameters:
+    """Test cases for pure-CO2 property evaluation"""
+
+    def test_memoized(self, live_calls):
+        """Test that repeated operating points are evaluated once"""
+        first = get_co2_parameters(60.0, 283.15)
+        first["density"] = -1.0  # callers get their own copy
+        second = get_co2_parameters(60.0, 283.15)
+        assert len(live_calls) == 1
+        assert second["density"] > 700.0
+
+    def test_batch_matches_scalar(self, live_calls):
+        """Test that the batch equals point-by-point evaluation"""
+        batch = get_co2_parameters_batch(PRESSURE, TEMPERATURE)
+        assert len(live_calls) == len(PRESSURE)
+        for i, (pressure, temperature) in enumerate(zip(PRESSURE, TEMPERATURE)):
+            expected = get_co2_parameters(pressure, temperature)
+            for name, value in expected.items():
+                assert batch[name][i] == value
+        assert len(live_calls) == len(PRESSURE)
+
+    def test_batch_broadcasts(self, live_calls):
+        """Test that a pressure sweep at one temperature is supported"""
+        batch = get_co2_parameters_batch(PRESSURE, 293.15)
+        assert batch["density"].shape == PRESSURE.shape
+
+    def test_tabulated_surface(self, live_calls):
+        """Test tabulated properties against live values with fallback"""
+        pressure = np.array([60.0, 150.0, 1000.0])
+        temperature = np.array([283.15, 313.15, 283.15])
+        values, errors = tabulated_co2_parameters(pressure, temperature)
+        assert errors[2] == 0.0  # outside the table, evaluated live
+        assert len(live_calls) == np.count_nonzero(errors == 0.0)
+        for i in range(len(pressure)):
+            expected = get_co2_parameters(pressure[i], temperature[i])
+            for name, value in expected.items():
+                assert values[name][i] == pytest.approx(value, rel=2e-3)
+        tabulated = get_co2_parameters_batch(pressure, temperature, tabulated=True)
+        np.testing.assert_array_equal(tabulated["density"], values["density"])
+
+
+class TestCo2PropertySubsets:
+    """Test cases for evaluating a subset of the CO2 properties"""
+
+    def test_subset_matches_full_evaluation(self, live_calls):
+        """Test that a subset returns exactly the full-evaluation values"""
+        full = get_co2_parameters(60.0, 283.15)
+        density = get_co2_parameters(60.0, 283.15, properties=["density"])
+        thermal = get_co2_parameters(60.0, 283.15, ("enthalpy", "entropy"))
+        assert density == {"density": full["density"]}
+        assert thermal == {"enthalpy": full["enthalpy"], "entropy": full["entropy"]}
+
+    def test_subset_in_batch(self, live_calls):
+        """Test that batches return only the requested properties"""
+        batch = get_co2_parameters_batch(PRESSURE, TEMPERATURE, properties="density")
+        assert list(batch) == ["density"]
+        tabulated = get_co2_parameters_batch(
+            PRESSURE, TEMPERATURE, tabulated=True, properties=["speed_of_sound"]
+        )
+        assert list(tabulated) == ["speed_of_sound"]
+
+    def test_unknown_property(self):
+        """Test that unknown property names are rejected"""
+        with pytest.raises(ValueError):
+            get_co2_parameters(60.0, 283.15, properties=["viscosity"])
+
+
+def make_fluid(backend="neqsim"):
+    """CO2 with water and nitric acid at 10 °C and 60 bara."""
+    fluid = Fluid()
+    fluid.add_component("CO2", 0.999)
+    fluid.add_component("H2O", 5e-4)
+    fluid.add_component("HNO3", 5e-4)
+    fluid.set_temperature(283.15)
+    fluid.set_pressure(60.0)
+    fluid.fugacity_backend = backend
+    return fluid
+
+
+class TestReportProperties:
+    """Test cases for the CO2 properties in flash reports"""
+
+    def test_matches_separate_helpers(self, live_calls):
+        """Test that the combined evaluation returns the helper results"""
+        point = get_fugacity_and_co2_parameters(["CO2", "H2O"], 60.0, 283.15)
+        expected = get_water_fugacity_coefficient(60.0, 10.0)[1]
+        assert point["fugacity_coefficients"] == {"CO2": 1.0, "H2O": expected}
+        assert point["co2_properties"] == get_co2_parameters(60.0, 283.15)
+        assert len(live_calls) == 1
+
+    def test_report_flash_results_need_no_calculation(self, live_calls):
+        """Test that ModelResults reuses the properties of a report flash"""
+        fluid = make_fluid()
+        fluid.flash_activity(report=True)
+        plain = make_fluid()
+        plain.flash_activity()
+        assert fluid.fug_coeff == plain.fug_coeff
+        assert fluid.betta == plain.betta
+        with collect_stats() as scope:
+            results = ModelResults(fluid).to_dict()
+        assert scope["sections"] == {}
+        assert results["co2_properties"] == get_co2_parameters(60.0, 283.15)
+        assert len(live_calls) == 1
+
+    def test_tabulated_report(self):
+        """Test that the tabulated backend interpolates the report properties"""
+        fluid = make_fluid("tabulated")
+        fluid.flash_activity(report=True)
+        expected = get_co2_parameters(60.0, 283.15)
+        assert sorted(fluid.co2_properties) == sorted(CO2_PROPERTY_NAMES)
+        for name in CO2_PROPERTY_NAMES:
+            assert fluid.co2_properties[name] == pytest.approx(expected[name], rel=1e-3)
+
+    def test_flash_does_not_evaluate_co2_properties(self, live_calls):
+        """Test that a flash without report leaves the CO2 properties out"""
+        fluid = make_fluid()
+        fluid.flash_activity(report=True)
+        fluid.flash_activity()
+        assert live_calls == [(60.0, 283.15)]
+        assert fluid.co2_properties == {}
+        assert "co2_properties" not in ModelResults(fluid).to_dict()
+
+        properties = get_co2_parameters(60.0, 283.15)
+        results = ModelResults(fluid, properties).to_dict()
+        assert results["co2_properties"] == properties
@@ -0,0 +1,60 @@
+"""Tests for the shared component property registry."""
+
+import math
+
+import numpy as np
+import pytest
+
+from solubilityccs import Fluid
+from solubilityccs.component_registry import ComponentRegistry, get_registry
+
+
+class TestComponentRegistry:
+    """Test cases for ComponentRegistry and get_registry"""
+
+    def test_parsed_values(self):
+        """Test that decimal commas, decimal points and empty cells are parsed"""
+        registry = get_registry()
+        co2 = registry.properties("CO2")
+        assert co2["Tc"] == 304.19
+        assert co2["UnitAnt"] == "mmhg"
+        assert math.isnan(co2["ActivityK1"])
+        h2so4 = registry.properties("H2SO4")
+        assert h2so4["ActivityK1"] == -0.0169965157984805
+        assert h2so4["ActivityK3"] == -580.0817824
+        assert registry["Pc"][registry.row("H2O")] == 221.2
+
+    def test_read_only(self):
+        """Test that the registry and its arrays cannot be modified"""
+        registry = get_registry()
+        with pytest.raises(ValueError):
+            registry["Tc"][0] = 0.0
+        with pytest.raises(AttributeError):
+            registry.names = ()
+        with pytest.raises(TypeError):
+            registry.properties("CO2")["Tc"] = 0.0
+
+    def test_unknown_component(self):
+        """Test that unknown components raise ValueError"""
+        with pytest.raises(ValueError, match="not found in the database"):
+            get_registry().row("Xe")
+        with pytest.raises(ValueError, match="not found in the database"):
+            Fluid().add_component("Xe", 1.0)
+
+    def test_column_length_mismatch(self):
+        """Test that columns must have one value per component"""
+        with pytest.raises(ValueError):
+            ComponentRegistry(["A", "B"], {"M": [1.0]}, ["", ""])
+
+    def test_shared_by_fluids(self):
+        """Test that fluids reference one registry and read plain floats"""
+        first = Fluid()
+        second = Fluid()
+        assert first.properties is second.properties is get_registry()
+        first.add_component("CO2", 0.99)
+        first.add_component("H2O", 0.01)
+        registry = get_registry()
+        rows = [registry.row("CO2"), registry.row("H2O")]
+        np.testing.assert_array_equal(first.molecular_weight, registry["M"][rows])
+        assert type(first.critical_temperature[0]) is float
+        assert first.AntoineParameterUnit == ["mmhg", "bara"]
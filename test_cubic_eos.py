@@ -0,0 +1,126 @@
+"""Tests for the JVM-free cubic equation-of-state backend."""
+
+import numpy as np
+import pytest
+
+from solubilityccs import Fluid
+from solubilityccs.cubic_eos import fugacity_coefficients, kij_matrix
+from solubilityccs.jvm import get_jneqsim
+
+# Critical properties of CO2 and water as in Properties.csv
+TC = [304.2, 647.3]
+PC = [73.8, 220.5]
+OMEGA = [0.225, 0.344]
+
+
+def neqsim_reference(model, temperature, pressure, fractions):
+    """Fugacity coefficients and critical data of CO2 and water from NeqSim.
+
+    The interaction parameter is set to zero and the system is kept in one
+    phase, so the conditions must have a single real root.
+    """
+    jneqsim = get_jneqsim()
+    if model == "srk":
+        system = jneqsim.thermo.system.SystemSrkEos(temperature, pressure)
+    else:
+        system = jneqsim.thermo.system.SystemPrEos(temperature, pressure)
+    system.addComponent("CO2", fractions[0])
+    system.addComponent("water", fractions[1])
+    system.setMixingRule("classic")
+    system.getPhase(0).getMixingRule().setBinaryInteractionParameter(0, 1, 0.0)
+    system.getPhase(1).getMixingRule().setBinaryInteractionParameter(0, 1, 0.0)
+    system.setNumberOfPhases(1)
+    system.setMaxNumberOfPhases(1)
+    system.init(0)
+    system.init(1)
+    components = [system.getPhase(0).getComponent(i) for i in range(2)]
+    return {
+        "phi": [float(c.getFugacityCoefficient()) for c in components],
+        "tc": [float(c.getTC()) for c in components],
+        "pc": [float(c.getPC()) for c in components],
+        "omega": [float(c.getAcentricFactor()) for c in components],
+    }
+
+
+class TestCubicEos:
+    """Test cases for the SRK and Peng-Robinson fugacity coefficients"""
+
+    @pytest.mark.parametrize("model", ["srk", "pr"])
+    def test_matches_neqsim(self, model):
+        """Test agreement with the NeqSim cubic equations of state"""
+        fractions = [0.999, 0.001]
+        for temperature, pressure in [(275.15, 20.0), (313.15, 100.0)]:
+            reference = neqsim_reference(model, temperature, pressure, fractions)
+            phi = fugacity_coefficients(
+                model,
+                temperature,
+                pressure,
+                fractions,
+                reference["tc"],
+                reference["pc"],
+                reference["omega"],
+            )
+            np.testing.assert_allclose(phi[0], reference["phi"], rtol=1e-3)
+
+    def test_batch_matches_loop(self):
+        """Test that batched evaluation equals point-by-point evaluation"""
+        temperature = np.linspace(260.0, 320.0, 7)
+        pressure = np.linspace(10.0, 200.0, 7)
+        fractions = np.column_stack([np.full(7, 0.999), np.full(7, 0.001)])
+        kij = kij_matrix("pr", ["CO2", "H2O"])
+        batch = fugacity_coefficients(
+            "pr", temperature, pressure, fractions, TC, PC, OMEGA, kij=kij
+        )
+        for i in range(7):
+            single = fugacity_coefficients(
+                "pr", temperature[i], pressure[i], fractions[i], TC, PC, OMEGA, kij=kij
+            )
+            np.testing.assert_allclose(batch[i], single[0], rtol=1e-12)
+
+    def test_kij_matrix(self):
+        """Test default and overridden interaction parameters"""
+        matrix = kij_matrix("srk", ["H2O", "CO2", "HNO3"], {("CO2", "HNO3"): 0.05})
+        assert matrix[0, 1] == matrix[1, 0] == 0.1
+        assert matrix[1, 2] == matrix[2, 1] == 0.05
+        assert matrix[0, 2] == 0.0
+        with pytest.raises(ValueError):
+            kij_matrix("vdw", ["CO2"])
+
+
+class TestFluidCubicBackend:
+    """Test cases for the cubic backends of Fluid"""
+
+    def make_fluid(self, backend):
+        fluid = Fluid()
+        fluid.add_component("CO2", 0.999)
+        fluid.add_component("H2O", 0.001)
+        fluid.set_temperature(283.15)
+        fluid.set_pressure(60.0)
+        fluid.fugacity_backend = backend
+        return fluid
+
+    @pytest.mark.parametrize("backend", ["srk", "pr"])
+    def test_fluid_backend(self, backend):
+        """Test that Fluid fills the fugacity coefficients and EOS parameters"""
+        fluid = self.make_fluid(backend)
+        fluid.calc_fugacicy_coefficient_neqsim_CPA()
+        assert fluid.fug_coeff[0] == 1.0
+        assert 0.0 < fluid.fug_coeff[1] < 1.0
+        assert len(fluid.A) == len(fluid.B) == len(fluid.m) == 2
+        assert fluid.b[1] > 0.0
+
+    def test_kij_override(self):
+        """Test that interaction parameters can be overridden per fluid"""
+        fluid = self.make_fluid("srk")
+        fluid.calc_fugacicy_coefficient_neqsim_CPA()
+        default = fluid.fug_coeff[1]
+        fluid.kij = {("CO2", "H2O"): 0.0}
+        fluid.calc_fugacicy_coefficient_neqsim_CPA()
+        assert fluid.fug_coeff[1] != pytest.approx(default)
+
+    def test_cpa_deviation(self):
+        """Test that the deviation from CPA is reported per component"""
+        fluid = self.make_fluid("srk")
+        deviation = fluid.cpa_deviation()
+        assert list(deviation) == ["H2O"]
+        assert np.isfinite(deviation["H2O"])
@@ -0,0 +1,115 @@
+"""Tests for the compiled database bundle."""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from solubilityccs import database_bundle
+from solubilityccs.component_registry import ComponentRegistry, get_registry
+from solubilityccs.database_bundle import (
+    BUNDLE_FILE,
+    DatabaseBundle,
+    clear_bundle,
+    load_bundle,
+    read_bundle,
+    source_checksums,
+)
+from solubilityccs.path_utils import (
+    DATABASE_ENV_VAR,
+    clear_path_cache,
+    get_database_path,
+)
+from solubilityccs.sulfuric_acid_activity import _parse_csv
+
+
+@pytest.fixture
+def database_dir(tmp_path, monkeypatch):
+    """A private copy of Properties.csv that the bundle is compiled from"""
+    shutil.copy(get_database_path("Properties.csv"), tmp_path / "Properties.csv")
+    monkeypatch.setenv(DATABASE_ENV_VAR, str(tmp_path))
+    clear_path_cache()
+    clear_bundle()
+    yield tmp_path
+    monkeypatch.delenv(DATABASE_ENV_VAR)
+    clear_path_cache()
+    clear_bundle()
+
+
+def set_molar_mass(path, component, value):
+    """Rewrite the molar mass of one component in a Properties.csv copy."""
+    lines = path.read_text(encoding="utf-8-sig").splitlines()
+    header = lines[0].split(";")
+    for i, line in enumerate(lines):
+        fields = line.split(";")
+        if fields[0].strip() == component:
+            fields[header.index("M")] = str(value).replace(".", ",")
+            lines[i] = ";".join(fields)
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class TestDatabaseBundle:
+    """Test cases for compiling, validating and loading the bundle"""
+
+    def test_matches_sources(self):
+        """Test that the bundle holds exactly the values parsed from the CSVs"""
+        bundle = load_bundle()
+        assert dict(bundle.checksums) == source_checksums()
+
+        parsed = ComponentRegistry.from_csv(get_database_path("Properties.csv"))
+        registry = get_registry()
+        assert registry.names == parsed.names
+        assert registry.units == parsed.units
+        for column in parsed.columns:
+            np.testing.assert_array_equal(registry[column], parsed[column])
+
+        arrays = _parse_csv(get_database_path("WaterActivityH2SO4.csv"))
+        for name, array in zip(
+            ["temperatures", "water_fractions", "activities"], arrays
+        ):
+            np.testing.assert_array_equal(bundle[f"h2so4_{name}"], array)
+
+    def test_arrays_are_read_only(self):
+        """Test that neither the bundle nor its arrays can be modified"""
+        bundle = load_bundle()
+        with pytest.raises(ValueError):
+            bundle["properties"][0, 0] = 0.0
+        with pytest.raises(AttributeError):
+            bundle.checksums = {}
+        with pytest.raises(TypeError):
+            bundle.checksums["COMP.csv"] = ""
+
+    def test_rebuilt_when_source_changes(self, database_dir):
+        """Test that editing a source CSV rebuilds the bundle"""
+        properties = database_dir / "Properties.csv"
+        bundle = load_bundle()
+        assert (database_dir / BUNDLE_FILE).exists()
+        row = bundle.metadata["components"].index("H2O")
+        assert bundle["properties"][row, 0] == 18.0
+
+        set_molar_mass(properties, "H2O", 20.5)
+        checksums = source_checksums()
+        assert read_bundle(str(database_dir / BUNDLE_FILE), checksums) is None
+        clear_bundle()
+        bundle = load_bundle()
+        assert bundle["properties"][row, 0] == 20.5
+        assert bundle.checksums["Properties.csv"] == checksums["Properties.csv"]
+        assert read_bundle(str(database_dir / BUNDLE_FILE), checksums) is not None
+
+    def test_corrupt_bundle_is_replaced(self, database_dir):
+        """Test that an unreadable bundle is compiled again from the sources"""
+        (database_dir / BUNDLE_FILE).write_bytes(b"not a bundle")
+        bundle = load_bundle()
+        assert isinstance(bundle, DatabaseBundle)
+        assert read_bundle(str(database_dir / BUNDLE_FILE), source_checksums())
+
+    def test_read_only_directory(self, database_dir, monkeypatch):
+        """Test that the compiled tables are used when the bundle cannot be written"""
+
+        def refuse(*args, **kwargs):
+            raise PermissionError("read-only file system")
+
+        monkeypatch.setattr(database_bundle.tempfile, "mkstemp", refuse)
+        bundle = load_bundle()
+        assert not (database_dir / BUNDLE_FILE).exists()
+        assert dict(bundle.checksums) == source_checksums()
@@ -0,0 +1,65 @@
+"""Tests for the NeqSim engine session object."""
+
+import subprocess
+import sys
+
+import pytest
+
+from solubilityccs import Engine, fugacity_store, jvm
+
+
+class Resource:
+    """Stand-in for a pool that records when it is closed."""
+
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    def close(self):
+        self.log.append(self.name)
+
+
+class TestEngine:
+    """Test cases for Engine"""
+
+    def test_jvm_options_are_applied(self):
+        """Test that heap size and garbage collector reach the JVM"""
+        code = (
+            "import jpype\n"
+            "from solubilityccs import Engine\n"
+            "with Engine(max_heap='256m', gc='Serial') as engine:\n"
+            "    bean = jpype.java.lang.management.ManagementFactory"
+            ".getRuntimeMXBean()\n"
+            "    print(list(bean.getInputArguments()))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert "-Xmx256m" in result.stdout
+        assert "-XX:+UseSerialGC" in result.stdout
+
+    def test_context_manager_releases_resources(self, tmp_path):
+        """Test that pools and the store are released in reverse order"""
+        log = []
+        with Engine(store=str(tmp_path / "store.sqlite")) as engine:
+            assert engine.started
+            assert jvm.is_jvm_started()
+            assert fugacity_store.get_fugacity_store() is not None
+            engine.register(Resource(log, "first"))
+            engine.register(Resource(log, "second"))
+        assert log == ["second", "first"]
+        assert engine.closed
+        assert fugacity_store.get_fugacity_store() is None
+        with pytest.raises(RuntimeError):
+            engine.start()
+
+    def test_options_after_start_are_rejected(self):
+        """Test that JVM options cannot change once the JVM runs"""
+        jvm.get_jneqsim()
+        with pytest.raises(RuntimeError):
+            Engine(max_heap="64g").start()
+
+    def test_unknown_garbage_collector(self):
+        """Test that an unknown collector name is rejected"""
+        with pytest.raises(ValueError):
+            Engine(gc="Magic")
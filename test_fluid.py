@@ -456,6 +456,93 @@ class TestPhaseClass:
         assert phase.fraction == fraction
         assert phase.name == name
 
+    def test_slotted_phase_with_shared_index(self):
+        """Test that phases are slotted and share their component index"""
+        first = Phase()
+        second = Phase()
+        first.set_phase(["CO2", "H2O"], [0.9, 0.1], 0.5, "gas")
+        second.set_phase(["CO2", "H2O"], [0.2, 0.8], 0.5, "liquid")
+        assert not hasattr(first, "__dict__")
+        assert first._index is second._index
+        first.set_component_fraction("H2O", 0.3)
+        assert first.get_component_fraction("H2O") == 0.3
+        assert first.get_fraction_component("HNO3") == 0
+        with pytest.raises(ValueError):
+            first.get_component_fraction("HNO3")
+        with pytest.raises(ValueError):
+            first.set_component_fraction("HNO3", 0.1)
+
+    def test_fraction_items_write_through(self):
+        """Test that item assignments on the fractions list update the phase"""
+        phase = Phase()
+        phase.set_properties({"M": [44.01, 18.0]})
+        phase.set_phase(["CO2", "H2O"], [0.5, 0.5], 1.0, "gas")
+        assert phase.get_molar_mass() == pytest.approx(0.031005)
+        fractions = phase.fractions
+        fractions[1] = 0.0
+        assert fractions == [0.5, 0.0]
+        assert phase.fractions == [0.5, 0.0]
+        assert phase.get_component_fraction("H2O") == 0.0
+        assert phase.get_molar_mass() == pytest.approx(0.022005)
+        phase.fractions[:] = [0.25, 0.75]
+        assert phase.get_fraction_component("H2O") == 0.75
+        with pytest.raises(TypeError):
+            phase.fractions.append(0.1)
+        with pytest.raises(ValueError):
+            phase.fractions[0:1] = [0.1, 0.2]
+        assert phase.fractions == [0.25, 0.75]
+
+    def test_aggregates_match_component_sums(self):
+        """Test the vectorized totals against per-component sums"""
+        phase = Phase()
+        phase.set_properties({"M": [44.01, 18.0, 63.0]})
+        phase.set_phase(["CO2", "H2O", "HNO3"], [0.2, 0.5, 0.3], 0.4, "liquid")
+        phase.set_phase_flow_rate(250.0)
+        components = phase.components
+        mass_flows = [phase.get_component_flow_rate(c, "kg/hr") for c in components]
+        assert phase.get_phase_flow_rate("kg/hr") == pytest.approx(sum(mass_flows))
+        assert phase.get_flow_rate("kg/hr") == pytest.approx(sum(mass_flows))
+        assert phase.get_molar_mass() == pytest.approx(
+            (0.2 * 44.01 + 0.5 * 18.0 + 0.3 * 63.0) / 1000
+        )
+        assert phase.get_acid_wt_prc("HNO3") == pytest.approx(
+            100 * mass_flows[2] / sum(mass_flows)
+        )
+        assert phase.get_component_mass_flows() == dict(zip(components, mass_flows))
+        assert sum(phase.get_wt_prc().values()) == pytest.approx(100.0)
+
+    def test_derived_quantities_invalidated(self):
+        """Test that cached totals follow changes of flow, fractions and M"""
+        phase = Phase()
+        masses = [44.01, 18.0]
+        phase.set_properties({"M": masses})
+        phase.set_phase(["CO2", "H2O"], [0.5, 0.5], 1.0, "gas")
+        phase.set_phase_flow_rate(1000.0)
+        assert phase.get_phase_flow_rate("kg/hr") == pytest.approx(31.005)
+        phase.set_phase_flow_rate(2000.0)
+        assert phase.get_phase_flow_rate("kg/hr") == pytest.approx(62.01)
+        phase.set_component_fraction("H2O", 0.0)
+        assert phase.get_molar_mass() == pytest.approx(0.022005)
+        phase.normalize()
+        assert phase.get_acid_wt_prc("CO2") == pytest.approx(100.0)
+        masses[0] = 44.0
+        phase.clear_derived()
+        assert phase.get_molar_mass() == pytest.approx(0.044)
+
+    def test_fluid_molar_mass_invalidated(self):
+        """Test that the cached fluid molar mass follows the composition"""
+        fluid = Fluid()
+        fluid.add_component("CO2", 1.0)
+        assert fluid.get_molar_mass() == pytest.approx(0.04401)
+        fluid.add_component("H2O", 1.0)
+        assert fluid.get_molar_mass() == pytest.approx(0.06201)
+        fluid.normalize()
+        assert fluid.get_molar_mass() == pytest.approx(0.031005)
+        fluid.set_component_fraction("H2O", 0.0)
+        assert fluid.get_molar_mass() == pytest.approx(0.022005)
+        fluid.fractions = [1.0, 0.0]
+        assert fluid.get_molar_mass() == fluid.MW == pytest.approx(0.04401)
+
 
 class TestFluidWithoutDatabase:
     """Test cases for Fluid class that work without database files"""
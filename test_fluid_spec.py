@@ -0,0 +1,71 @@
+"""Tests for the compact FluidSpec and FlashRecord."""
+
+import pickle
+
+import pytest
+
+from solubilityccs import FlashRecord, Fluid, FluidSpec, ModelResults
+from solubilityccs.parallel import flash_spec, run_flash
+
+COMPOSITION = {"CO2": 0.999, "H2O": 5e-4, "HNO3": 5e-4}
+
+
+class TestFluidSpec:
+    """Test cases for FluidSpec and Fluid.from_spec/to_spec"""
+
+    def test_from_composition(self):
+        """Test that a spec builds the fluid it describes"""
+        spec = FluidSpec.from_composition(275.15, 60.0, COMPOSITION, 100.0)
+        assert spec.component_names == list(COMPOSITION)
+        fluid = Fluid.from_spec(spec)
+        assert fluid.components == list(COMPOSITION)
+        assert fluid.temperature == fluid.get_phase(1).temperature == 275.15
+        assert fluid.get_flow_rate("kg/hr") == pytest.approx(100.0)
+        with pytest.raises(ValueError):
+            FluidSpec.from_composition(275.15, 60.0, {"Xe": 1.0})
+
+    def test_round_trip(self):
+        """Test that to_spec and from_spec reproduce the fluid inputs"""
+        fluid = Fluid()
+        fluid.add_component("CO2", 0.98)
+        fluid.add_component("H2O", 0.015)
+        fluid.add_component("H2SO4", 0.005)
+        fluid.set_temperature(290.0)
+        fluid.set_pressure(45.0)
+        fluid.set_flow_rate(1000.0, "kg/hr")
+        fluid.fugacity_backend = "srk"
+        copy = Fluid.from_spec(fluid.to_spec())
+        assert copy.components == fluid.components
+        assert copy.fractions == fluid.fractions
+        assert copy.flow_rate == fluid.flow_rate
+        assert copy.fugacity_backend == "srk"
+        assert copy.to_spec() == fluid.to_spec()
+
+    def test_compact_pickle(self):
+        """Test that a spec pickles smaller than the dictionary spec"""
+        spec = FluidSpec.from_composition(275.15, 60.0, COMPOSITION, 100.0)
+        payload = pickle.dumps(spec)
+        assert len(payload) < 150
+        assert len(payload) < len(pickle.dumps(flash_spec(275.15, 60.0, COMPOSITION)))
+        assert pickle.loads(payload) == spec
+
+
+class TestFlashRecord:
+    """Test cases for FlashRecord and Fluid.from_record"""
+
+    def test_record_reproduces_results(self):
+        """Test that a record rebuilds the results of the flash"""
+        spec = FluidSpec.from_composition(
+            275.15, 60.0, COMPOSITION, 100.0, fugacity_backend="tabulated"
+        )
+        record = run_flash(spec)
+        assert isinstance(record, FlashRecord)
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert len(pickle.dumps(record)) < 250
+
+        expected = run_flash(
+            flash_spec(275.15, 60.0, COMPOSITION, 100.0, fugacity_backend="tabulated")
+        )
+        fluid = Fluid.from_record(record)
+        assert ModelResults(fluid).to_dict() == expected
+        assert fluid.iteration == record.iterations
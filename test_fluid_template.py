@@ -0,0 +1,86 @@
+"""Tests for Fluid.clone and FluidTemplate."""
+
+import pytest
+
+from solubilityccs import Fluid, FluidTemplate
+
+COMPONENTS = ["CO2", "H2O", "HNO3"]
+
+
+def build(temperature, pressure, fractions):
+    """Build a tabulated-backend fluid the long way."""
+    fluid = Fluid()
+    for component, fraction in zip(COMPONENTS, fractions):
+        fluid.add_component(component, fraction)
+    fluid.set_temperature(temperature)
+    fluid.set_pressure(pressure)
+    fluid.set_flow_rate(100.0, "kg/hr")
+    fluid.fugacity_backend = "tabulated"
+    return fluid
+
+
+class TestClone:
+    """Test cases for Fluid.clone"""
+
+    def test_copies_inputs_only(self):
+        """Test that a clone copies the inputs and not earlier results"""
+        fluid = build(275.15, 60.0, [0.999, 5e-4, 5e-4])
+        fluid.kij[("CO2", "H2O")] = 0.1
+        fluid.flash_activity()
+        clone = fluid.clone()
+        assert clone.components == fluid.components
+        assert clone.fractions == fluid.fractions
+        assert clone.temperature == clone.get_phase(1).temperature == 275.15
+        assert clone.flow_rate == fluid.flow_rate
+        assert clone.fugacity_backend == "tabulated"
+        assert clone.kij == fluid.kij and clone.kij is not fluid.kij
+        assert clone.K_values == [] and clone.get_phase(0).fractions == []
+
+    def test_independent_state(self):
+        """Test that clones share properties but not their mutable state"""
+        fluid = build(275.15, 60.0, [0.999, 5e-4, 5e-4])
+        water = fluid.get_component_fraction("H2O")
+        clone = fluid.clone()
+        other = clone.clone()
+        assert clone.molecular_weight is other.molecular_weight
+        assert clone.get_phase(1).reading_properties is clone.reading_properties
+        clone.set_component_fraction("H2O", 0.01)
+        clone.add_component("H2SO4", 1e-6)
+        assert fluid.get_component_fraction("H2O") == water
+        assert other.components == COMPONENTS
+        assert len(other.molecular_weight) == 3
+        assert len(clone.molecular_weight) == 4
+        assert clone.get_phase(0).reading_properties["M"][-1] == 98.0
+
+
+class TestFluidTemplate:
+    """Test cases for FluidTemplate"""
+
+    def test_matches_fresh_fluid(self):
+        """Test that a stamped fluid flashes exactly like one built by hand"""
+        template = FluidTemplate(COMPONENTS, fugacity_backend="tabulated")
+        stamped = template.create(280.15, 50.0, [0.999, 5e-4, 5e-4], 100.0)
+        fresh = build(280.15, 50.0, [0.999, 5e-4, 5e-4])
+        stamped.flash_activity()
+        fresh.flash_activity()
+        assert stamped.betta == fresh.betta
+        assert stamped.K_values == fresh.K_values
+        assert stamped.get_phase(1).fractions == fresh.get_phase(1).fractions
+
+    def test_fractions_by_name(self):
+        """Test fractions given as a mapping, with missing components zero"""
+        template = FluidTemplate(COMPONENTS)
+        fluid = template.create(290.0, 60.0, {"CO2": 0.9, "HNO3": 0.1})
+        assert fluid.fractions == [0.9, 0.0, 0.1]
+        assert fluid.flow_rate == 1
+        with pytest.raises(ValueError):
+            template.create(290.0, 60.0, {"N2": 1.0})
+        with pytest.raises(ValueError):
+            template.create(290.0, 60.0, [1.0])
+
+    def test_invalid_template(self):
+        """Test that unknown components and settings are rejected"""
+        with pytest.raises(ValueError):
+            FluidTemplate(["CO2", "Xe"])
+        with pytest.raises(AttributeError):
+            FluidTemplate(COMPONENTS, fugacity_bakend="tabulated")
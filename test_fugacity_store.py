@@ -0,0 +1,115 @@
+"""Tests for the persistent fugacity-coefficient store."""
+
+import multiprocessing
+
+import pytest
+
+from solubilityccs import (
+    disable_fugacity_store,
+    enable_fugacity_store,
+    neqsim_functions,
+)
+from solubilityccs.fugacity_store import FugacityStore, stored
+from solubilityccs.neqsim_functions import (
+    get_water_fugacity_coefficient,
+    model_fingerprint,
+)
+
+
+def _write_points(args):
+    """Write and read back a block of entries from a worker process."""
+    path, worker = args
+    store = FugacityStore(path, fingerprint="test")
+    for i in range(50):
+        store.get_or_compute("square", [float(i)], lambda i=i: [i * i, worker])
+    return [store.get("square", [float(i)])[0] for i in range(50)]
+
+
+@pytest.fixture
+def no_global_store():
+    """Make sure the global store is disabled after each test."""
+    yield
+    disable_fugacity_store()
+
+
+class TestFugacityStore:
+    """Test cases for FugacityStore"""
+
+    def test_round_trip(self, tmp_path):
+        """Test that stored values are returned unchanged"""
+        store = FugacityStore(tmp_path / "store.sqlite", fingerprint="abc")
+        assert store.get("water", [60.0, 2.0]) is None
+        store.put("water", [60.0, 2.0], [0.1, 0.2])
+        assert store.get("water", [60.0, 2.0]) == [0.1, 0.2]
+        assert len(store) == 1
+
+    def test_stale_entries_not_served(self, tmp_path):
+        """Test that entries from another model fingerprint are ignored"""
+        path = tmp_path / "store.sqlite"
+        FugacityStore(path, fingerprint="old").put("water", [60.0, 2.0], [1.0])
+        store = FugacityStore(path, fingerprint="new")
+        assert store.get("water", [60.0, 2.0]) is None
+        assert store.purge_stale() == 1
+
+    def test_concurrent_processes(self, tmp_path):
+        """Test that several processes can read and write the same store"""
+        path = str(tmp_path / "store.sqlite")
+        FugacityStore(path, fingerprint="test")
+        context = multiprocessing.get_context("fork")
+        with context.Pool(4) as pool:
+            results = pool.map(_write_points, [(path, w) for w in range(4)])
+        expected = [float(i * i) for i in range(50)]
+        assert all(result == expected for result in results)
+        assert len(FugacityStore(path, fingerprint="test")) == 50
+
+    def test_stored_decorator(self, tmp_path, no_global_store):
+        """Test that decorated functions are computed once per input"""
+        calls = []
+
+        @stored("double")
+        def double(value, factor=2.0):
+            calls.append(value)
+            return value * factor
+
+        assert double(3.0) == 6.0
+        enable_fugacity_store(tmp_path / "store.sqlite", fingerprint="test")
+        assert double(3.0) == 6.0
+        assert double(3.0) == 6.0
+        assert double(3.0, factor=3.0) == 9.0
+        assert calls == [3.0, 3.0, 3.0]
+
+    def test_model_fingerprint_is_stable(self):
+        """Test that the fingerprint is deterministic"""
+        assert model_fingerprint() == model_fingerprint()
+        assert len(model_fingerprint()) == 64
+
+    def test_model_fingerprint_follows_results(self, monkeypatch):
+        """Test that the fingerprint follows the kij values, not their source"""
+        original = model_fingerprint()
+
+        def restated(temperature):
+            """Same correlation, different source text."""
+            return -0.28985 + -0.273 * (temperature / 273.15 - 1.0)
+
+        monkeypatch.setattr(neqsim_functions, "water_co2_kij", restated)
+        assert model_fingerprint() == original
+
+        monkeypatch.setattr(
+            neqsim_functions, "water_co2_kij", lambda temperature: -0.19
+        )
+        assert model_fingerprint() != original
+
+        monkeypatch.undo()
+        monkeypatch.setattr(neqsim_functions, "MODEL_VERSION", 2)
+        assert model_fingerprint() != original
+
+    def test_water_fugacity_coefficient_served_from_store(
+        self, tmp_path, no_global_store
+    ):
+        """Test that a stored CPA result matches the live calculation"""
+        live = get_water_fugacity_coefficient(60.0, 2.0)
+        store = enable_fugacity_store(tmp_path / "store.sqlite")
+        first = get_water_fugacity_coefficient(60.0, 2.0)
+        assert len(store) == 1
+        assert get_water_fugacity_coefficient(60.0, 2.0) == first
+        assert first == pytest.approx([float(v) for v in live], rel=1e-12)
@@ -0,0 +1,158 @@
+"""Tests for the tabulated fugacity-coefficient backend."""
+
+import numpy as np
+import pytest
+
+from solubilityccs import Fluid, fugacity_tables
+from solubilityccs.fugacity_tables import (
+    CO2_PROPERTIES,
+    DEFAULT_TOLERANCE,
+    FugacityTable,
+    get_table,
+    tabulated_fugacity_coefficient,
+)
+
+
+def smooth_surface(temperature, pressure):
+    """Positive, smooth test function of temperature (K) and pressure (bara)."""
+    return 0.5 * np.exp(-0.01 * pressure) * (temperature / 273.15) ** 2
+
+
+def make_table(n_temperature=21, n_pressure=31):
+    """Build a table of the smooth test surface."""
+    temperature = np.linspace(253.15, 333.15, n_temperature)
+    pressure = np.linspace(1.0, 300.0, n_pressure)
+    values = smooth_surface(temperature[:, None], pressure[None, :])
+    return FugacityTable(
+        temperature,
+        pressure,
+        values,
+        [fugacity_tables.FUGACITY_COEFFICIENT],
+        metadata={"source_model": "test"},
+    )
+
+
+@pytest.fixture
+def patched_table(monkeypatch):
+    """Serve the test table for every component and record live calls."""
+    table = make_table()
+    live_calls = []
+
+    def live(component, pressure, temperature):
+        live_calls.append((component, pressure, temperature))
+        return -1.0
+
+    monkeypatch.setattr(fugacity_tables, "get_table", lambda name: table)
+    monkeypatch.setattr(fugacity_tables, "live_fugacity_coefficient", live)
+    return table, live_calls
+
+
+class TestFugacityTable:
+    """Test cases for FugacityTable"""
+
+    def test_reproduces_nodes(self):
+        """Test that grid nodes are interpolated exactly"""
+        table = make_table()
+        t, p = np.meshgrid(table.temperature, table.pressure, indexing="ij")
+        values, _ = table.evaluate(t, p)
+        np.testing.assert_allclose(values, table.values[:, :, 0], rtol=1e-12)
+
+    def test_interpolation_within_error_estimate(self):
+        """Test vectorized interpolation and its error estimate"""
+        table = make_table()
+        rng = np.random.default_rng(0)
+        t = rng.uniform(253.15, 333.15, 500)
+        p = rng.uniform(1.0, 300.0, 500)
+        values, errors = table.evaluate(t, p)
+        relative = np.abs(values / smooth_surface(t, p) - 1.0)
+        assert values.shape == (500,)
+        assert relative.max() < 1e-5
+        assert np.all(errors < 1e-4)
+
+    def test_outside_grid(self):
+        """Test that points outside the grid are flagged"""
+        table = make_table()
+        values, errors = table.evaluate([200.0, 300.0], [60.0, 400.0])
+        assert np.all(np.isnan(values))
+        assert np.all(np.isinf(errors))
+
+    def test_save_and_load(self, tmp_path):
+        """Test that a saved table loads with identical data"""
+        table = make_table()
+        path = tmp_path / "fugacity_H2O.npz"
+        table.save(path)
+        loaded = FugacityTable.load(path)
+        np.testing.assert_array_equal(loaded.values, table.values)
+        assert loaded.quantities == table.quantities
+        assert loaded.metadata["source_model"] == "test"
+        assert loaded.metadata["format_version"] == fugacity_tables.TABLE_FORMAT_VERSION
+
+
+def covered_fraction(table, t_range, p_range, points=120):
+    """Fraction of a (°C, bara) window served by the table without live calls."""
+    t, p = np.meshgrid(
+        np.linspace(*t_range, points) + 273.15, np.linspace(*p_range, points)
+    )
+    covered = [
+        table.evaluate(t.ravel(), p.ravel(), quantity)[1] <= DEFAULT_TOLERANCE
+        for quantity in table.quantities
+    ]
+    return np.logical_and.reduce(covered).mean()
+
+
+class TestPackagedTables:
+    """Test cases for the coverage of the shipped tables"""
+
+    @pytest.mark.parametrize("name", ["H2O", "HNO3", "H2SO4", CO2_PROPERTIES])
+    def test_operating_envelope_coverage(self, name):
+        """Test that the tables serve most of the envelope without the JVM"""
+        table = get_table(name)
+        assert table is not None
+        assert covered_fraction(table, (-50.0, 60.0), (1.0, 301.0)) > 0.75
+        assert covered_fraction(table, (0.0, 40.0), (80.0, 200.0)) > 0.95
+
+
+class TestTabulatedBackend:
+    """Test cases for the tabulated backend and its live fallback"""
+
+    def test_scalar_inside_grid(self, patched_table):
+        """Test that points inside the grid need no live call"""
+        _, live_calls = patched_table
+        value, error = tabulated_fugacity_coefficient("H2O", 60.0, 275.15)
+        assert value == pytest.approx(smooth_surface(275.15, 60.0), rel=1e-5)
+        assert 0 <= error < 1e-3
+        assert live_calls == []
+
+    def test_fallback_outside_grid(self, patched_table):
+        """Test that points outside the grid use the live CPA model"""
+        _, live_calls = patched_table
+        values, errors = tabulated_fugacity_coefficient(
+            "HNO3", np.array([60.0, 400.0]), np.array([275.15, 275.15])
+        )
+        assert values[1] == -1.0 and errors[1] == 0.0
+        assert live_calls == [("HNO3", 400.0, 275.15)]
+
+    def test_fluid_tabulated_backend(self, patched_table):
+        """Test that Fluid uses the tables when the backend is selected"""
+        _, live_calls = patched_table
+        fluid = Fluid()
+        fluid.add_component("CO2", 0.99998)
+        fluid.add_component("H2SO4", 1e-5)
+        fluid.add_component("H2O", 1e-5)
+        fluid.set_temperature(275.15)
+        fluid.set_pressure(60.0)
+        fluid.fugacity_backend = "tabulated"
+        fluid.calc_fugacicy_coefficient_neqsim_CPA()
+        expected = smooth_surface(275.15, 60.0)
+        assert fluid.fug_coeff[0] == 1.0
+        assert fluid.fug_coeff[1:] == pytest.approx([expected, expected], rel=1e-5)
+        assert len(fluid.fug_coeff_error) == 3
+        assert live_calls == []
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected"""
+        fluid = Fluid()
+        fluid.add_component("CO2", 1.0)
+        fluid.fugacity_backend = "magic"
+        with pytest.raises(ValueError):
+            fluid.calc_fugacicy_coefficient_neqsim_CPA()
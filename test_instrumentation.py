@@ -0,0 +1,105 @@
+"""Tests for the optional NeqSim instrumentation."""
+
+import pytest
+
+from solubilityccs import Fluid, ModelResults, collect_stats, instrumentation, stats
+from solubilityccs.neqsim_functions import (
+    clear_system_pool,
+    get_water_fugacity_coefficient,
+)
+
+
+@pytest.fixture
+def fresh_stats():
+    """Start from empty counters with instrumentation disabled."""
+    instrumentation.disable_stats()
+    instrumentation.reset_stats()
+    yield
+    instrumentation.disable_stats()
+    instrumentation.reset_stats()
+
+
+def flash():
+    fluid = Fluid()
+    fluid.add_component("CO2", 0.999)
+    fluid.add_component("H2O", 5e-4)
+    fluid.add_component("HNO3", 5e-4)
+    fluid.set_temperature(290.0)
+    fluid.set_pressure(60.0)
+    fluid.flash_activity()
+    return fluid
+
+
+class TestInstrumentation:
+    """Test cases for stats() and collect_stats()"""
+
+    def test_disabled_by_default(self, fresh_stats):
+        """Test that nothing is recorded while instrumentation is off"""
+        get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        snapshot = stats()
+        assert snapshot["enabled"] is False
+        assert snapshot["jpype_calls"] == 0
+        assert snapshot["sections"] == {}
+
+    def test_scope_counts_flash(self, fresh_stats):
+        """Test the counts recorded for one flash_activity"""
+        clear_system_pool()
+        with collect_stats() as scope:
+            flash()
+        assert scope["flashes"] == 1
+        assert scope["systems_created"] == 2
+        # Two flashes per helper: database kij, then the tuned kij
+        assert scope["tpflash_calls"] == 4
+        assert scope["jpype_calls"] > scope["tpflash_calls"]
+        assert set(scope["sections"]) == {
+            "acid_fugacity_coefficient",
+            "water_fugacity_coefficient",
+        }
+        assert 0.0 < scope["tpflash_time"] <= scope["neqsim_time"]
+        assert scope["neqsim_time"] <= scope["flash_time"]
+        assert scope["python_time"] == pytest.approx(
+            scope["flash_time"] - scope["neqsim_time"]
+        )
+        assert not instrumentation.enabled
+
+    def test_results_unchanged(self, fresh_stats):
+        """Test that instrumented calculations give the same results"""
+        plain = flash()
+        with collect_stats():
+            measured = flash()
+        assert measured.betta == plain.betta
+        assert measured.K_values == plain.K_values
+
+    def test_scope_only_counts_block(self, fresh_stats):
+        """Test that a scope reports its own calls, not the global totals"""
+        instrumentation.enable_stats()
+        get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        with collect_stats() as scope:
+            get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        assert scope["sections"]["water_fugacity_coefficient"]["calls"] == 1
+        assert stats()["sections"]["water_fugacity_coefficient"]["calls"] == 2
+        assert instrumentation.enabled
+
+    def test_derived_cache_counts(self, fresh_stats):
+        """Test that repeated reports hit the cached phase quantities"""
+        fluid = Fluid()
+        fluid.add_component("CO2", 0.999)
+        fluid.add_component("H2O", 5e-4)
+        fluid.add_component("H2SO4", 5e-4)
+        fluid.set_temperature(275.15)
+        fluid.set_pressure(60.0)
+        fluid.set_flow_rate(100.0, "kg/hr")
+        fluid.fugacity_backend = "tabulated"
+        fluid.flash_activity()
+        with collect_stats() as scope:
+            results = ModelResults(fluid)
+            for _ in range(3):
+                results.generate_table()
+                results.to_dict()
+        assert scope["derived_caches"]["phase"]["misses"] == 1
+        assert scope["derived_cache_hits"] > scope["derived_cache_misses"]
+        assert scope["derived_cache_hit_rate"] == pytest.approx(
+            scope["derived_cache_hits"]
+            / (scope["derived_cache_hits"] + scope["derived_cache_misses"])
+        )
+        assert stats()["derived_cache_hit_rate"] is not None
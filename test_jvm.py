@@ -0,0 +1,93 @@
+"""Tests for lazy NeqSim startup."""
+
+import os
+import subprocess
+import sys
+import threading
+
+from solubilityccs import disable_fugacity_store, enable_fugacity_store, jvm, warmup
+
+
+def run_python(code, env=None):
+    """Run code in a fresh interpreter and return its stripped stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return result.stdout.strip()
+
+
+class TestLazyJvm:
+    """Test cases for deferred JVM startup"""
+
+    def test_import_does_not_start_jvm(self):
+        """Test that importing the package and JVM-free work skip NeqSim"""
+        output = run_python(
+            "import sys\n"
+            "from solubilityccs import Fluid\n"
+            "fluid = Fluid()\n"
+            "fluid.add_component('CO2', 0.999)\n"
+            "fluid.add_component('H2O', 0.001)\n"
+            "fluid.set_temperature(283.15)\n"
+            "fluid.set_pressure(60.0)\n"
+            "fluid.fugacity_backend = 'srk'\n"
+            "fluid.calc_fugacicy_coefficient_neqsim_CPA()\n"
+            "print('neqsim' in sys.modules, 'matplotlib' in sys.modules)\n"
+        )
+        assert output == "False False"
+
+    def test_configured_options(self):
+        """Test that configured options follow the NeqSim environment defaults"""
+        env = dict(
+            os.environ, NEQSIM_JVM_ARGS="-Dsccs.test=1", NEQSIM_JVM_MAX_HEAP="512m"
+        )
+        output = run_python(
+            "import jpype\n"
+            "from solubilityccs import jvm\n"
+            "jvm.configure_jvm(['-Xss4m'])\n"
+            "jvm.get_jneqsim()\n"
+            "bean = jpype.JClass('java.lang.management.ManagementFactory')\n"
+            "args = [str(a) for a in bean.getRuntimeMXBean().getInputArguments()]\n"
+            "wanted = ['-Xrs', '-Dsccs.test=1', '-Xmx512m', '-Xss4m']\n"
+            "print([a for a in args if a in wanted])\n",
+            env=env,
+        )
+        assert output.splitlines()[-1] == str(
+            ["-Xrs", "-Dsccs.test=1", "-Xmx512m", "-Xss4m"]
+        )
+
+    def test_concurrent_first_use(self):
+        """Test that concurrent first calls share one initialized gateway"""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(jvm.get_jneqsim()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(results) == 4
+        assert all(result is results[0] for result in results)
+        assert jvm.is_jvm_started()
+
+
+class TestWarmup:
+    """Test cases for the JVM warm-up API"""
+
+    def test_warmup_reports_latencies(self, tmp_path):
+        """Test that warm-up covers every code path and bypasses the store"""
+        store = enable_fugacity_store(str(tmp_path / "store.sqlite"))
+        try:
+            report = warmup(iterations=2, conditions=[(60.0, 10.0)])
+            assert len(store) == 0
+        finally:
+            disable_fugacity_store()
+        assert set(report["steady_state"]) == {"H2O", "HNO3", "H2SO4", "CO2"}
+        assert set(report["first_call"]) == set(report["steady_state"])
+        assert report["calls"] == 8
+        assert all(latency > 0 for latency in report["steady_state"].values())
+        assert report["total"] >= report["startup"]
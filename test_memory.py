@@ -0,0 +1,65 @@
+"""Tests for bounded memory use in long-running processes."""
+
+import threading
+
+from solubilityccs import collect_stats, memory_usage
+from solubilityccs.neqsim_functions import (
+    clear_system_pool,
+    get_water_fugacity_coefficient,
+)
+
+
+class TestMemoryUsage:
+    """Test cases for memory_usage"""
+
+    def test_reports_process_and_jvm_memory(self):
+        """Test that the RSS and JVM heap figures are consistent"""
+        get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        usage = memory_usage(collect=True)
+        assert usage["rss"] > 0
+        assert 0 < usage["jvm_heap_used"] <= usage["jvm_heap_committed"]
+        assert usage["jvm_heap_committed"] <= usage["jvm_heap_max"]
+
+
+class TestSystemPoolRelease:
+    """Test cases for releasing the pooled NeqSim systems"""
+
+    def test_release_all_threads(self):
+        """Test that other threads rebuild their systems after a release"""
+        created = []
+        errors = []
+        release = threading.Event()
+        released = threading.Event()
+
+        def worker():
+            try:
+                for _ in range(2):
+                    with collect_stats() as scope:
+                        get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+                    created.append(scope["systems_created"])
+                    release.set()
+                    released.wait(timeout=60)
+            except BaseException as error:
+                errors.append(error)
+                release.set()
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        assert release.wait(timeout=60)
+        clear_system_pool(all_threads=True)
+        released.set()
+        thread.join(timeout=60)
+        assert not thread.is_alive()
+        if errors:
+            raise errors[0]
+        assert created == [1, 1]
+
+    def test_release_calling_thread_only(self):
+        """Test that a plain release keeps the systems of other threads"""
+        get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        thread = threading.Thread(target=clear_system_pool)
+        thread.start()
+        thread.join()
+        with collect_stats() as scope:
+            get_water_fugacity_coefficient.__wrapped__(60.0, 10.0)
+        assert scope["systems_created"] == 0
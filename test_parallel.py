@@ -0,0 +1,188 @@
+"""Tests for process-pool flash execution."""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from solubilityccs.neqsim_functions import (
+    get_acid_fugacity_coeff,
+    get_water_fugacity_coefficient,
+)
+from solubilityccs.parallel import (
+    FlashPool,
+    FlashSupervisor,
+    flash_many,
+    flash_spec,
+    run_flash,
+)
+
+COMPOSITION = {"CO2": 0.999, "H2O": 5e-4, "HNO3": 5e-4}
+
+
+def make_specs():
+    """Flash specifications around the water dew point."""
+    return [
+        flash_spec(273.15 + temperature, 60.0, COMPOSITION, 100.0)
+        for temperature in (-5.0, 15.0)
+    ]
+
+
+def probe(spec):
+    """Stand-in task that crashes, hangs or fails on request."""
+    if spec["mode"] == "crash":
+        os._exit(3)
+    if spec["mode"] == "hang":
+        time.sleep(60)
+    if spec["mode"] == "error":
+        raise ValueError("bad point")
+    if spec["mode"] == "crash-once" and not os.path.exists(spec["marker"]):
+        open(spec["marker"], "w").close()
+        os._exit(3)
+    return spec["value"] * 2
+
+
+def hanging_start(jvm_options, warmup):
+    """Worker initializer that hangs once, or always without a marker file."""
+    marker = os.environ.get("SOLUBILITYCCS_TEST_MARKER")
+    if marker is None or not os.path.exists(marker):
+        if marker is not None:
+            open(marker, "w").close()
+        time.sleep(60)
+
+
+class TestFlashSpec:
+    """Test cases for flash task specifications"""
+
+    def test_run_flash_returns_results(self):
+        """Test that a specification is flashed into a result dictionary"""
+        result = run_flash(make_specs()[0])
+        assert result["system"]["pressure_bara"] == 60.0
+        assert 0.0 < result["system"]["gas_phase_fraction"] <= 1.0
+        assert "gas_phase" in result
+
+
+@pytest.mark.slow
+class TestFlashPool:
+    """Test cases for FlashPool"""
+
+    def test_pool_matches_serial(self):
+        """Test that pooled results equal serial results, ordered or not"""
+        specs = make_specs()
+        expected = [run_flash(spec) for spec in specs]
+        with FlashPool(processes=2, warmup=False) as pool:
+            assert pool.map(specs) == expected
+            assert list(pool.imap(specs, chunksize=2)) == expected
+            unordered = dict(pool.imap_unordered(specs))
+        assert [unordered[i] for i in range(len(specs))] == expected
+
+
+class TestThreadParallel:
+    """Test cases for thread-parallel flashes sharing one JVM"""
+
+    def test_flash_many_matches_serial(self):
+        """Test that threaded flashes give the serial results in order"""
+        specs = make_specs()
+        expected = [run_flash(spec) for spec in specs]
+        assert flash_many(specs, max_workers=2) == expected
+
+    def test_pooled_systems_are_thread_safe(self):
+        """Test concurrent CPA calls against serial calls on fresh threads"""
+        conditions = [(20.0 + 15.0 * i, -10.0 + 6.0 * i) for i in range(8)]
+        expected = [
+            (
+                [float(v) for v in get_water_fugacity_coefficient(p, t)],
+                [float(v) for v in get_acid_fugacity_coeff("H2SO4", p, t)],
+            )
+            for p, t in conditions
+        ]
+        results = {}
+
+        def work(index):
+            for i in range(index, len(conditions), 4):
+                p, t = conditions[i]
+                results[i] = (
+                    [float(v) for v in get_water_fugacity_coefficient(p, t)],
+                    [float(v) for v in get_acid_fugacity_coeff("H2SO4", p, t)],
+                )
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert [results[i] for i in range(len(conditions))] == expected
+
+
+@pytest.mark.slow
+class TestFlashSupervisor:
+    """Test cases for FlashSupervisor"""
+
+    def test_failures_are_quarantined(self, tmp_path):
+        """Test crash, hang and error handling without aborting the job"""
+        marker = str(tmp_path / "crashed")
+        specs = [
+            {"mode": "ok", "value": 1},
+            {"mode": "crash", "value": 2},
+            {"mode": "crash-once", "value": 3, "marker": marker},
+            {"mode": "hang", "value": 4},
+            {"mode": "error", "value": 5},
+            {"mode": "ok", "value": 6},
+        ]
+        with FlashSupervisor(
+            processes=2, timeout=3.0, warmup=False, function=probe
+        ) as supervisor:
+            results = supervisor.map(specs)
+            assert results == [2, None, 6, None, None, 12]
+            reasons = {
+                entry["index"]: (entry["reason"], entry["attempts"])
+                for entry in supervisor.quarantine
+            }
+            assert reasons == {1: ("crash", 2), 3: ("timeout", 2), 4: ("error", 1)}
+            # Two crashes of point 1, one of point 2 and two timeouts
+            assert supervisor.restarts == 5
+            assert supervisor.map([{"mode": "ok", "value": 7}]) == [14]
+            assert supervisor.quarantine == []
+
+    def test_worker_killed_while_idle(self):
+        """Test that a worker dying between tasks is replaced without a retry"""
+        with FlashSupervisor(processes=1, warmup=False, function=probe) as supervisor:
+            assert supervisor.map([{"mode": "ok", "value": 1}]) == [2]
+            process = supervisor._workers[0].process
+            os.kill(process.pid, signal.SIGKILL)
+            process.join(10.0)
+            assert not process.is_alive()
+
+            results = supervisor.map([{"mode": "ok", "value": v} for v in (2, 3)])
+            assert results == [4, 6]
+            assert supervisor.quarantine == []
+            assert supervisor.restarts == 1
+
+    def test_worker_hanging_at_startup(self, tmp_path, monkeypatch):
+        """Test that a worker hanging during startup is replaced"""
+        monkeypatch.setenv("SOLUBILITYCCS_TEST_MARKER", str(tmp_path / "hung"))
+        with FlashSupervisor(
+            processes=1,
+            function=probe,
+            initializer=hanging_start,
+            startup_timeout=3.0,
+        ) as supervisor:
+            assert supervisor.map([{"mode": "ok", "value": 1}]) == [2]
+            assert supervisor.quarantine == []
+            assert supervisor.restarts == 1
+
+    def test_startup_keeps_hanging(self, monkeypatch):
+        """Test that map gives up when every worker hangs during startup"""
+        monkeypatch.delenv("SOLUBILITYCCS_TEST_MARKER", raising=False)
+        with FlashSupervisor(
+            processes=1,
+            function=probe,
+            initializer=hanging_start,
+            startup_timeout=1.0,
+        ) as supervisor:
+            start = time.monotonic()
+            with pytest.raises(RuntimeError, match="during startup"):
+                supervisor.map([{"mode": "ok", "value": 1}])
+            assert time.monotonic() - start < 30.0
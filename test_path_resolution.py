@@ -102,3 +102,85 @@ def test_from_different_directory():
     finally:
         # Restore original directory
         os.chdir(original_dir)
+
+
+@pytest.fixture
+def fresh_path_cache():
+    """Clear the memoized locations before and after a test"""
+    from solubilityccs.path_utils import clear_path_cache
+
+    clear_path_cache()
+    yield
+    clear_path_cache()
+
+
+def test_lookups_are_memoized(fresh_path_cache):
+    """Test that a repeated lookup is answered without touching the filesystem"""
+    from unittest import mock
+
+    from solubilityccs.path_utils import get_database_path
+
+    first = get_database_path("COMP.csv")
+    with mock.patch("os.stat", side_effect=AssertionError("filesystem accessed")):
+        assert get_database_path("COMP.csv") == first
+
+
+def test_packaged_database_directory(fresh_path_cache, monkeypatch):
+    """Test that the packaged Database directory is used by default"""
+    import solubilityccs
+    from solubilityccs.database_bundle import BUNDLE_FILE, bundle_path
+    from solubilityccs.path_utils import (
+        DATABASE_ENV_VAR,
+        get_database_path,
+        get_primary_database_directory,
+    )
+
+    monkeypatch.delenv(DATABASE_ENV_VAR, raising=False)
+    expected = Path(solubilityccs.__file__).parent.absolute() / "Database"
+    assert get_primary_database_directory() == str(expected)
+    assert get_database_path("COMP.csv") == str(expected / "COMP.csv")
+    assert bundle_path() == str(expected / BUNDLE_FILE)
+
+
+def test_environment_override(fresh_path_cache, monkeypatch, tmp_path):
+    """Test that the override directory is searched before the packaged files"""
+    from solubilityccs.database_bundle import BUNDLE_FILE, bundle_path
+    from solubilityccs.path_utils import (
+        DATABASE_ENV_VAR,
+        get_database_path,
+        get_primary_database_directory,
+    )
+
+    packaged = get_database_path("COMP.csv")
+    (tmp_path / "Properties.csv").write_text("Component;M\n")
+    monkeypatch.setenv(DATABASE_ENV_VAR, str(tmp_path))
+
+    assert get_primary_database_directory() == str(tmp_path)
+    assert bundle_path() == str(tmp_path / BUNDLE_FILE)
+    assert get_database_path("Properties.csv") == str(tmp_path / "Properties.csv")
+    assert get_database_path("COMP.csv") == packaged
+    with pytest.raises(FileNotFoundError):
+        get_database_path("nonexistent.csv")
+
+
+def test_missing_override_directory(fresh_path_cache, monkeypatch, tmp_path):
+    """Test that an override naming a missing directory raises FileNotFoundError"""
+    from solubilityccs.path_utils import DATABASE_ENV_VAR, get_database_path
+
+    monkeypatch.setenv(DATABASE_ENV_VAR, str(tmp_path / "missing"))
+    with pytest.raises(FileNotFoundError, match=DATABASE_ENV_VAR):
+        get_database_path("COMP.csv")
+
+
+def test_database_directory_is_project_folder(fresh_path_cache, monkeypatch, tmp_path):
+    """Test that the Database directory stays the project-root folder"""
+    from solubilityccs.path_utils import (
+        DATABASE_ENV_VAR,
+        get_database_directory,
+        get_project_root,
+    )
+
+    expected = str(get_project_root() / "Database")
+    assert get_database_directory() == expected
+    monkeypatch.setenv(DATABASE_ENV_VAR, str(tmp_path))
+    assert get_database_directory() == expected
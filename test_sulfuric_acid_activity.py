@@ -0,0 +1,176 @@
+"""Tests for the H2SO4 water activity interpolation."""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from solubilityccs import Fluid
+from solubilityccs.sulfuric_acid_activity import (
+    calc_activity_water_h2so4,
+    calc_activity_water_h2so4_derivatives,
+    find_closest_values,
+    get_value2,
+    water_h2so4,
+)
+
+TEMPERATURES = water_h2so4["Temperature"].to_numpy(dtype=float)
+WATER_FRACTIONS = np.asarray(water_h2so4.columns[1:], dtype=float)
+
+
+def reference(temperature, water):
+    """Column-wise interpolation on the DataFrame, as done originally."""
+    larger = min(x for x in WATER_FRACTIONS if x >= water)
+    if larger == water:
+        return get_value2(temperature, larger)
+    smaller = max(x for x in WATER_FRACTIONS if x < water)
+    value1 = get_value2(temperature, larger)
+    value2 = get_value2(temperature, smaller)
+    return value2 + (water - smaller) * (value2 - value1) / (smaller - larger)
+
+
+class TestWaterActivityH2SO4:
+    """Test cases for calc_activity_water_h2so4"""
+
+    def test_table_nodes(self):
+        """Test that table nodes are reproduced exactly"""
+        for i, temperature in enumerate(TEMPERATURES):
+            for j, water in enumerate(WATER_FRACTIONS):
+                expected = water_h2so4.iloc[i, j + 1]
+                assert calc_activity_water_h2so4(temperature, water) == expected
+
+    def test_matches_column_interpolation(self):
+        """Test scalar and array results against the DataFrame reference"""
+        rng = np.random.default_rng(7)
+        temperature = rng.uniform(-20.0, 210.0, 200)
+        water = rng.uniform(0.0, 1.0, 200)
+        expected = [reference(t, w) for t, w in zip(temperature, water)]
+        actual = [calc_activity_water_h2so4(t, w) for t, w in zip(temperature, water)]
+        assert actual == expected
+        np.testing.assert_array_equal(
+            calc_activity_water_h2so4(temperature, water), expected
+        )
+
+    def test_broadcasting(self):
+        """Test that array inputs broadcast and keep their shape"""
+        result = calc_activity_water_h2so4(TEMPERATURES[:, np.newaxis], [0.3, 0.7])
+        assert result.shape == (len(TEMPERATURES), 2)
+        assert result[3, 1] == calc_activity_water_h2so4(TEMPERATURES[3], 0.7)
+        assert np.ndim(calc_activity_water_h2so4(25.0, 0.5)) == 0
+
+    def test_water_fraction_outside_table(self):
+        """Test that water fractions outside [0, 1] are rejected"""
+        with pytest.raises(ValueError):
+            calc_activity_water_h2so4(25.0, 1.2)
+        with pytest.raises(ValueError):
+            calc_activity_water_h2so4([25.0, 30.0], [0.5, -0.1])
+
+    def test_find_closest_values_is_deprecated(self):
+        """Test that the old column lookup still works but warns"""
+        with pytest.deprecated_call():
+            assert find_closest_values(WATER_FRACTIONS, 0.35) == (0.58, 0.18)
+        with pytest.deprecated_call():
+            assert find_closest_values([0.5, 0.1, 0.3], 0.3) == (0.5, 0.1)
+        with pytest.deprecated_call():
+            assert find_closest_values([0.1, 0.3], 0.05) == (0.1, None)
+
+
+class TestSmoothWaterActivityH2SO4:
+    """Test cases for the PCHIP water activity surface"""
+
+    def test_table_nodes(self):
+        """Test that the surface passes through the table nodes"""
+        temperature, water = np.meshgrid(TEMPERATURES, WATER_FRACTIONS)
+        surface = calc_activity_water_h2so4_derivatives(temperature, water)
+        np.testing.assert_array_equal(
+            surface["activity"].T, water_h2so4.iloc[:, 1:].to_numpy(dtype=float)
+        )
+
+    def test_derivatives_match_finite_differences(self):
+        """Test the analytic partial derivatives"""
+        rng = np.random.default_rng(3)
+        temperature = rng.uniform(1.0, 189.0, 100)
+        water = rng.uniform(0.01, 0.99, 100)
+        surface = calc_activity_water_h2so4_derivatives(temperature, water)
+        step = 1e-6
+
+        def activity(t, w):
+            return calc_activity_water_h2so4_derivatives(t, w)["activity"]
+
+        d_temperature = (
+            activity(temperature + step, water) - activity(temperature - step, water)
+        ) / (2 * step)
+        d_water = (
+            activity(temperature, water + step) - activity(temperature, water - step)
+        ) / (2 * step)
+        np.testing.assert_allclose(surface["d_temperature"], d_temperature, atol=1e-8)
+        np.testing.assert_allclose(surface["d_water"], d_water, atol=1e-7)
+
+    def test_derivatives_are_continuous(self):
+        """Test that the derivatives have no jumps at table nodes"""
+        for temperature in TEMPERATURES[1:-1]:
+            below = calc_activity_water_h2so4_derivatives(temperature - 1e-9, 0.3)
+            above = calc_activity_water_h2so4_derivatives(temperature + 1e-9, 0.3)
+            assert below["d_temperature"] == pytest.approx(
+                above["d_temperature"], abs=1e-9
+            )
+        for water in WATER_FRACTIONS[1:-1]:
+            below = calc_activity_water_h2so4_derivatives(45.0, water - 1e-9)
+            above = calc_activity_water_h2so4_derivatives(45.0, water + 1e-9)
+            assert below["d_water"] == pytest.approx(above["d_water"], abs=1e-6)
+
+    def test_monotone_between_nodes(self):
+        """Test that the surface does not overshoot along table columns"""
+        fine = np.linspace(TEMPERATURES[0], TEMPERATURES[-1], 1000)
+        for water in WATER_FRACTIONS:
+            column = water_h2so4[water].to_numpy(dtype=float)
+            activity = calc_activity_water_h2so4(fine, water, method="pchip")
+            segment = np.searchsorted(TEMPERATURES, fine, side="right") - 1
+            segment = np.clip(segment, 0, len(TEMPERATURES) - 2)
+            low = np.minimum(column[segment], column[segment + 1])
+            high = np.maximum(column[segment], column[segment + 1])
+            assert np.all(activity >= low - 1e-15)
+            assert np.all(activity <= high + 1e-15)
+
+    def test_flash_with_smooth_surface(self):
+        """Test that flash_activity can run on the smooth surface"""
+        results = {}
+        for method in ("linear", "pchip"):
+            fluid = Fluid()
+            fluid.add_component("CO2", 1.0 - 2e-5)
+            fluid.add_component("H2SO4", 1e-5)
+            fluid.add_component("H2O", 1e-5)
+            fluid.set_temperature(275.15)
+            fluid.set_pressure(60.0)
+            fluid.fugacity_backend = "tabulated"
+            fluid.h2so4_activity_method = method
+            fluid.flash_activity()
+            results[method] = fluid.phases[1].get_acid_wt_prc("H2SO4")
+        assert results["pchip"] == pytest.approx(results["linear"], rel=1e-2)
+
+    def test_unknown_method(self):
+        """Test that unknown interpolation methods are rejected"""
+        with pytest.raises(ValueError):
+            calc_activity_water_h2so4(25.0, 0.5, method="cubic")
+
+
+class TestTableLoading:
+    """Test cases for the lazily loaded table"""
+
+    def test_import_does_not_read_table(self):
+        """Test that importing the package leaves the table unread"""
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import solubilityccs.sulfuric_acid_activity as module\n"
+                "print(module._activities is None)\n"
+                "module.calc_activity_water_h2so4(25.0, 0.5)\n"
+                "print(module._activities is None)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == ["True", "False"]
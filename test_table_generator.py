@@ -0,0 +1,120 @@
+"""Tests for the fugacity table generator."""
+
+import numpy as np
+import pytest
+
+from solubilityccs.fugacity_tables import FugacityTable
+from solubilityccs.table_generator import Checkpoint, build_table, refine_axis
+
+
+def step_surface(temperature, pressure):
+    """Smooth in T with a steep rise around 70 bara, like a saturation line."""
+    return 0.5 * (temperature / 273.15) * (1.0 + np.tanh((pressure - 70.0) / 2.0))
+
+
+def fake_evaluate(calls):
+    """Return an evaluator that records the points it is asked for."""
+
+    def evaluate(tasks):
+        for name, temperature, pressure in tasks:
+            calls.append((temperature, pressure))
+            yield name, temperature, pressure, [
+                float(step_surface(temperature, pressure) + 0.01)
+            ]
+
+    return evaluate
+
+
+class TestRefinement:
+    """Test cases for adaptive grid densification"""
+
+    def test_refine_axis_flags_steep_region(self):
+        """Test that only intervals around the steep region are bisected"""
+        pressure = np.linspace(0.0, 200.0, 21)
+        z = np.log(step_surface(280.0, pressure) + 0.01)
+        new_nodes = refine_axis(pressure, z, 0.05)
+        assert len(new_nodes) > 0
+        assert np.all(np.abs(new_nodes - 70.0) < 40.0)
+
+    def test_refine_axis_linear_data(self):
+        """Test that linear data needs no refinement"""
+        axis = np.linspace(0.0, 1.0, 11)
+        assert len(refine_axis(axis, 2.0 * axis, 1e-9)) == 0
+
+    def test_build_table_densifies_grid(self):
+        """Test that the generated grid is denser near the steep region"""
+        calls = []
+        table = build_table(
+            "H2O",
+            np.linspace(263.15, 303.15, 5),
+            np.linspace(1.0, 201.0, 11),
+            fake_evaluate(calls),
+            refine_levels=2,
+            refine_tolerance=0.05,
+        )
+        spacing = np.diff(table.pressure)
+        near = (table.pressure[:-1] > 50.0) & (table.pressure[:-1] < 90.0)
+        assert spacing[near].min() < spacing[~near].max()
+        assert len(calls) == len(set(calls)) == table.values.size
+        assert table.metadata["source_model"]
+        assert len(table.metadata["checksum"]) == 64
+
+
+class TestCheckpoint:
+    """Test cases for resumable table generation"""
+
+    def test_resume_skips_evaluated_points(self, tmp_path):
+        """Test that a resumed run only evaluates missing points"""
+        path = str(tmp_path / "fugacity_H2O.npz.checkpoint")
+        temperature = np.linspace(263.15, 303.15, 3)
+        pressure = np.linspace(1.0, 101.0, 3)
+
+        checkpoint = Checkpoint(path, "H2O", "abc")
+        checkpoint.add(263.15, 1.0, [0.5])
+        checkpoint.close()
+        with open(path, "a") as handle:
+            handle.write("[263.15, 51.0")  # interrupted mid-write
+
+        calls = []
+        resumed = Checkpoint(path, "H2O", "abc")
+        assert list(resumed.results) == [(263.15, 1.0)]
+        table = build_table(
+            "H2O", temperature, pressure, fake_evaluate(calls), resumed, 0
+        )
+        assert (263.15, 1.0) not in calls
+        assert len(calls) == 8
+        assert table.values[0, 0, 0] == 0.5
+        assert len(Checkpoint(path, "H2O", "abc").results) == 9
+
+    def test_checkpoint_for_other_model_is_discarded(self, tmp_path):
+        """Test that points from a different model fingerprint are not reused"""
+        path = str(tmp_path / "checkpoint")
+        checkpoint = Checkpoint(path, "H2O", "old")
+        checkpoint.add(263.15, 1.0, [0.5])
+        checkpoint.close()
+        assert Checkpoint(path, "H2O", "new").results == {}
+
+
+class TestTableFiles:
+    """Test cases for versioned, checksummed table files"""
+
+    def test_checksum_is_verified(self, tmp_path):
+        """Test that a tampered table file is rejected"""
+        table = build_table(
+            "H2O",
+            np.linspace(263.15, 303.15, 4),
+            np.linspace(1.0, 101.0, 4),
+            fake_evaluate([]),
+            refine_levels=0,
+        )
+        path = tmp_path / "fugacity_H2O.npz"
+        table.save(path)
+        loaded = FugacityTable.load(path)
+        assert loaded.metadata["checksum"] == table.metadata["checksum"]
+
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        arrays["values"] = arrays["values"] * 1.01
+        np.savez(path, **arrays)
+        with pytest.raises(ValueError, match="checksum"):
+            FugacityTable.load(path)